@@ -11,4 +11,105 @@ class Settings:
     MONGO_URI = os.getenv("MONGO_URI") # Add this in .env
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+    # Email (SMTP)
+    SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+    SMTP_PORT = int(os.getenv("SMTP_PORT", 465))
+    EMAIL_SENDER = os.getenv("EMAIL_SENDER")
+    SMTP_LOGIN = os.getenv("SMTP_LOGIN", EMAIL_SENDER)
+    EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+    SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 5))
+
+    # Alert Tracker
+    ALERT_INDEX_RESYNC_SECONDS = int(os.getenv("ALERT_INDEX_RESYNC_SECONDS", 300))
+    # Change streams na hon (standalone Mongo) toh naye / hate alerts ka delta poll
+    ALERT_INDEX_POLL_SECONDS = int(os.getenv("ALERT_INDEX_POLL_SECONDS", 5))
+    PRICE_FETCH_CONCURRENCY = int(os.getenv("PRICE_FETCH_CONCURRENCY", 4))
+    NOTIFY_CONCURRENCY = int(os.getenv("NOTIFY_CONCURRENCY", 20))
+    # Market-hours aware polling: job har TICK par chalta hai, symbols apne due time par fetch hote hain
+    TRACKER_TICK_SECONDS = int(os.getenv("TRACKER_TICK_SECONDS", 15))
+    TRACKER_CLOSED_INTERVAL = int(os.getenv("TRACKER_CLOSED_INTERVAL", 1800))
+    # Is se lamba tick naye chunks shuru nahi karta; bache symbols agle tick mein pehle jaate hain
+    TRACKER_TICK_DEADLINE = float(os.getenv("TRACKER_TICK_DEADLINE", 12))
+    MARKET_HOLIDAYS_FILE = os.getenv("MARKET_HOLIDAYS_FILE")  # Default: app/data/market_holidays.json
+
+    # Tracker workers (sharding). "false" karne par API process scheduler nahi chalata,
+    # tracker `python -m app.worker` se alag process(es) mein chalta hai.
+    RUN_WORKER_IN_API = os.getenv("RUN_WORKER_IN_API", "true").lower() == "true"
+    TRACKER_HEARTBEAT_SECONDS = int(os.getenv("TRACKER_HEARTBEAT_SECONDS", 10))
+    TRACKER_NODE_TTL_SECONDS = int(os.getenv("TRACKER_NODE_TTL_SECONDS", 30))
+    LIVE_QUOTE_RELAY_SECONDS = int(os.getenv("LIVE_QUOTE_RELAY_SECONDS", 5))
+    # Worker ke agle scheduled poll ke baad itni der tak quote fresh maana jaata hai
+    LIVE_QUOTE_GRACE_SECONDS = int(os.getenv("LIVE_QUOTE_GRACE_SECONDS", 30))
+    WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", 0))  # 0 = worker /metrics band
+
+    # Notification Outbox (dispatcher)
+    OUTBOX_POLL_SECONDS = int(os.getenv("OUTBOX_POLL_SECONDS", 5))
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 200))
+    OUTBOX_MAX_BATCHES_PER_RUN = int(os.getenv("OUTBOX_MAX_BATCHES_PER_RUN", 50))
+    OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", 120))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 6))
+    OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("OUTBOX_RETRY_BASE_SECONDS", 30))
+    OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+    # Itni der baad bhi `held` row (tracker flip/release se pehle crash) sweep se resolve hoti hai
+    OUTBOX_HOLD_GRACE_SECONDS = int(os.getenv("OUTBOX_HOLD_GRACE_SECONDS", 60))
+
+    # Admin Broadcasts
+    BROADCAST_POLL_SECONDS = int(os.getenv("BROADCAST_POLL_SECONDS", 10))
+    BROADCAST_BATCH_SIZE = int(os.getenv("BROADCAST_BATCH_SIZE", 100))
+    BROADCAST_RATE_PER_SECOND = float(os.getenv("BROADCAST_RATE_PER_SECOND", 20))
+    BROADCAST_LEASE_SECONDS = int(os.getenv("BROADCAST_LEASE_SECONDS", 300))
+    BROADCAST_MAX_ATTEMPTS = int(os.getenv("BROADCAST_MAX_ATTEMPTS", 5))
+    BROADCAST_RETRY_BASE_SECONDS = int(os.getenv("BROADCAST_RETRY_BASE_SECONDS", 30))
+
+    # Blocking market-data calls (yfinance / Google Finance) ka thread pool
+    FINANCE_POOL_SIZE = int(os.getenv("FINANCE_POOL_SIZE", 16))
+
+    # Shared Quote Cache (seconds)
+    QUOTE_CACHE_SIZE = int(os.getenv("QUOTE_CACHE_SIZE", 5000))
+    QUOTE_CACHE_TTL = float(os.getenv("QUOTE_CACHE_TTL", 60))
+    QUOTE_CACHE_STALE_TTL = float(os.getenv("QUOTE_CACHE_STALE_TTL", 300))
+
+    # Market indices (key=Yahoo symbol), ek batched fetch mein refresh hote hain
+    MARKET_INDICES = os.getenv(
+        "MARKET_INDICES",
+        "nifty=^NSEI,sensex=^BSESN,banknifty=^NSEBANK,sp500=^GSPC,nasdaq=^IXIC,dowjones=^DJI"
+    )
+    INDICES_REFRESH_SECONDS = int(os.getenv("INDICES_REFRESH_SECONDS", 60))
+
+    # Local symbol master (search autocomplete). URL khaali = woh source skip
+    SYMBOL_MASTER_DIR = os.getenv("SYMBOL_MASTER_DIR", "data/symbols")
+    SYMBOL_MASTER_REFRESH_HOURS = float(os.getenv("SYMBOL_MASTER_REFRESH_HOURS", 24))
+    NSE_SYMBOLS_URL = os.getenv("NSE_SYMBOLS_URL", "https://archives.nseindia.com/content/equities/EQUITY_L.csv")
+    NASDAQ_SYMBOLS_URL = os.getenv("NASDAQ_SYMBOLS_URL", "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt")
+    OTHER_SYMBOLS_URL = os.getenv("OTHER_SYMBOLS_URL", "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt")
+
+    # Symbol resolution cache (input -> canonical Yahoo ticker), seconds
+    SYMBOL_RESOLVER_SIZE = int(os.getenv("SYMBOL_RESOLVER_SIZE", 20000))
+    SYMBOL_RESOLVE_TTL = float(os.getenv("SYMBOL_RESOLVE_TTL", 7 * 24 * 3600))
+    SYMBOL_NEGATIVE_TTL = float(os.getenv("SYMBOL_NEGATIVE_TTL", 3600))
+
+    # News store (RSS): LRU size, TTL aur background refresh (seconds)
+    NEWS_CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", 500))
+    NEWS_TTL = float(os.getenv("NEWS_TTL", 600))
+    NEWS_REFRESH_SECONDS = int(os.getenv("NEWS_REFRESH_SECONDS", 300))
+    NEWS_WATCHED_TOP = int(os.getenv("NEWS_WATCHED_TOP", 50))
+    NEWS_ITEMS_PER_FEED = int(os.getenv("NEWS_ITEMS_PER_FEED", 8))
+    NEWS_FETCH_CONCURRENCY = int(os.getenv("NEWS_FETCH_CONCURRENCY", 5))
+
+    # AI analysis: cache (symbol, price bucket, currency), token budget aur offline stub
+    AI_STUB = os.getenv("AI_STUB", "false").lower() == "true"
+    AI_STUB_LATENCY = float(os.getenv("AI_STUB_LATENCY", 0))
+    AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", 512))
+    AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", 1800))
+    AI_PRICE_BUCKET_PCT = float(os.getenv("AI_PRICE_BUCKET_PCT", 2))
+    AI_TOKENS_PER_MINUTE = float(os.getenv("AI_TOKENS_PER_MINUTE", 20000))
+    AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", 30))
+    # Model configure fail hua (key nahi / list_models error) toh itni der dobara try nahi
+    AI_CONFIGURE_RETRY_SECONDS = float(os.getenv("AI_CONFIGURE_RETRY_SECONDS", 300))
+
+    # Local OHLC history store
+    OHLC_STORE_DIR = os.getenv("OHLC_STORE_DIR", "data/ohlc")
+    OHLC_REFRESH_SECONDS = float(os.getenv("OHLC_REFRESH_SECONDS", 900))
+    OHLC_MEMORY_SIZE = int(os.getenv("OHLC_MEMORY_SIZE", 500))
+
 settings = Settings()
\ No newline at end of file
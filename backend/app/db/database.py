@@ -2,10 +2,14 @@ import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from dotenv import load_dotenv
+from app.services.telemetry import MongoCommandListener
 
 # Models
 from app.models.alert import Alert
 from app.models.user import User
+from app.models.outbox import OutboxMessage
+from app.models.broadcast import BroadcastJob
+from app.models.tracker_node import TrackerNode
 
 load_dotenv()
 
@@ -20,12 +24,16 @@ async def init_db():
     db_name = os.getenv("DB_NAME")
     
     # 2. Connection banayein
-    client = AsyncIOMotorClient(uri)
+    client = AsyncIOMotorClient(uri, event_listeners=[MongoCommandListener()])  # /metrics: Mongo latency
     
     # 3. Global 'db' variable set karein (Ye line missing thi pehle)
     db = client[db_name]
     
     # 4. Beanie Initialize karein (User/Alert models ke liye)
-    await init_beanie(database=db, document_models=[Alert, User])
+    await init_beanie(database=db, document_models=[Alert, User, OutboxMessage, BroadcastJob, TrackerNode])
+
+    # 5. Raw 'portfolio' collection ka index (Beanie model nahi hai, isliye manually)
+    # Har query {email, symbol} ya {email} par hoti hai
+    await db.portfolio.create_index([("email", 1), ("symbol", 1)], name="email_symbol")
     
     print("✅ MongoDB Connected & Models Loaded (Alerts + Users)!")
@@ -1,7 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import time
+import asyncio
 import logging
 
 # Local Imports
@@ -9,8 +11,16 @@ from app.core.config import settings
 from app.db.database import init_db
 
 # ✅ FIX 1: 'users' router import kiya (Telegram features ke liye)
-from app.routers import auth, stocks, alerts, chat, portfolio, admin, users
-from app.services.background import track_stock_prices
+from app.routers import auth, stocks, alerts, chat, portfolio, admin, users, metrics, stream
+from app.services.jobs import register_worker_jobs, register_api_jobs
+from app.services.alert_index import alert_index
+from app.services.sharding import shard
+from app.services.symbol_master import symbol_master
+from app.services.threadpool import finance_pool
+from app.services.mailer import mailer
+from app.services.news import news_store
+from app.services.notifier import telegram_sender
+from app.services.telemetry import HTTP_LATENCY, render_metrics, route_template
 
 # Logging Setup
 logging.basicConfig(level=logging.INFO)
@@ -22,16 +32,32 @@ scheduler = AsyncIOScheduler()
 async def lifespan(app: FastAPI):
     logger.info("🚀 Server Starting...")
     await init_db()
+    await telegram_sender.start()
+    await symbol_master.load()
     
     # Scheduler Logic (Background jobs for Alerts)
+    follower = None
     if not scheduler.running:
-        scheduler.add_job(track_stock_prices, 'interval', seconds=60)
+        if settings.RUN_WORKER_IN_API:
+            # Single-process mode: tracker isi process mein (ek shard node ki tarah)
+            await shard.heartbeat()
+            follower = asyncio.create_task(alert_index.follow_changes())
+            register_worker_jobs(scheduler)
+        # Indices snapshot (+ split mode mein SSE relay)
+        register_api_jobs(scheduler)
         scheduler.start()
         logger.info("✅ Background Scheduler Started")
     
     yield
     
     logger.info("🛑 Server Shutting Down...")
+    if follower is not None:
+        follower.cancel()
+        await shard.leave()
+    await telegram_sender.stop()
+    await mailer.close()
+    await news_store.close()
+    finance_pool.shutdown()
 
 app = FastAPI(lifespan=lifespan, title="Stock Alert System")
 
@@ -53,6 +79,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ==========================
+# 📊 REQUEST LATENCY (Prometheus)
+# ==========================
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_LATENCY.labels(request.method, route_template(request), str(status)).observe(time.perf_counter() - started)
+
 # ==========================
 # 🛣️ REGISTER ROUTERS (✅ FIXED PREFIXES)
 # ==========================
@@ -78,6 +118,12 @@ app.include_router(portfolio.router, prefix="/api", tags=["Portfolio"])
 # 7. Admin -> URL: /api/admin
 app.include_router(admin.router, prefix="/api", tags=["Admin"])
 
+# 8. Metrics -> URL: /api/metrics/finance-pool
+app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
+
+# 9. Stream -> URL: /api/stream/prices?symbols=AAPL,TCS.NS (SSE)
+app.include_router(stream.router, prefix="/api", tags=["Stream"])
+
 
 @app.get("/")
 def read_root():
@@ -86,3 +132,10 @@ def read_root():
         "message": "Stock Monitor System Running 🚀",
         "docs_url": "/docs"
     }
+
+
+# Prometheus scrape endpoint (per process; multi-worker deploy mein har worker alag scrape hota hai)
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
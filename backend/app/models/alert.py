@@ -1,5 +1,6 @@
-from beanie import Document
-from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from datetime import datetime
 from typing import Optional
 
@@ -21,6 +22,26 @@ class Alert(Document):
     
     # Trigger time tracking
     triggered_at: Optional[datetime] = None
+    # Tracker ka write-back token: batch mein kaunse alerts isi tick ne flip kiye
+    trigger_token: Optional[str] = None
 
     class Settings:
         name = "alerts"
+        # init_beanie in indexes ko startup par create karta hai
+        indexes = [
+            # Tracker + admin stats: status filter (symbol ke saath grouped)
+            IndexModel([("status", ASCENDING), ("stock_symbol", ASCENDING)], name="status_symbol"),
+            # get_my_alerts: email filter + newest-first sort
+            IndexModel([("email", ASCENDING), ("created_at", DESCENDING)], name="email_created_at"),
+            # Standalone Mongo par tracker ka delta poll: haal mein trigger hue alerts
+            IndexModel([("triggered_at", ASCENDING)], name="triggered_at", sparse=True),
+        ]
+
+# ✅ Projection: Tracker ko sirf yehi fields chahiye, baaki document load nahi hota
+class TrackedAlert(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    stock_symbol: str
+    target_price: float
+    email: str
+    direction: str = "UP"
+    telegram_id: Optional[str] = None
@@ -0,0 +1,54 @@
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from datetime import datetime
+from typing import Optional
+
+class BroadcastJob(Document):
+    subject: str
+    message: str
+    created_by: str
+
+    # queued -> running -> completed | failed
+    # (transient error: running -> queued, backoff ke saath, BROADCAST_MAX_ATTEMPTS tak)
+    status: str = "queued"
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+
+    # Resume point: users _id order mein stream hote hain
+    last_user_id: Optional[PydanticObjectId] = None
+    # Running job ki lease; worker crash hua toh expire hone par dobara claim hoga
+    lease_until: Optional[datetime] = None
+    # Lease ka owner: token match na ho toh purana worker progress nahi likh sakta
+    claim_token: Optional[str] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "broadcast_jobs"
+        indexes = [
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+            IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+        ]
+
+    def progress(self) -> dict:
+        return {
+            "id": str(self.id),
+            "subject": self.subject,
+            "status": self.status,
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "remaining": max(self.total - self.sent - self.failed, 0),
+            "created_by": self.created_by,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "last_error": self.last_error,
+        }
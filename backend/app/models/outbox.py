@@ -0,0 +1,45 @@
+from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+from datetime import datetime
+from typing import Optional
+from app.core.config import settings
+
+class OutboxMessage(Document):
+    """
+    Ek triggered alert ka ek channel (email / telegram) par pending notification.
+    Tracker isse alert flip ke saath likhta hai; dispatcher alag se drain karta hai.
+    """
+    # "<alert_id>:<channel>" - ek alert ka ek channel par sirf ek message
+    idempotency_key: Indexed(str, unique=True)
+    alert_id: str
+    channel: str                 # "email" | "telegram"
+    recipient: str               # email address ya Telegram chat id
+    symbol: str
+    target_price: float
+    current_price: float
+
+    # held -> pending -> sending -> sent | dead (max attempts ke baad)
+    # held: tracker ne likha, alert flip confirm hone tak dispatch nahi hota
+    # (flip nahi hua / alert delete hua toh held -> cancelled)
+    status: str = "pending"
+    attempts: int = 0
+    # Pending: kab retry karna hai. Sending: lease expiry (crash hua toh dobara claim)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    claim_token: Optional[str] = None
+    last_error: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+    # Sent / dead hone ka time: OUTBOX_RETENTION_DAYS baad TTL index row hata deta hai
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "outbox"
+        indexes = [
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+            IndexModel([("claim_token", ASCENDING)], name="claim_token", sparse=True),
+            # Pending / sending rows mein finished_at nahi hota, toh woh kabhi expire nahi hote
+            IndexModel([("finished_at", ASCENDING)], name="finished_at_ttl",
+                       expireAfterSeconds=settings.OUTBOX_RETENTION_DAYS * 86400),
+        ]
@@ -0,0 +1,22 @@
+from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+from datetime import datetime
+
+class TrackerNode(Document):
+    """
+    Ek running tracker worker. Heartbeat ruk jaaye toh node live set se
+    bahar ho jaata hai aur uske symbols baaki nodes mein bant jaate hain.
+    """
+    node_id: Indexed(str, unique=True)
+    hostname: str
+    pid: int
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    heartbeat_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "tracker_nodes"
+        indexes = [
+            # Dead nodes ke documents 1 ghante baad khud delete ho jaate hain
+            IndexModel([("heartbeat_at", ASCENDING)], name="heartbeat_ttl", expireAfterSeconds=3600),
+        ]
@@ -1,4 +1,4 @@
-from beanie import Document, Indexed
+from beanie import Document, Indexed, PydanticObjectId
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime
@@ -27,6 +27,11 @@ class User(Document):
     class Settings:
         name = "users"
 
+# ✅ Projection: Broadcast ko sirf email chahiye (poora user document load nahi hota)
+class UserEmail(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+
 # 2. Input Validation Models
 class UserRegister(BaseModel):
     email: EmailStr
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from beanie import PydanticObjectId
@@ -7,8 +7,10 @@ from pydantic import BaseModel
 # ✅ User, Alert Models & Email Utils Import
 from app.models.user import User
 from app.models.alert import Alert 
+from app.models.broadcast import BroadcastJob
 from app.core.config import settings
-from app.utils.email import send_generic_email 
+from app.services.broadcast import create_broadcast
+from app.services.alert_index import alert_index
 
 router = APIRouter()
 
@@ -90,6 +92,7 @@ async def delete_user(user_id: str, admin: User = Depends(get_admin_user)):
         if user_to_delete:
             # Delete user's alerts using email
             await Alert.find(Alert.email == user_to_delete.email).delete()
+            alert_index.remove_by_email(user_to_delete.email)
             
             # Delete User
             await user_to_delete.delete()
@@ -140,17 +143,29 @@ class BroadcastRequest(BaseModel):
 @router.post("/admin/broadcast")
 async def send_broadcast(
     data: BroadcastRequest, 
-    background_tasks: BackgroundTasks, 
     admin: User = Depends(get_admin_user)
 ):
     """
-    Background Task ka use karke saare users ko email bhejta hai.
+    Broadcast job create karta hai. Emails background worker bhejta hai
+    (cursor se batches, pooled SMTP, fixed rate), API worker sirf job likhta hai.
     """
-    users = await User.find_all().to_list()
-    
-    count = 0
-    for user in users:
-        background_tasks.add_task(send_generic_email, user.email, data.subject, data.message)
-        count += 1
-        
-    return {"message": f"Broadcast queued for {count} users! 🚀"}
+    job = await create_broadcast(data.subject, data.message, created_by=admin.email)
+    return {"message": f"Broadcast queued for {job.total} users! 🚀", "job_id": str(job.id)}
+
+# ==========================================
+# 📈 API 6: Broadcast Job Progress
+# ==========================================
+@router.get("/admin/broadcasts")
+async def list_broadcasts(admin: User = Depends(get_admin_user)):
+    jobs = await BroadcastJob.find_all().sort("-created_at").limit(20).to_list()
+    return [job.progress() for job in jobs]
+
+@router.get("/admin/broadcast/{job_id}")
+async def get_broadcast(job_id: str, admin: User = Depends(get_admin_user)):
+    try:
+        job = await BroadcastJob.get(PydanticObjectId(job_id))
+    except Exception:
+        job = None
+    if not job:
+        raise HTTPException(status_code=404, detail="Broadcast job not found")
+    return job.progress()
@@ -5,7 +5,8 @@ from app.models.alert import Alert
 from app.routers.auth import get_current_user 
 
 # ✅ NEW IMPORT: Live price fetch karne ke liye
-from app.services.finance import get_live_price
+from app.services.finance import get_live_price, resolve_symbol
+from app.services.alert_index import alert_index
 
 router = APIRouter()
 
@@ -22,7 +23,10 @@ async def get_my_alerts(current_user: User = Depends(get_current_user)):
 # ==========================================
 @router.post("/add-alert")
 async def add_alert(symbol: str, target: float, current_user: User = Depends(get_current_user)):
-    clean_sym = symbol.upper().strip()
+    # Canonical ticker store hota hai (e.g. 'reliance' -> 'RELIANCE.NS'), taaki tracker kabhi probe na kare
+    clean_sym = await resolve_symbol(symbol)
+    if clean_sym is None:
+        raise HTTPException(status_code=400, detail=f"Unknown symbol: {symbol.upper().strip()}")
     
     # 1. User profile se Telegram ID fetch karein
     user_telegram_id = getattr(current_user, "telegram_id", None)
@@ -53,6 +57,7 @@ async def add_alert(symbol: str, target: float, current_user: User = Depends(get
         telegram_id=user_telegram_id 
     )
     await new_alert.create()
+    alert_index.add(new_alert)
     
     return {
         "msg": f"Alert set for {clean_sym} when it goes {direction} to {target_price_float}", 
@@ -72,6 +77,7 @@ async def delete_alert(alert_id: str, current_user: User = Depends(get_current_u
         raise HTTPException(status_code=404, detail="Alert not found or unauthorized")
     
     await alert.delete()
+    alert_index.remove(alert.id)
     return {"msg": "Alert Deleted"}
 
 # ==========================================
@@ -80,4 +86,5 @@ async def delete_alert(alert_id: str, current_user: User = Depends(get_current_u
 @router.delete("/clear-all")
 async def clear_all_alerts(current_user: User = Depends(get_current_user)):
     await Alert.find(Alert.email == current_user.email).delete()
+    alert_index.remove_by_email(current_user.email)
     return {"msg": "All your alerts deleted!"}
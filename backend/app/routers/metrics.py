@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends
+from app.routers.admin import get_admin_user
+from app.services.threadpool import finance_pool
+from app.services.finance import quote_cache, symbol_resolver
+from app.services.mailer import mailer
+from app.services.notifier import telegram_sender
+from app.services.outbox import outbox_stats
+from app.services.tick_metrics import tick_metrics
+from app.services.news import news_store
+from app.services.ai_service import ai_engine
+
+# Internal counters aur collection-wide aggregates: sirf admins ke liye
+router = APIRouter(dependencies=[Depends(get_admin_user)])
+
+# ==========================================
+# 🧵 Finance Thread Pool Stats
+# ==========================================
+@router.get("/metrics/finance-pool")
+async def get_finance_pool_metrics():
+    """
+    Pool size, queue depth aur har call type ki latency (avg / wait / max, ms mein).
+    """
+    return finance_pool.stats()
+
+# ==========================================
+# 💾 Shared Quote Cache Stats
+# ==========================================
+@router.get("/metrics/quote-cache")
+async def get_quote_cache_metrics():
+    """
+    Hits, stale hits, misses, evictions aur in-flight fetches.
+    """
+    return quote_cache.stats()
+
+# ==========================================
+# 🔤 Symbol Resolution Cache Stats
+# ==========================================
+@router.get("/metrics/symbol-resolver")
+async def get_symbol_resolver_metrics():
+    """
+    Resolved / negative entries, hits aur kitni baar upstream probe hua.
+    """
+    return symbol_resolver.stats()
+
+# ==========================================
+# 📧 SMTP Pool Stats
+# ==========================================
+@router.get("/metrics/smtp-pool")
+async def get_smtp_pool_metrics():
+    return mailer.stats()
+
+# ==========================================
+# 📱 Telegram Send Queue Stats
+# ==========================================
+@router.get("/metrics/telegram")
+async def get_telegram_metrics():
+    """
+    Queue depth, sent / failed / 429 counts aur enqueue-to-delivery latency.
+    """
+    return telegram_sender.stats()
+
+# ==========================================
+# 📤 Notification Outbox Stats
+# ==========================================
+@router.get("/metrics/outbox")
+async def get_outbox_metrics():
+    """
+    Outbox messages per status (pending / sending / sent / dead).
+    """
+    return await outbox_stats()
+
+# ==========================================
+# ⏱️ Tracker Tick Stats
+# ==========================================
+@router.get("/metrics/tracker")
+async def get_tracker_metrics():
+    """
+    Tick duration (avg / p95 / max), schedule lag, overruns, skipped runs,
+    fetch failures, triggered alerts aur carried-over symbols.
+    """
+    return tick_metrics.stats()
+
+# ==========================================
+# 📰 News Store Stats
+# ==========================================
+@router.get("/metrics/news")
+async def get_news_metrics():
+    """
+    Cached feeds, shared headlines, fetch failures aur dropped duplicates.
+    """
+    return news_store.stats()
+
+# ==========================================
+# 🤖 AI Analysis Stats
+# ==========================================
+@router.get("/metrics/ai")
+async def get_ai_metrics():
+    """
+    Analysis cache hits, coalesced in-flight calls, rate-limited requests aur token budget.
+    """
+    return ai_engine.stats()
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Optional
 from app.db import database 
 from app.utils.auth import get_current_user 
 from pydantic import BaseModel
 from datetime import datetime
 
 # ✅ NEW IMPORTS: Finance Service se data lene ke liye
-from app.services.finance import get_stock_details, get_usd_to_inr_rate
+from app.services.finance import quote_cache, get_usd_to_inr_rate, resolve_symbol
 
 router = APIRouter()
 
+# Mongo cursor se ek round trip mein kitne holdings aayein
+PORTFOLIO_BATCH_SIZE = 500
+
 # --- Models ---
 class Transaction(BaseModel):
     symbol: str
@@ -16,67 +23,99 @@ class Transaction(BaseModel):
     price: float
     type: str = "BUY"
 
-# --- Routes ---
+# --- Helpers ---
+
+def value_holdings(holdings: list, quotes: dict, usd_rate: float) -> list:
+    """
+    Saare holdings ka value / INR conversion / P&L ek saath (column-wise) calculate karta hai.
+    `quotes` = {symbol: details ya None}; price na mile toh avg_price fallback hai.
+    """
+    quote_list = [quotes.get(h["symbol"]) for h in holdings]
+
+    quantity = np.array([h["quantity"] for h in holdings], dtype=float)
+    avg_price = np.array([h["avg_price"] for h in holdings], dtype=float)
+    live_price = np.array([q["price"] if q else np.nan for q in quote_list], dtype=float)
+    currency = np.array([q["currency"] if q else "INR" for q in quote_list])
+
+    current_price = np.where(np.isnan(live_price), avg_price, live_price)
+    is_usd = currency == "USD"
+    # US stocks ki value INR mein convert hoti hai, Indian stocks ki rate 1 hai
+    rate = np.where(is_usd, usd_rate, 1.0)
+
+    invested = quantity * avg_price
+    value = quantity * current_price
+    pnl = value - invested
+
+    frame = pd.DataFrame({
+        "current_price": current_price,
+        "currency": currency,
+        "currency_symbol": np.where(is_usd, "$", "₹"),
+        "usd_rate_used": rate,
+        "value_inr": value * rate,          # Frontend isse Total Portfolio Value calculate karega
+        "invested_inr": invested * rate,
+        "pnl": pnl,                         # Native currency mein
+        "pnl_inr": pnl * rate,
+        "pnl_pct": np.divide(pnl * 100, invested, out=np.zeros_like(pnl), where=invested > 0),
+    })
 
-@router.get("/portfolio")
-async def get_portfolio(user=Depends(get_current_user)):
-    if database.db is None:
-        raise HTTPException(status_code=503, detail="Database not initialized")
-        
-    cursor = database.db.portfolio.find({"email": user["email"]})
-    holdings = await cursor.to_list(length=100)
-    
-    # 1. Aaj ka USD to INR rate layein (e.g., 84.5)
-    usd_rate = await get_usd_to_inr_rate()
-    
     updated_holdings = []
-    
-    for h in holdings:
-        # 2. Live Details Layein (Price + Currency)
-        details = await get_stock_details(h["symbol"])
-        
-        # Default fallback values
-        current_price = h["avg_price"]
-        currency = "INR"
-        
-        if details:
-            current_price = details["price"]
-            currency = details["currency"] # 'USD' or 'INR'
-            
-        # 3. Currency Logic
-        if currency == "USD":
-            # Agar US Stock hai:
-            display_price = current_price        # UI par Dollar dikhayenge ($150)
-            currency_symbol = "$"
-            # Total Value ke liye INR me convert karein
-            value_inr = (current_price * h["quantity"]) * usd_rate 
-        else:
-            # Agar Indian Stock hai:
-            display_price = current_price
-            currency_symbol = "₹"
-            value_inr = (current_price * h["quantity"])
-
-        # 4. Data Attach karein
-        h["current_price"] = display_price
-        h["currency"] = currency
-        h["currency_symbol"] = currency_symbol
-        h["value_inr"] = value_inr # Frontend isse Total Portfolio Value calculate karega
+    for h, row in zip(holdings, frame.to_dict("records")):
+        h.update(row)
         h["_id"] = str(h["_id"])   # ObjectId convert to string
-        
         updated_holdings.append(h)
-        
     return updated_holdings
 
+# --- Routes ---
+
+@router.get("/portfolio")
+async def get_portfolio(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    user=Depends(get_current_user)
+):
+    """
+    Poora portfolio (default) ya `skip`/`limit` se ek page.
+    Paging par `X-Total-Count` header mein total holdings aate hain.
+    """
+    if database.db is None:
+        raise HTTPException(status_code=503, detail="Database not initialized")
+
+    query = {"email": user["email"]}
+    # (email, symbol) index filter aur sort dono serve karta hai
+    cursor = database.db.portfolio.find(query).sort("symbol", 1).skip(max(skip, 0))
+    cursor = cursor.batch_size(PORTFOLIO_BATCH_SIZE)
+    if limit:
+        cursor = cursor.limit(limit)
+        response.headers["X-Total-Count"] = str(await database.db.portfolio.count_documents(query))
+
+    holdings = [h async for h in cursor]
+    if not holdings:
+        return []
+
+    # 1. USD rate + saare symbols ke quotes ek hi concurrent step mein (shared cache se)
+    usd_rate, quotes = await asyncio.gather(
+        get_usd_to_inr_rate(),
+        quote_cache.get_many(h["symbol"] for h in holdings)
+    )
+
+    # 2. Vectorized valuation
+    return value_holdings(holdings, quotes, usd_rate)
+
 @router.post("/portfolio/transaction")
 async def add_transaction(txn: Transaction, user=Depends(get_current_user)):
     if database.db is None:
         raise HTTPException(status_code=503, detail="Database not initialized")
 
     email = user["email"]
-    # Symbol ko Upper Case karein (e.g. 'aapl' -> 'AAPL')
-    clean_symbol = txn.symbol.upper().strip()
+    # Canonical ticker (e.g. 'aapl' -> 'AAPL', 'reliance' -> 'RELIANCE.NS')
+    raw_symbol = txn.symbol.upper().strip()
+    clean_symbol = await resolve_symbol(raw_symbol)
+    if clean_symbol is None:
+        raise HTTPException(status_code=400, detail=f"Unknown symbol: {raw_symbol}")
     
-    existing = await database.db.portfolio.find_one({"email": email, "symbol": clean_symbol})
+    # Purani holdings bare symbol ('RELIANCE') ke saath bhi ho sakti hain
+    existing = await database.db.portfolio.find_one({"email": email, "symbol": {"$in": [clean_symbol, raw_symbol]}})
 
     if txn.type == "BUY":
         if existing:
@@ -87,7 +126,7 @@ async def add_transaction(txn: Transaction, user=Depends(get_current_user)):
             
             await database.db.portfolio.update_one(
                 {"_id": existing["_id"]},
-                {"$set": {"quantity": new_qty, "avg_price": new_avg}}
+                {"$set": {"quantity": new_qty, "avg_price": new_avg, "symbol": clean_symbol}}
             )
         else:
             new_holding = {
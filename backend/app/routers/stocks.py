@@ -1,147 +1,119 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 # ✅ NEW: Imported get_stock_details
-from app.services.finance import get_live_price, get_google_news, get_stock_details
+from app.services.finance import get_live_price, get_stock_details, quote_cache, warm_quotes, resolve_symbol
+from app.services.news import news_store, MARKET_QUERY
 from app.services.ai_service import ai_engine
+from app.services.ohlc_store import ohlc_store
+from app.services.indices import market_indices
+from app.core.config import settings
+from app.services.symbol_master import symbol_master
+from app.services.threadpool import finance_pool
+import logging
 import requests
-import yfinance as yf
-import pandas as pd
 from async_lru import alru_cache
+from app.services.telemetry import track_cache
 
 router = APIRouter()
+logger = logging.getLogger("StockWatcher")
 
 # ==========================================
-# 1. HELPER: CACHED SEARCH
+# 1. HELPER: SEARCH RESULTS
 # ==========================================
+def _with_cached_prices(matches: list) -> list:
+    """
+    Prices shared quote cache se (0.0 agar abhi cache mein nahi). Missing
+    symbols background mein warm hote hain, toh agle keystroke par price aa jaata hai.
+    """
+    suggestions = []
+    missing = []
+    for m in matches:
+        cached = quote_cache.peek(m["symbol"])
+        if cached is None:
+            missing.append(m["symbol"])
+        suggestions.append({
+            "symbol": m["symbol"],
+            "name": m["name"],
+            "current_price": round(cached["price"], 2) if cached else 0.0,
+            "currency": m["currency"],
+        })
+    if missing:
+        warm_quotes(missing)
+    return suggestions
+
+def _yahoo_search_sync(query: str) -> list:
+    url = "https://query1.finance.yahoo.com/v1/finance/search"
+    params = {"q": query, "quotesCount": 10, "newsCount": 0}
+    res = requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=3)
+    return res.json().get("quotes", [])
+
+@track_cache("yahoo_search")
 @alru_cache(maxsize=200, ttl=3600)
 async def fetch_yahoo_search(query: str):
+    """Fallback jab local symbol master mein kuch na mile (naya listing, ajeeb naam)."""
     try:
-        url = f"https://query1.finance.yahoo.com/v1/finance/search?q={query}&quotesCount=10&newsCount=0"
-        headers = { "User-Agent": "Mozilla/5.0" }
-        res = requests.get(url, headers=headers, timeout=3)
-        data = res.json()
-        
-        suggestions = []
-        if "quotes" in data:
-            filtered_quotes = []
-            for q in data["quotes"]:
-                sym = q.get("symbol", "")
-                
-                # Condition 1: Indian Stocks
-                is_india = sym.endswith((".NS", ".BO"))
-                
-                # Condition 2: US Stocks (No dot, like AAPL)
-                is_us = "." not in sym
-                
-                if is_india or is_us:
-                    filtered_quotes.append(q)
-            
-            filtered_quotes = filtered_quotes[:5]
-
-            if filtered_quotes:
-                symbols = [q["symbol"] for q in filtered_quotes]
-                
-                try:
-                    price_data = yf.download(symbols, period="1d", progress=False, auto_adjust=True)
-                    
-                    for q in filtered_quotes:
-                        sym = q.get("symbol")
-                        price = 0.0
-                        
-                        try:
-                            if len(symbols) == 1:
-                                if not price_data.empty:
-                                    price = float(price_data["Close"].iloc[-1])
-                            else:
-                                if sym in price_data["Close"].columns:
-                                    price = float(price_data["Close"][sym].iloc[-1])
-                        except:
-                            price = 0.0
-
-                        # ✅ Detect Currency
-                        currency = "INR" if sym.endswith((".NS", ".BO")) else "USD"
-
-                        suggestions.append({
-                            "symbol": sym,
-                            "name": q.get("longname") or q.get("shortname") or sym,
-                            "current_price": round(price, 2),
-                            "currency": currency
-                        })
-                except Exception as e:
-                    print(f"Price Fetch Error: {e}")
-                    for q in filtered_quotes:
-                        suggestions.append({
-                            "symbol": q.get("symbol"),
-                            "name": q.get("longname"),
-                            "current_price": 0.0,
-                            "currency": "USD" if "." not in q.get("symbol") else "INR"
-                        })
-
-        return suggestions
+        quotes = await finance_pool.run(_yahoo_search_sync, query, label="yahoo_search")
     except Exception as e:
-        print(f"Search Error: {e}")
+        logger.warning(f"Search Error: {e}")
         return []
 
+    matches = []
+    for q in quotes:
+        sym = q.get("symbol", "")
+        # Sirf Indian (.NS / .BO) aur US (no dot, like AAPL) stocks
+        if sym.endswith((".NS", ".BO")) or (sym and "." not in sym):
+            matches.append({
+                "symbol": sym,
+                "name": q.get("longname") or q.get("shortname") or sym,
+                "currency": "INR" if sym.endswith((".NS", ".BO")) else "USD",
+            })
+    return matches[:5]
+
 # ==========================================
 # 2. API ROUTES
 # ==========================================
 
 @router.get("/indices")
-async def get_market_indices():
-    try:
-        nifty_data = yf.download("^NSEI", period="1d", auto_adjust=True, progress=False)
-        sensex_data = yf.download("^BSESN", period="1d", auto_adjust=True, progress=False)
-        
-        if not nifty_data.empty and isinstance(nifty_data.columns, pd.MultiIndex):
-            nifty_data.columns = nifty_data.columns.get_level_values(0)
-        
-        if not sensex_data.empty and isinstance(sensex_data.columns, pd.MultiIndex):
-            sensex_data.columns = sensex_data.columns.get_level_values(0)
-
-        nifty = round(float(nifty_data["Close"].iloc[-1]), 2) if not nifty_data.empty else 0.0
-        sensex = round(float(sensex_data["Close"].iloc[-1]), 2) if not sensex_data.empty else 0.0
-        
-        return {"nifty": nifty, "sensex": sensex}
-    except Exception as e:
-        return {"nifty": 0.0, "sensex": 0.0}
+async def get_market_indices(request: Request):
+    """
+    {"nifty": .., "sensex": .., "banknifty": .., ...} memory snapshot se (MARKET_INDICES).
+    Background job refresh karta hai; yahan koi upstream call nahi.
+    """
+    await market_indices.ensure_loaded()
+    headers = {
+        "ETag": market_indices.etag,
+        "Cache-Control": f"public, max-age={settings.INDICES_REFRESH_SECONDS}",
+    }
+    if request.headers.get("if-none-match") == market_indices.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=market_indices.payload, media_type="application/json", headers=headers)
 
 @router.get("/search-stock")
 async def search_stock(query: str):
-    return await fetch_yahoo_search(query)
+    """
+    Autocomplete: local symbol master (prefix + fuzzy index) se, koi upstream call nahi.
+    Local list mein match na ho tabhi Yahoo search (cached) fallback.
+    """
+    matches = symbol_master.search(query, limit=5)
+    if not matches:
+        matches = await fetch_yahoo_search(query.strip().lower())
+    return _with_cached_prices(matches)
 
 @router.get("/stock-history/{symbol}")
 async def get_stock_history(symbol: str):
+    """
+    1 month daily closes, local OHLC store se (sirf naye bars upstream se aate hain).
+    Response pehle se serialized JSON bytes hai, per-row loop nahi.
+    """
+    # .NS / .BO ka faisla symbol resolution cache karta hai (unknown symbols negative cached)
+    ticker_name = await resolve_symbol(symbol)
+    if ticker_name is None:
+        return []
+
     try:
-        clean_sym = symbol.upper().strip()
-        
-        tickers_to_try = [clean_sym]
-        if not clean_sym.endswith((".NS", ".BO")):
-            tickers_to_try.extend([f"{clean_sym}.NS", f"{clean_sym}.BO"])
-        
-        for ticker_name in tickers_to_try:
-            try:
-                data = yf.download(ticker_name, period="1mo", interval="1d", auto_adjust=True, progress=False)
-                
-                if not data.empty:
-                    if isinstance(data.columns, pd.MultiIndex):
-                        data.columns = data.columns.get_level_values(0)
-                    
-                    data = data.reset_index()
-                    result = []
-                    
-                    for _, row in data.iterrows():
-                        try:
-                            date_val = row['Date'].strftime("%d %b")
-                            close_val = row['Close']
-                            price_val = float(close_val.iloc[0]) if hasattr(close_val, 'iloc') else float(close_val)
-                            
-                            if price_val > 0:
-                                result.append({"date": date_val, "price": round(price_val, 2)})
-                        except: continue
-                    
-                    if result: return result
-            except: continue
+        payload = await ohlc_store.get_payload(ticker_name, days=30)
+    except Exception:
         return []
-    except: return []
+    return Response(content=payload, media_type="application/json")
 
 # --- AI Analysis Route (UPDATED) ---
 @router.get("/analyze-stock/{symbol}")
@@ -154,7 +126,7 @@ async def analyze_stock(symbol: str):
     
     # ✅ FIX: Pass Currency to AI
     return {
-        "analysis": ai_engine.analyze(
+        "analysis": await ai_engine.analyze(
             symbol=symbol, 
             price=details['price'], 
             change="N/A", 
@@ -165,8 +137,9 @@ async def analyze_stock(symbol: str):
 
 @router.get("/market-news")
 async def get_market_news_route():
-    return await get_google_news("Stock Market")
+    # Background job isse fresh rakhta hai; request kabhi live RSS fetch par wait nahi karta
+    return await news_store.get(MARKET_QUERY)
 
 @router.get("/stock-news/{symbol}")
 async def get_stock_news_route(symbol: str):
-    return await get_google_news(symbol)
+    return await news_store.get(symbol)
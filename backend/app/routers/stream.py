@@ -0,0 +1,73 @@
+import json
+import time
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.services.price_stream import price_stream
+from app.services.finance import quote_cache, resolve_symbol
+
+router = APIRouter()
+
+MAX_SYMBOLS_PER_STREAM = 50
+HEARTBEAT_SECONDS = 15
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+# ==========================================
+# 📡 Live Price Stream (Server-Sent Events)
+# ==========================================
+@router.get("/stream/prices")
+async def stream_prices(symbols: str, request: Request):
+    """
+    Comma-separated symbols ke live prices push karta hai, e.g. ?symbols=AAPL,TCS.NS
+    Prices background tracker ke fetch se aate hain, client polling ki zaroorat nahi.
+    Symbols resolver se validate hote hain (tracker ke fetch set mein sirf real tickers);
+    events mein client ke bheje hue naam hi wapas jaate hain.
+    """
+    wanted = [s.upper().strip() for s in symbols.split(",") if s.strip()]
+    wanted = list(dict.fromkeys(wanted))
+
+    if not wanted:
+        raise HTTPException(status_code=400, detail="At least one symbol is required")
+    if len(wanted) > MAX_SYMBOLS_PER_STREAM:
+        raise HTTPException(status_code=400, detail=f"Max {MAX_SYMBOLS_PER_STREAM} symbols per stream")
+
+    resolved = await asyncio.gather(*(resolve_symbol(sym) for sym in wanted))
+    unknown = [sym for sym, canonical in zip(wanted, resolved) if canonical is None]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown symbol: {', '.join(unknown)}")
+    aliases = {}  # canonical -> client ke naam
+    for sym, canonical in zip(wanted, resolved):
+        aliases.setdefault(canonical, []).append(sym)
+
+    def as_requested(prices: dict) -> dict:
+        return {alias: price for sym, price in prices.items() for alias in aliases.get(sym, ())}
+
+    async def event_source():
+        sub_id = price_stream.subscribe(aliases)
+        try:
+            # 1. Turant snapshot: shared cache mein jo price pehle se hai
+            snapshot = {}
+            for sym in aliases:
+                cached = quote_cache.peek(sym)
+                if cached:
+                    snapshot[sym] = cached["price"]
+            snapshot = as_requested(snapshot)
+            yield _sse("snapshot", {"prices": snapshot, "ts": time.time()})
+
+            # 2. Har tick ke updates; beech mein heartbeat taaki proxies connection na kaatein
+            while not await request.is_disconnected():
+                updates = await price_stream.next_update(sub_id, timeout=HEARTBEAT_SECONDS)
+                if updates is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield _sse("prices", {"prices": as_requested(updates), "ts": time.time()})
+        finally:
+            price_stream.unsubscribe(sub_id)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -4,6 +4,7 @@ from app.models.user import User
 from app.models.alert import Alert
 # Notifier service import karein
 from app.services.notifier import send_telegram_notification 
+from app.services.alert_index import alert_index
 
 # ============================================================
 # ✅ FIX: Router ko sabse pehle define karein (To avoid Circular Import)
@@ -48,6 +49,7 @@ async def update_telegram_id(data: TelegramUpdateRequest):
             Alert.email == data.email, 
             Alert.status == "active"
         ).update({"$set": {"telegram_id": data.telegram_id}})
+        alert_index.set_telegram_id(data.email, data.telegram_id)
 
         return {
             "status": "success",
@@ -1,16 +1,162 @@
 import google.generativeai as genai
+import math
+import time
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from app.core.config import settings
+from app.services.threadpool import finance_pool
 
 logger = logging.getLogger("StockWatcher")
 
+# Prompt + jawab ke tokens ka andaza (~4 chars per token); rate limiter isi se kaat-ta hai
+CHARS_PER_TOKEN = 4
+MAX_OUTPUT_TOKENS = 400
+
+
+class _StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _StubChat:
+    def __init__(self, model):
+        self.model = model
+
+    async def send_message_async(self, message: str, **kwargs):
+        self.model.calls += 1
+        if self.model.latency:
+            await asyncio.sleep(self.model.latency)
+        return _StubResponse("📈 StockBot (offline stub): I can't reach the model right now, but your question was received.")
+
+
+class StubModel:
+    """
+    Offline model (AI_STUB=true): Gemini jaisa hi async interface, deterministic jawab.
+    Local dev aur benchmarks bina API key/network ke poora pipeline chala sakte hain.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_content_async(self, prompt: str, **kwargs):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        trend = ("Bullish", "Bearish", "Sideways", "Volatile")[int(hashlib.md5(prompt.encode()).hexdigest(), 16) % 4]
+        return _StubResponse(
+            f"📈 **Trend:** {trend}\n\n"
+            "💡 **Analysis:** Offline stub analysis; no model was called.\n\n"
+            "🎯 **Strategy:** Hold for Long Term\n\n"
+            "⚠️ **Risk Factor:** Medium - Stub response"
+        )
+
+    def start_chat(self, history=None):
+        return _StubChat(self)
+
+
+class TokenBucket:
+    """
+    Token-budget rate limiter: `rate_per_minute` tokens per minute refill hote hain,
+    `capacity` tak burst allowed. Budget khatam ho toh call wait nahi karti, turant
+    mana ho jaati hai (request handler LLM ke liye queue mein nahi atakta).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, cost: float) -> bool:
+        self._refill()
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def retry_after(self, cost: float) -> float:
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate) if self.rate else float("inf")
+
+
+# ✅ UPDATED SYSTEM PROMPT (Supports US + India)
+CHAT_SYSTEM_INSTRUCTION = """
+You are 'StockBot', a smart and friendly AI Financial Assistant for the StockWatcher App.
+
+Your Rules:
+1. You are an expert in BOTH **Indian Stock Market (NSE/BSE)** and **US Stock Market (NASDAQ/NYSE)**.
+2. Keep answers concise (under 3-4 sentences) unless asked for details.
+3. Use Emojis 📈 to make it engaging.
+4. Be aware of currency: Use '₹' for Indian stocks and '$' for US stocks.
+5. If asked about non-financial topics, politely refuse.
+6. Do NOT give direct financial advice (e.g., "Buy Apple now"). Instead say "Apple is showing bullish signs based on technicals...".
+"""
+CHAT_PERSONA_REPLY = "Understood. I am StockBot, ready to assist with insights on Indian and US Markets! 🚀"
+
+
+class AIUnavailableError(Exception):
+    """Model configure nahi hua (key missing / Gemini error)."""
+
+
+class AIRateLimitedError(Exception):
+    """Token budget khatam; `retry_after` seconds baad try karein."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"AI token budget exhausted, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def _price_bucket(price: float) -> int:
+    """
+    Log-scale bucket: AI_PRICE_BUCKET_PCT% ke andar ke prices ek hi analysis share karte hain
+    (₹100 aur $3000 dono par same relative width).
+    """
+    if not price or price <= 0:
+        return 0
+    return int(math.floor(math.log(price) / math.log1p(settings.AI_PRICE_BUCKET_PCT / 100.0)))
+
+
 class AIService:
+    """
+    Gemini analysis: async generation, (symbol, price bucket, currency) par TTL cache,
+    in-flight dedup aur token-budget rate limiter.
+
+    Popular symbol par har TTL period mein ek hi LLM call lagti hai, chahe kitne bhi
+    users page kholein. Rate limit hit ho toh purana (expired) analysis mil jaata hai
+    agar hai, warna "busy" message.
+    """
+
     def __init__(self):
         self.model = None
         self.model_name = "Unknown"
+        self._configure_failed_at = None
+        self._cache = OrderedDict()  # (symbol, bucket, currency) -> (text, expires_at)
+        self._inflight = {}          # key -> asyncio.Task
+        self.limiter = TokenBucket(settings.AI_TOKENS_PER_MINUTE)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.failures = 0
         self.configure()
+        if not self.model:
+            self._configure_failed_at = time.monotonic()
 
     def configure(self):
+        if settings.AI_STUB:
+            self.model = StubModel(latency=settings.AI_STUB_LATENCY)
+            self.model_name = "stub"
+            logger.info("🤖 AI: Using offline stub model (AI_STUB=true)")
+            return
+
         if not settings.GEMINI_API_KEY:
             logger.warning("⚠️ GEMINI_API_KEY missing in .env")
             return
@@ -53,55 +199,146 @@ class AIService:
         except Exception as e:
             logger.error(f"❌ AI Config Error: {e}")
 
-    # ✅ UDPATED: Added 'currency' parameter
-    def analyze(self, symbol, price, change, source, currency="INR"):
-        if not self.model:
-            self.configure()
-            if not self.model:
-                return "AI Unavailable: Check API Key or Server Logs."
+    @staticmethod
+    def build_prompt(symbol, price, change, source, currency="INR") -> str:
+        # --- DYNAMIC CONTEXT SETTING ---
+        if currency == "USD":
+            market_context = "US Stock Market (NASDAQ/NYSE)"
+            currency_symbol = "$"
+        else:
+            market_context = "Indian Stock Market (NSE/BSE)"
+            currency_symbol = "₹"
+
+        # --- IMPROVED PROFESSIONAL PROMPT ---
+        prompt = f"""
+        You are a Senior Financial Analyst for the {market_context}.
+        Analyze the following stock data based on technical price action and your knowledge of the company's fundamentals.
+
+        📊 **Stock Data:**
+        - Symbol: {symbol}
+        - Current Price: {currency_symbol}{price} (Source: {source})
+        - Currency: {currency}
+        - 1 Month Return: {change}
+
+        📝 **Instructions:**
+        1. Consider the 1-month return to determine short-term momentum.
+        2. Combine this with your internal knowledge about the company's sector.
+        3. Keep the tone professional, concise, and actionable.
+
+        📋 **Response Format (Strictly follow this structure):**
+        
+        📈 **Trend:** [Bullish / Bearish / Sideways / Volatile]
+        
+        💡 **Analysis:** [Provide 2-3 sentences explaining WHY. Mention if the stock is overbought, oversold, or reacting to sector news.]
+        
+        🎯 **Strategy:** [Accumulate on Dips / Hold for Long Term / Book Profits / Avoid]
+        
+        ⚠️ **Risk Factor:** [Low / Medium / High] - [One short reason, e.g., "High Valuation" or "Market Volatility"]
+        """
+        return prompt
+
+    # ---------------- Generation ----------------
+
+    async def _generate(self, prompt: str) -> str:
+        response = await asyncio.wait_for(self.model.generate_content_async(prompt), timeout=settings.AI_TIMEOUT_SECONDS)
+        return response.text.strip()
+
+    def _store(self, key, text: str):
+        self._cache[key] = (text, time.monotonic() + settings.AI_CACHE_TTL)
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.AI_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _run(self, key, prompt: str, stale):
+        cost = len(prompt) / CHARS_PER_TOKEN + MAX_OUTPUT_TOKENS
+        if not self.limiter.try_acquire(cost):
+            self.rate_limited += 1
+            if stale is not None:
+                return stale
+            return f"AI is busy right now. Please try again in {math.ceil(self.limiter.retry_after(cost))}s."
 
         try:
-            # --- DYNAMIC CONTEXT SETTING ---
-            if currency == "USD":
-                market_context = "US Stock Market (NASDAQ/NYSE)"
-                currency_symbol = "$"
-            else:
-                market_context = "Indian Stock Market (NSE/BSE)"
-                currency_symbol = "₹"
-
-            # --- IMPROVED PROFESSIONAL PROMPT ---
-            prompt = f"""
-            You are a Senior Financial Analyst for the {market_context}.
-            Analyze the following stock data based on technical price action and your knowledge of the company's fundamentals.
-
-            📊 **Stock Data:**
-            - Symbol: {symbol}
-            - Current Price: {currency_symbol}{price} (Source: {source})
-            - Currency: {currency}
-            - 1 Month Return: {change}
-
-            📝 **Instructions:**
-            1. Consider the 1-month return to determine short-term momentum.
-            2. Combine this with your internal knowledge about the company's sector.
-            3. Keep the tone professional, concise, and actionable.
-
-            📋 **Response Format (Strictly follow this structure):**
-            
-            📈 **Trend:** [Bullish / Bearish / Sideways / Volatile]
-            
-            💡 **Analysis:** [Provide 2-3 sentences explaining WHY. Mention if the stock is overbought, oversold, or reacting to sector news.]
-            
-            🎯 **Strategy:** [Accumulate on Dips / Hold for Long Term / Book Profits / Avoid]
-            
-            ⚠️ **Risk Factor:** [Low / Medium / High] - [One short reason, e.g., "High Valuation" or "Market Volatility"]
-            """
-            
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
-            
+            text = await self._generate(prompt)
         except Exception as e:
+            self.failures += 1
             logger.error(f"AI Generation Failed: {e}")
-            return "AI Analysis temporarily unavailable."
+            return stale if stale is not None else "AI Analysis temporarily unavailable."
+
+        self._store(key, text)
+        return text
+
+    async def _ensure_model(self) -> bool:
+        """
+        Model ready hai? Nahi toh configure() pool mein (list_models network call hai),
+        lekin fail hone ke baad AI_CONFIGURE_RETRY_SECONDS tak har request par nahi.
+        """
+        if self.model:
+            return True
+        if self._configure_failed_at is not None and \
+                time.monotonic() - self._configure_failed_at < settings.AI_CONFIGURE_RETRY_SECONDS:
+            return False
+        await finance_pool.run(self.configure, label="ai_configure")
+        self._configure_failed_at = None if self.model else time.monotonic()
+        return self.model is not None
+
+    async def chat(self, message: str) -> str:
+        """
+        StockBot chat: async send + wahi token budget jo analysis use karta hai
+        (dono ek hi Gemini quota se chalte hain). Personal hai, isliye cache nahi.
+        """
+        if not await self._ensure_model():
+            raise AIUnavailableError()
+
+        cost = (len(CHAT_SYSTEM_INSTRUCTION) + len(message)) / CHARS_PER_TOKEN + MAX_OUTPUT_TOKENS
+        if not self.limiter.try_acquire(cost):
+            self.rate_limited += 1
+            raise AIRateLimitedError(self.limiter.retry_after(cost))
+
+        # Gemini Chat Session Start with Persona
+        session = self.model.start_chat(history=[
+            {"role": "user", "parts": CHAT_SYSTEM_INSTRUCTION},
+            {"role": "model", "parts": CHAT_PERSONA_REPLY},
+        ])
+        response = await asyncio.wait_for(session.send_message_async(message), timeout=settings.AI_TIMEOUT_SECONDS)
+        return response.text
+
+    # ✅ UDPATED: Added 'currency' parameter
+    async def analyze(self, symbol, price, change, source, currency="INR"):
+        if not await self._ensure_model():
+            return "AI Unavailable: Check API Key or Server Logs."
+
+        key = (symbol.upper(), _price_bucket(price), currency)
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return entry[0]
+
+        # Same key par pehle se call chal rahi hai toh usi ka result share karein
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        prompt = self.build_prompt(symbol, price, change, source, currency)
+        task = asyncio.ensure_future(self._run(key, prompt, entry[0] if entry else None))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "cached": len(self._cache),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "tokens_available": round(self.limiter.tokens, 1),
+        }
 
 # Singleton Instance
 ai_engine = AIService()
@@ -0,0 +1,299 @@
+import time
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.core.config import settings
+from app.models.alert import Alert, TrackedAlert
+
+logger = logging.getLogger("StockWatcher")
+
+
+class _Side:
+    """
+    Ek symbol ki ek direction (UP ya DOWN) ke targets.
+    `targets` hamesha sorted rehta hai, `ids` usi order mein aligned hai.
+    """
+    __slots__ = ("targets", "ids")
+
+    def __init__(self):
+        self.targets = []
+        self.ids = []
+
+    def insert(self, target: float, alert_id: str):
+        i = bisect_right(self.targets, target)
+        self.targets.insert(i, target)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, target: float, alert_id: str):
+        i = bisect_left(self.targets, target)
+        while i < len(self.targets) and self.targets[i] == target:
+            if self.ids[i] == alert_id:
+                del self.targets[i]
+                del self.ids[i]
+                return True
+            i += 1
+        return False
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class AlertIndex:
+    """
+    Resident index of active alerts.
+
+    Har symbol ke liye UP aur DOWN targets alag sorted arrays mein rakhe jaate hain:
+    - UP alert fire hota hai jab price >= target  -> sorted prefix [0:k]
+    - DOWN alert fire hota hai jab price <= target -> sorted suffix [k:]
+    Dono cases mein k ek bisect se milta hai, toh evaluation O(log n + k) hai.
+    """
+
+    def __init__(self):
+        self._up = {}        # symbol -> _Side
+        self._down = {}      # symbol -> _Side
+        self._alerts = {}    # alert_id -> record dict
+        self._by_email = {}  # email -> set(alert_id)
+        self.loaded_at = None
+        self._journal = None  # Reload ke dauraan aaye mutations yahan replay ke liye
+        self._resync = False  # Delta poll ne deletions dekhe: reload jaldi
+
+    # ---------------- Build / Reload ----------------
+
+    @staticmethod
+    def _record(alert) -> dict:
+        return {
+            "id": str(alert.id),
+            "stock_symbol": alert.stock_symbol,
+            "target_price": float(alert.target_price),
+            # Default direction to UP if old alerts don't have it
+            "direction": getattr(alert, "direction", None) or "UP",
+            "email": alert.email,
+            "telegram_id": getattr(alert, "telegram_id", None),
+        }
+
+    def is_stale(self) -> bool:
+        """
+        Dusre uvicorn workers ke API calls is process ke index tak nahi pahunchte,
+        isliye index periodic resync se Mongo ke saath consistent rehta hai.
+        """
+        if self.loaded_at is None or self._resync:
+            return True
+        return (time.monotonic() - self.loaded_at) >= settings.ALERT_INDEX_RESYNC_SECONDS
+
+    async def load(self):
+        """Mongo se saare active alerts padh kar index dobara banata hai."""
+        self._journal = []
+        fresh = AlertIndex()
+        fresh.loaded_at = 0.0  # Taaki fresh.add() skip na kare
+
+        try:
+            async for alert in Alert.find(Alert.status == "active").project(TrackedAlert):
+                fresh.add(alert)
+        except Exception:
+            self._journal = None
+            raise
+
+        # Load ke beech hue add/remove ko naye index par replay karein
+        for op, args in self._journal:
+            getattr(fresh, op)(*args)
+
+        self._up, self._down = fresh._up, fresh._down
+        self._alerts, self._by_email = fresh._alerts, fresh._by_email
+        self._journal = None
+        self._resync = False
+        self.loaded_at = time.monotonic()
+        logger.info(f"📇 Alert index loaded: {len(self._alerts)} alerts across {len(self.symbols())} symbols")
+
+    async def follow_changes(self):
+        """
+        Long-running task: `alerts` collection ka change stream follow karta hai, taaki
+        API process mein bane/delete hue alerts alag tracker worker ke index mein
+        seconds mein pahunch jaayein (periodic resync ka wait kiye bina).
+
+        Change streams ke liye replica set chahiye (Atlas par hota hai). Na ho toh
+        `_poll_changes` delta poll par fallback hota hai.
+        """
+        collection = Alert.get_motor_collection()
+        while True:
+            try:
+                async with collection.watch(full_document="updateLookup") as stream:
+                    logger.info("👀 Following alert changes (change stream)")
+                    async for change in stream:
+                        self._apply_change(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                code = getattr(e, "code", None)
+                if code in (40573, 40324):  # Standalone server: change streams supported nahi
+                    logger.warning("Change streams unavailable, polling alert changes every "
+                                   f"{settings.ALERT_INDEX_POLL_SECONDS}s")
+                    await self._poll_changes()
+                    return
+                logger.warning(f"Alert change stream interrupted, reconnecting: {e}")
+                await asyncio.sleep(5)
+
+    async def _poll_changes(self):
+        """
+        Standalone Mongo fallback, har ALERT_INDEX_POLL_SECONDS sirf delta padhta hai:
+        - Naye alerts: `_id` (ObjectId mein creation time) watermark ke baad wale -> add.
+        - Trigger hue alerts (kisi bhi node par): `triggered_at` watermark ke baad -> remove.
+        Watermark mein thoda overlap hai (clock skew); add() / remove() idempotent hain.
+
+        Delete ka koi trace nahi bachta, isliye deltas ke baad bhi active count index se
+        lagaataar do polls tak kam rahe (asli divergence, race nahi) tabhi full reload.
+        """
+        since = datetime.utcnow()
+        diverged = 0
+        while True:
+            await asyncio.sleep(settings.ALERT_INDEX_POLL_SECONDS)
+            try:
+                started = datetime.utcnow()
+                watermark = since - timedelta(seconds=10)
+
+                async for alert in Alert.find(
+                    Alert.id >= ObjectId.from_datetime(watermark), Alert.status == "active"
+                ).project(TrackedAlert):
+                    if str(alert.id) not in self._alerts:
+                        self.add(alert)
+
+                triggered = Alert.get_motor_collection().find(
+                    {"status": "triggered", "triggered_at": {"$gte": watermark}}, {"_id": 1}
+                )
+                async for doc in triggered:
+                    self.remove(doc["_id"])
+                since = started
+
+                if self.loaded_at is not None and await Alert.find(Alert.status == "active").count() < len(self):
+                    diverged += 1
+                    if diverged >= 2:
+                        self._resync = True  # Alerts delete hue: agle tick par full reload
+                        diverged = 0
+                else:
+                    diverged = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Alert change poll failed: {e}")
+
+    def _apply_change(self, change: dict):
+        op = change.get("operationType")
+        alert_id = change.get("documentKey", {}).get("_id")
+        if alert_id is None:
+            return
+
+        doc = change.get("fullDocument")
+        if op == "delete" or doc is None:
+            self.remove(alert_id)
+        elif op in ("insert", "update", "replace"):
+            if doc.get("status") == "active":
+                self.add(TrackedAlert(**doc))
+            else:
+                self.remove(alert_id)
+
+    def _log(self, op: str, *args) -> bool:
+        """True return karta hai agar mutation apply nahi karna (index abhi bana hi nahi)."""
+        if self._journal is not None:
+            self._journal.append((op, args))
+        return self.loaded_at is None
+
+    # ---------------- Mutations ----------------
+
+    def add(self, alert):
+        if self._log("add", alert):
+            return
+        if getattr(alert, "status", "active") != "active":
+            return
+
+        rec = self._record(alert)
+        if rec["id"] in self._alerts:
+            self.remove(rec["id"])
+
+        book = self._up if rec["direction"] == "UP" else self._down
+        book.setdefault(rec["stock_symbol"], _Side()).insert(rec["target_price"], rec["id"])
+        self._alerts[rec["id"]] = rec
+        self._by_email.setdefault(rec["email"], set()).add(rec["id"])
+
+    def remove(self, alert_id):
+        alert_id = str(alert_id)
+        if self._log("remove", alert_id):
+            return None
+
+        rec = self._alerts.pop(alert_id, None)
+        if rec is None:
+            return None
+
+        book = self._up if rec["direction"] == "UP" else self._down
+        side = book.get(rec["stock_symbol"])
+        if side is not None:
+            side.remove(rec["target_price"], alert_id)
+            if not side:
+                del book[rec["stock_symbol"]]
+
+        ids = self._by_email.get(rec["email"])
+        if ids is not None:
+            ids.discard(alert_id)
+            if not ids:
+                del self._by_email[rec["email"]]
+        return rec
+
+    def remove_by_email(self, email: str):
+        if self._log("remove_by_email", email):
+            return
+        for alert_id in list(self._by_email.get(email, ())):
+            self.remove(alert_id)
+
+    def set_telegram_id(self, email: str, telegram_id):
+        if self._log("set_telegram_id", email, telegram_id):
+            return
+        for alert_id in self._by_email.get(email, ()):
+            self._alerts[alert_id]["telegram_id"] = telegram_id
+
+    # ---------------- Queries ----------------
+
+    def symbols(self) -> list:
+        return list(self._up.keys() | self._down.keys())
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def _crossed(self, symbol: str, price: float):
+        """(UP side, k_up, DOWN side, k_down) jahan crossed range bisect se nikli hai."""
+        up = self._up.get(symbol)
+        down = self._down.get(symbol)
+        k_up = bisect_right(up.targets, price) if up else 0
+        k_down = bisect_left(down.targets, price) if down else 0
+        return up, k_up, down, k_down
+
+    def triggered(self, symbol: str, price: float) -> list:
+        """Given price par fire hone wale alerts (index se hataye bina)."""
+        up, k_up, down, k_down = self._crossed(symbol, price)
+        ids = (up.ids[:k_up] if up else []) + (down.ids[k_down:] if down else [])
+        return [self._alerts[i] for i in ids]
+
+    def nearest_gap(self, symbol: str, price: float):
+        """
+        Price se sabse nazdeeki active target ki fractional doori (0.01 = 1%).
+        Koi target nahi toh None. Adaptive poll interval isi se decide hota hai.
+        """
+        if price <= 0:
+            return None
+        up, k_up, down, k_down = self._crossed(symbol, price)
+        gaps = []
+        if up and k_up < len(up):
+            gaps.append(up.targets[k_up] - price)      # Sabse chhota UP target jo abhi cross nahi hua
+        if down and k_down > 0:
+            gaps.append(price - down.targets[k_down - 1])  # Sabse bada DOWN target jo abhi cross nahi hua
+        return min(gaps) / price if gaps else None
+
+    def pop_triggered(self, symbol: str, price: float) -> list:
+        """Triggered alerts return karke unhe index se hata deta hai."""
+        fired = self.triggered(symbol, price)
+        for rec in fired:
+            self.remove(rec["id"])
+        return fired
+
+
+# Singleton Instance
+alert_index = AlertIndex()
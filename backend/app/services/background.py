@@ -1,93 +1,172 @@
-import asyncio
+import time
+import uuid
 import logging
 from datetime import datetime
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from app.core.config import settings
 from app.models.alert import Alert
 
 # ✅ Correct Imports
-from app.services.finance import get_live_price 
-from app.utils.email import send_email_notification 
-from app.services.notifier import send_telegram_notification 
+from app.services.finance import get_bulk_prices, QUOTE_BATCH_SIZE
+from app.services.alert_index import alert_index
+from app.services.price_stream import price_stream
+from app.services.outbox import enqueue_notifications, release_held
+from app.services.sharding import shard
+from app.services.live_quotes import save_live_quotes
+from app.services.market_hours import market_calendar, poll_planner
+from app.services.tick_metrics import tick_metrics
 
 logger = logging.getLogger("StockWatcher")
 
+async def mark_alerts_triggered(alert_ids: list, triggered_at: datetime = None) -> dict:
+    """
+    Ek tick ke saare triggered alerts ko ek unordered bulk_write mein save karta hai.
+    `status == "active"` guard ki wajah se koi alert do baar trigger nahi ho sakta.
+
+    `ids` = sirf woh alerts jo is call ne flip kiye. Stale index mein pade alerts
+    (dusre process ne delete / trigger kar diye) isme nahi aate.
+    """
+    if not alert_ids:
+        return {"matched": 0, "modified": 0, "ids": []}
+
+    triggered_at = triggered_at or datetime.utcnow()
+    token = uuid.uuid4().hex
+    ops = [
+        UpdateOne(
+            {"_id": PydanticObjectId(alert_id), "status": "active"},
+            {"$set": {"status": "triggered", "triggered_at": triggered_at, "trigger_token": token}}
+        )
+        for alert_id in alert_ids
+    ]
+    collection = Alert.get_motor_collection()
+    result = await collection.bulk_write(ops, ordered=False)
+
+    if result.modified_count == len(alert_ids):
+        ids = list(alert_ids)
+    elif result.modified_count == 0:
+        ids = []
+    else:
+        # Kuch hi flip hue: token se pata chalta hai kaunse (_id index par)
+        cursor = collection.find(
+            {"_id": {"$in": [PydanticObjectId(a) for a in alert_ids]}, "trigger_token": token}, {"_id": 1}
+        )
+        ids = [str(doc["_id"]) async for doc in cursor]
+    return {"matched": result.matched_count, "modified": result.modified_count, "ids": ids}
+
+async def _process_chunk(due: list, tracked: set, tick: dict):
+    """Ek chunk: fetch -> publish -> evaluate -> reschedule -> outbox + write-back."""
+    symbols = [sym for sym in due if sym in tracked]
+
+    # Fetch due prices (batched + concurrent) and push them to stream subscribers
+    prices = await get_bulk_prices(due, concurrency=settings.PRICE_FETCH_CONCURRENCY)
+    price_stream.publish(prices)
+
+    tick["symbols"] += len(due)
+    tick["fetch_failures"] += sum(1 for sym in due if prices.get(sym) is None)
+
+    # Evaluate every symbol
+    triggered = []
+
+    for symbol in symbols:
+        try:
+            current_price = prices.get(symbol)
+            
+            if current_price is None:
+                continue
+
+            # ✅ Bisect lookup: sirf crossed targets milte hain (UP aur DOWN dono)
+            for alert in alert_index.pop_triggered(symbol, current_price):
+                if alert["direction"] == "UP":
+                    logger.info(f"🚀 UP Target Hit: {symbol} reached {current_price}")
+                else:
+                    logger.info(f"📉 DOWN Target Hit: {symbol} dropped to {current_price}")
+
+                triggered.append((alert, current_price))
+
+        except Exception as e:
+            logger.error(f"Error processing symbol {symbol}: {e}")
+
+    # Agla due time: evaluation ke baad, taaki fire ho chuke targets gap mein na ginein
+    open_markets = market_calendar.open_markets()
+    for symbol in due:
+        price = prices.get(symbol)
+        gap = alert_index.nearest_gap(symbol, price) if price is not None else None
+        poll_planner.schedule(symbol, gap, open_markets)
+
+    if not settings.RUN_WORKER_IN_API:
+        # Alag worker process: API ke SSE clients tak Mongo relay se pahunchenge
+        # (schedule ke baad, taaki har quote ke saath agla due time bhi jaaye)
+        await save_live_quotes(prices)
+
+    if not triggered:
+        return
+    tick["alerts_triggered"] += len(triggered)
+
+    # 1. Outbox rows `held` state mein (abhi dispatch nahi honge)
+    # 2. Guarded flip: sirf jo abhi bhi active the. Split mode mein index stale ho
+    #    sakta hai (alert dusre process mein delete / trigger ho chuka).
+    # 3. Sirf flip hue alerts ke messages release. Baaki held rows (aur kisi bhi
+    #    step ke beech crash) dispatcher ka sweep alert ki state se resolve karta hai.
+    await enqueue_notifications(triggered, held=True)
+    result = await mark_alerts_triggered([alert["id"] for alert, _ in triggered])
+    queued = await release_held(result["ids"])
+    logger.info(
+        f"💾 Alert write-back: {len(triggered)} triggered, {queued} notifications queued, "
+        f"{result['matched']} matched, {result['modified']} modified"
+    )
+
 async def track_stock_prices():
     """
     Background task to monitor active stock alerts and trigger notifications for BOTH UP and DOWN trends.
+    Alerts resident AlertIndex se evaluate hote hain; Mongo sirf periodic resync ke liye padha jaata hai.
+
+    Pipeline:
+    1. Price batches PRICE_FETCH_CONCURRENCY tak parallel fetch hote hain.
+    2. Har tracker node sirf apne shard ke symbols evaluate karta hai
+       (services/sharding.py), toh zyada workers = kam symbols per node.
+       Job har TRACKER_TICK_SECONDS chalta hai lekin sirf due symbols fetch hote hain
+       (services/market_hours.py): band exchange ke symbols ~30 min mein ek baar,
+       khule market mein target ke jitne paas utna frequent.
+    3. Triggered alerts outbox mein likhe jaate hain aur phir bulk flip hote hain.
+       Email / Telegram delivery alag dispatcher (services/outbox.py) karta hai,
+       toh evaluation kabhi outbound I/O par wait nahi karta.
+    4. Due symbols chunks mein process hote hain. TRACKER_TICK_DEADLINE ke baad
+       naya chunk shuru nahi hota; bache symbols agle tick mein sabse pehle jaate hain.
+       Har tick ka hisaab tick_metrics mein (/api/metrics/tracker).
     """
+    tick = tick_metrics.begin()
     try:
-        # 1. Fetch all active alerts
-        active_alerts = await Alert.find(Alert.status == "active").to_list()
-        
-        if not active_alerts:
+        # 1. Resync the in-memory index if needed
+        if alert_index.is_stale():
+            await alert_index.load()
+
+        owned = shard.filter(alert_index.symbols())
+        # Live stream clients ke symbols bhi isi fetch mein aate hain
+        tracked = set(owned)
+        stream_symbols = [sym for sym in price_stream.subscribed_symbols() if sym not in tracked]
+        candidates = owned + stream_symbols
+        if not candidates:
             return
+        if len(poll_planner) > 2 * len(candidates):
+            poll_planner.retain(candidates)
+
+        # 2. Sirf due symbols: band markets rarely, target ke paas wale jaldi-jaldi
+        due = tick_metrics.prioritize(poll_planner.due(candidates))
 
-        # 2. Group by symbol
-        symbol_map = {}
-        for alert in active_alerts:
-            sym = alert.stock_symbol 
-            if sym not in symbol_map:
-                symbol_map[sym] = []
-            symbol_map[sym].append(alert)
-
-        # 3. Process each symbol
-        for symbol, alerts in symbol_map.items():
-            try:
-                current_price = await get_live_price(symbol)
-                
-                if current_price is None:
-                    continue
-
-                for alert in alerts:
-                    target = float(alert.target_price)
-                    # ✅ Default direction to UP if old alerts don't have it
-                    direction = getattr(alert, 'direction', 'UP') 
-                    
-                    # ✅ FIX: Handle both UP and DOWN logic
-                    is_triggered = False
-                    
-                    if direction == "UP" and current_price >= target:
-                        is_triggered = True
-                        logger.info(f"🚀 UP Target Hit: {symbol} reached {current_price}")
-                        
-                    elif direction == "DOWN" and current_price <= target:
-                        is_triggered = True
-                        logger.info(f"📉 DOWN Target Hit: {symbol} dropped to {current_price}")
-
-                    # If either condition is met, send alerts
-                    if is_triggered:
-                        tasks = []
-                        
-                        # --- Email Task ---
-                        if alert.email:
-                            tasks.append(send_email_notification(
-                                to_email=alert.email,
-                                symbol=symbol,
-                                current_price=current_price,
-                                target_price=target
-                            ))
-
-                        # --- Telegram Task ---
-                        if getattr(alert, 'telegram_id', None):
-                            logger.info(f"📨 Sending Telegram to {alert.telegram_id}")
-                            tasks.append(send_telegram_notification(
-                                chat_id=alert.telegram_id,
-                                symbol=symbol,
-                                target=target,
-                                current=current_price
-                            ))
-
-                        if tasks:
-                            await asyncio.gather(*tasks)
-
-                        # Update Status
-                        alert.status = "triggered"
-                        alert.triggered_at = datetime.utcnow()
-                        await alert.save()
-                        
-                await asyncio.sleep(0.5)
-
-            except Exception as e:
-                logger.error(f"Error processing symbol {symbol}: {e}")
+        # 3. Chunks with a deadline check in between
+        chunk = QUOTE_BATCH_SIZE * settings.PRICE_FETCH_CONCURRENCY
+        deadline = time.monotonic() + settings.TRACKER_TICK_DEADLINE
+        for i in range(0, len(due), chunk):
+            if i and time.monotonic() >= deadline:
+                rest = due[i:]
+                tick_metrics.carry_over(rest)
+                tick["carried_over"] = len(rest)
+                logger.warning(f"⏱️ Tick deadline reached, {len(rest)} symbols carried over to next tick")
+                break
+            await _process_chunk(due[i:i + chunk], tracked, tick)
 
     except Exception as e:
         logger.error(f"Global Background Task Error: {e}")
+    finally:
+        tick_metrics.finish(tick)
@@ -0,0 +1,152 @@
+import asyncio
+import time
+import uuid
+import logging
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.models.broadcast import BroadcastJob
+from app.models.user import User, UserEmail
+from app.services.mailer import mailer, build_message
+from app.utils.email import build_generic_html
+
+logger = logging.getLogger("StockWatcher")
+
+
+class _LeaseLost(Exception):
+    """Lease expire hokar kisi aur worker ne job claim kar liya."""
+
+
+def _lease_until() -> datetime:
+    # Lease kam se kam do batches jitni lambi, taaki slow batch ke beech job chori na ho
+    batch_seconds = settings.BROADCAST_BATCH_SIZE / settings.BROADCAST_RATE_PER_SECOND
+    return datetime.utcnow() + timedelta(seconds=max(settings.BROADCAST_LEASE_SECONDS, 2 * batch_seconds))
+
+
+async def _claim_job():
+    """
+    Ek queued job (retry backoff poora ho chuka ho) ya expired lease wala running job
+    atomically claim karta hai. Do workers kabhi ek hi job nahi chalayenge.
+    """
+    now = datetime.utcnow()
+    doc = await BroadcastJob.get_motor_collection().find_one_and_update(
+        {"$or": [
+            {"status": "queued", "$or": [{"next_attempt_at": None}, {"next_attempt_at": {"$lte": now}}]},
+            {"status": "running", "lease_until": {"$lt": now}},
+        ]},
+        {"$set": {
+            "status": "running",
+            "claim_token": uuid.uuid4().hex,
+            "lease_until": _lease_until(),
+        }},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+    return await BroadcastJob.get(doc["_id"]) if doc else None
+
+
+async def _run_job(job: BroadcastJob):
+    """
+    Users ko `_id` order mein cursor se batches mein stream karta hai aur pooled
+    SMTP connections par BROADCAST_RATE_PER_SECOND ki rate se bhejta hai.
+    Har batch se pehle lease renew hoti hai aur har batch ke baad progress (aur
+    resume point) Mongo mein save hota hai, dono claim token ke guard ke saath.
+    """
+    collection = BroadcastJob.get_motor_collection()
+    owned = {"_id": job.id, "claim_token": job.claim_token}
+    html_content = build_generic_html(job.message)
+    last_id = job.last_user_id
+
+    if job.started_at is None:
+        await collection.update_one({"_id": job.id}, {"$set": {"started_at": datetime.utcnow()}})
+
+    while True:
+        query = User.find(User.id > last_id) if last_id else User.find_all()
+        users = await query.sort("+_id").limit(settings.BROADCAST_BATCH_SIZE).project(UserEmail).to_list()
+        if not users:
+            break
+
+        renewed = await collection.update_one(owned, {"$set": {"lease_until": _lease_until()}})
+        if not renewed.matched_count:
+            raise _LeaseLost()
+
+        batch_started = time.monotonic()
+        results = await mailer.send_many([build_message(u.email, job.subject, html_content) for u in users])
+        sent = sum(1 for ok in results if ok)
+        last_id = users[-1].id
+
+        progress = await collection.update_one(
+            owned,
+            {
+                "$inc": {"sent": sent, "failed": len(results) - sent},
+                "$set": {"last_user_id": last_id, "lease_until": _lease_until()},
+            }
+        )
+        if not progress.matched_count:
+            raise _LeaseLost()
+
+        # Rate limit: ek batch ko kam se kam len(batch) / rate seconds lagne chahiye
+        min_duration = len(users) / settings.BROADCAST_RATE_PER_SECOND
+        elapsed = time.monotonic() - batch_started
+        if elapsed < min_duration:
+            await asyncio.sleep(min_duration - elapsed)
+
+    await collection.update_one(
+        owned,
+        {"$set": {"status": "completed", "finished_at": datetime.utcnow(), "lease_until": None, "claim_token": None}}
+    )
+
+
+async def _requeue_or_fail(job: BroadcastJob, error: Exception):
+    """
+    Transient error (Mongo / SMTP blip): job `last_user_id` se resume ke liye
+    backoff ke saath dobara queue hota hai. BROADCAST_MAX_ATTEMPTS ke baad failed.
+    """
+    attempts = job.attempts + 1
+    update = {"attempts": attempts, "last_error": str(error), "lease_until": None, "claim_token": None}
+    if attempts >= settings.BROADCAST_MAX_ATTEMPTS:
+        update.update({"status": "failed", "finished_at": datetime.utcnow()})
+        logger.error(f"Broadcast {job.id} failed after {attempts} attempts: {error}")
+    else:
+        backoff = settings.BROADCAST_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+        update.update({"status": "queued", "next_attempt_at": datetime.utcnow() + timedelta(seconds=backoff)})
+        logger.warning(f"Broadcast {job.id} attempt {attempts} failed, retrying in {backoff}s: {error}")
+    await BroadcastJob.get_motor_collection().update_one(
+        {"_id": job.id, "claim_token": job.claim_token}, {"$set": update}
+    )
+
+
+async def process_broadcast_jobs():
+    """
+    Scheduled job: pending broadcasts ek-ek karke chalata hai.
+    API request sirf job create karta hai, bhejna yahan hota hai.
+    """
+    while True:
+        job = await _claim_job()
+        if job is None:
+            return
+
+        logger.info(f"📢 Broadcast {job.id} started ({job.total} users)")
+        try:
+            await _run_job(job)
+            logger.info(f"✅ Broadcast {job.id} completed")
+        except _LeaseLost:
+            logger.warning(f"Broadcast {job.id} lease lost, another worker took over")
+        except Exception as e:
+            try:
+                await _requeue_or_fail(job, e)
+            except Exception as save_error:
+                # Mongo hi down hai: lease expire hone par job apne aap dobara claim hoga
+                logger.error(f"Broadcast {job.id} retry not saved: {save_error}")
+                return
+
+
+async def create_broadcast(subject: str, message: str, created_by: str) -> BroadcastJob:
+    job = BroadcastJob(
+        subject=subject,
+        message=message,
+        created_by=created_by,
+        total=await User.count(),
+    )
+    await job.create()
+    return job
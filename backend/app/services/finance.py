@@ -1,128 +1,481 @@
+import asyncio
 import requests
 import yfinance as yf
+from yfinance.exceptions import YFTickerMissingError, YFTzMissingError, YFPricesMissingError
 import pandas as pd
-import feedparser
-import urllib.parse
 import time
-from datetime import datetime
+from collections import OrderedDict
 from bs4 import BeautifulSoup
 from async_lru import alru_cache 
+from app.core.config import settings
+from app.services.threadpool import finance_pool
+from app.services.telemetry import track_cache
+from app.services.symbol_master import symbol_master
 
 import logging
 logger = logging.getLogger("StockWatcher")
 
+# ⚠️ yfinance aur requests dono blocking hain. Saare calls `finance_pool` mein
+# chalte hain taaki FastAPI ka event loop (aur baaki HTTP requests) free rahe.
+
+# Google Finance scraping ke liye pooled HTTP connections
+_google_session = requests.Session()
+_google_session.headers.update({"User-Agent": "Mozilla/5.0"})
+
 # --- 1. USD to INR Rate Fetcher (New) ---
+def _fetch_usd_to_inr_sync():
+    # Yahoo Finance symbol for USD/INR is 'USDINR=X'
+    return float(yf.Ticker("USDINR=X").fast_info.last_price)
+
+@track_cache("usd_inr")
 @alru_cache(maxsize=1, ttl=3600) # 1 Hour Cache
 async def get_usd_to_inr_rate():
     try:
-        # Yahoo Finance symbol for USD/INR is 'USDINR=X'
-        ticker = yf.Ticker("USDINR=X")
-        rate = ticker.fast_info.last_price
-        return float(rate)
+        return await finance_pool.run(_fetch_usd_to_inr_sync, label="usd_inr")
     except Exception as e:
         logger.error(f"Failed to fetch USD rate: {e}")
         return 84.0 # Fallback rate if API fails
 
-# --- 2. Get Stock Details (Price + Currency) ---
-# Ye function Portfolio page ke liye zaroori hai
-async def get_stock_details(symbol: str):
+# --- 2. Stock Details (Price + Currency) - blocking fetch ---
+def _fetch_stock_details_sync(symbol: str):
+    # Symbol pehle se canonical hai (symbol_resolver ne .NS / .BO decide kar diya),
+    # isliye yahan try/except probing nahi hoti
+    info = yf.Ticker(symbol).fast_info
+    price = info.last_price
+    currency = info.currency # USD or INR
+
+    return {
+        "symbol": symbol,
+        "price": price,
+        "currency": currency,
+        "is_us": currency == 'USD'
+    }
+
+# --- 3. GOOGLE FINANCE (Backup - Indian Only) ---
+# Google Finance URL structure differs for US/India, so we keep this mostly for INR fallback
+def _scrape_google_finance_sync(symbol: str):
+    # US stocks usually don't need this backup, assume Indian context if fallback needed
+    clean_sym = symbol.replace(".NS", "").replace(".BO", "")
+    url = f"https://www.google.com/finance/quote/{clean_sym}:NSE"
+    response = _google_session.get(url, timeout=3)
+    if response.status_code == 200:
+        soup = BeautifulSoup(response.text, "html.parser")
+        price_div = soup.find("div", {"class": "YMlKec fxKbKc"})
+        if price_div:
+            return float(price_div.text.replace("₹", "").replace("$", "").replace(",", "").strip())
+    return None
+
+async def scrape_google_finance(symbol: str):
     try:
-        # Logic: Agar suffix (.NS) nahi hai, toh pehle direct try karein (US Stocks ke liye)
-        # Agar fail ho, aur suffix bhi nahi hai, tab .NS lagayein
-        
-        ticker = yf.Ticker(symbol)
-        info = ticker.fast_info
-        
+        return await finance_pool.run(_scrape_google_finance_sync, symbol, label="google_finance")
+    except: pass
+    return None
+
+# --- 4. SHARED QUOTE CACHE ---
+# Tracker, add_alert, portfolio aur analyze sab isi ek cache se price lete hain.
+class QuoteCache:
+    """
+    LRU + TTL quote cache with singleflight and stale-while-revalidate.
+
+    - Fresh (age < ttl): seedha cache se.
+    - Stale (ttl <= age < ttl + stale_ttl): purana value turant milta hai,
+      refresh background mein hota hai.
+    - Miss: fetch hota hai; ek symbol ke concurrent requests ek hi fetch share karte hain.
+    """
+
+    def __init__(self, fetcher, maxsize: int, ttl: float, stale_ttl: float):
+        self._fetcher = fetcher
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()  # symbol -> (value, fetched_at)
+        self._inflight = {}            # symbol -> asyncio.Task
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, symbol: str, value: dict):
+        self._entries[symbol] = (value, time.monotonic())
+        self._entries.move_to_end(symbol)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def peek(self, symbol: str, max_age: float = None):
+        """Cached value (ya None) bina fetch kiye. `max_age` default = stale window tak."""
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        limit = self.ttl + self.stale_ttl if max_age is None else max_age
+        return value if (time.monotonic() - fetched_at) < limit else None
+
+    def _fetch(self, symbol: str) -> asyncio.Task:
+        task = self._inflight.get(symbol)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(symbol))
+            self._inflight[symbol] = task
+        return task
+
+    async def _fetch_and_store(self, symbol: str):
         try:
-            price = info.last_price
-            currency = info.currency # USD or INR
-        except:
-            # Agar direct symbol fail hua (e.g. RELIANCE without .NS)
-            if not symbol.endswith((".NS", ".BO")):
-                symbol = f"{symbol}.NS"
-                ticker = yf.Ticker(symbol)
-                info = ticker.fast_info
-                price = info.last_price
-                currency = info.currency
-            else:
-                return None
+            value = await self._fetcher(symbol)
+            if value is not None:
+                self.put(symbol, value)
+            return value
+        finally:
+            self._inflight.pop(symbol, None)
+
+    async def get(self, symbol: str):
+        entry = self._entries.get(symbol)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(symbol)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(symbol)
+                self._fetch(symbol)  # Background revalidate
+                return value
+
+        self.misses += 1
+        # shield: ek caller cancel ho toh baaki waiters ka fetch na ruke
+        return await asyncio.shield(self._fetch(symbol))
 
+    async def get_many(self, symbols) -> dict:
+        unique_symbols = list(dict.fromkeys(symbols))
+        values = await asyncio.gather(*(self.get(sym) for sym in unique_symbols))
+        return dict(zip(unique_symbols, values))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
         return {
-            "symbol": symbol,
-            "price": price,
-            "currency": currency,
-            "is_us": currency == 'USD'
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
         }
-    except Exception as e:
-        logger.warning(f"Detail fetch failed for {symbol}: {e}")
-        return None
 
-# --- 3. YAHOO FINANCE PRICE (Optimized) ---
-@alru_cache(maxsize=100, ttl=60) 
-async def get_yahoo_price(symbol: str):
+def _quote_from_price(symbol: str, price: float) -> dict:
+    # Batch download / Google se currency nahi milti, suffix se detect karte hain
+    currency = "INR" if symbol.endswith((".NS", ".BO")) else "USD"
+    return {"symbol": symbol, "price": price, "currency": currency, "is_us": currency == "USD"}
+
+async def _fetch_quote(symbol: str):
+    """Uncached fetch: symbol resolve, phir Yahoo (details), phir Google Finance backup."""
+    symbol = await symbol_resolver.resolve(symbol)
+    if symbol is None:
+        return None  # Symbol exist nahi karta (negative cache), upstream call nahi
+
     try:
-        ticker = yf.Ticker(symbol)
-        
-        # 1. Try Direct Symbol (For US Stocks like AAPL)
-        try:
-            price = ticker.fast_info.last_price
-            return round(float(price), 2)
-        except:
-            pass
-            
-        # 2. If Failed & No Suffix, Try appending .NS (For Indian Stocks)
-        if not symbol.endswith((".NS", ".BO")):
-            ticker = yf.Ticker(f"{symbol}.NS")
-            price = ticker.fast_info.last_price
-            return round(float(price), 2)
-            
+        details = await finance_pool.run(_fetch_stock_details_sync, symbol, label="stock_details")
+        if details and details["price"]:
+            details["price"] = round(float(details["price"]), 2)
+            return details
     except Exception as e:
-        # logger.warning(f"Yahoo failed for {symbol}: {e}")
-        pass
-    return None
+        logger.warning(f"Detail fetch failed for {symbol}: {e}")
 
-# --- 4. GOOGLE FINANCE (Backup - Indian Only) ---
-# Google Finance URL structure differs for US/India, so we keep this mostly for INR fallback
-async def scrape_google_finance(symbol: str):
-    try:
-        # US stocks usually don't need this backup, assume Indian context if fallback needed
-        clean_sym = symbol.replace(".NS", "").replace(".BO", "")
-        url = f"https://www.google.com/finance/quote/{clean_sym}:NSE"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=3)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            price_div = soup.find("div", {"class": "YMlKec fxKbKc"})
-            if price_div:
-                return float(price_div.text.replace("₹", "").replace("$", "").replace(",", "").strip())
-    except: pass
+    price = await scrape_google_finance(symbol)
+    if price:
+        return _quote_from_price(symbol, price)
     return None
 
+quote_cache = QuoteCache(
+    _fetch_quote,
+    maxsize=settings.QUOTE_CACHE_SIZE,
+    ttl=settings.QUOTE_CACHE_TTL,
+    stale_ttl=settings.QUOTE_CACHE_STALE_TTL,
+)
+
+# Ye function Portfolio page ke liye zaroori hai (Price + Currency)
+async def get_stock_details(symbol: str):
+    return await quote_cache.get(symbol)
+
+async def get_yahoo_price(symbol: str):
+    details = await quote_cache.get(symbol)
+    return details["price"] if details else None
+
 # --- MAIN FUNCTION ---
 async def get_live_price(symbol: str):
-    # Step 1: Try Yahoo (Handles both US & India)
-    price = await get_yahoo_price(symbol)
-    if price: return price
+    # Yahoo (US & India) + Google backup, dono shared cache ke peeche
+    return await get_yahoo_price(symbol)
 
-    # Step 2: Try Google (Backup for Indian stocks)
-    return await scrape_google_finance(symbol)
+# --- 5. SYMBOL RESOLUTION ---
+_HAS_EXCHANGE = (".", "^", "=")  # TCS.NS, ^NSEI, USDINR=X: pehle se poore Yahoo tickers
 
-# --- NEWS ---
-@alru_cache(maxsize=10, ttl=600) 
-async def get_google_news(query: str):
-    try:
-        # Search query ko generic banaya taaki US news bhi aaye
-        encoded_query = urllib.parse.quote(f"{query} stock news")
-        rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-IN&gl=IN&ceid=IN:en"
-        feed = feedparser.parse(rss_url)
-        news_items = []
-        for entry in feed.entries[:8]:
-            news_items.append({
-                "title": entry.title,
-                "link": entry.link,
-                "publisher": entry.source.title if 'source' in entry else "Google News",
-                "time": datetime.fromtimestamp(time.mktime(entry.published_parsed)).strftime('%d %b, %H:%M') if entry.get('published_parsed') else "Recent",
-                "img": None 
-            })
-        return news_items
-    except: return []
+_NOT_FOUND_REASONS = ("no data found", "delisted", "not found")
+
+def _is_not_found(error: YFTickerMissingError) -> bool:
+    """
+    Sirf Yahoo ka explicit "not found": timezone hi nahi mila, ya chart error ka
+    description (e.g. "No data found, symbol may be delisted"). YFPricesMissingError
+    Yahoo ke 5xx (status_code) aur khaali chart par bhi aata hai: woh inconclusive hai.
+    """
+    if isinstance(error, YFTzMissingError):
+        return True
+    if isinstance(error, YFPricesMissingError):
+        reason = (getattr(error, "yahoo_reason", None) or "").lower()
+        return any(text in reason for text in _NOT_FOUND_REASONS)
+    return False
+
+def _confirm_symbols_sync(candidates: list):
+    """
+    Batched download khaali aaya: har candidate ko ek-ek history call se confirm karo.
+    yf.download network / rate-limit errors bhi chup-chaap khaali frame bana deta hai,
+    isliye "exist nahi karta" sirf tab jab Yahoo har candidate ke liye explicitly
+    not-found bole (`_is_not_found`).
+
+    Returns (canonical, price) agar koi mila, (None, None) agar sab missing confirm hue.
+    Network / rate-limit error upar raise hota hai (caller cache nahi karta).
+    """
+    for candidate in candidates:
+        try:
+            hist = yf.Ticker(candidate).history(period="5d", auto_adjust=True, raise_errors=True)
+        except YFTickerMissingError as e:
+            if not _is_not_found(e):
+                raise
+            continue
+        closes = hist["Close"].dropna() if hist is not None and "Close" in hist else None
+        if closes is None or closes.empty:
+            raise RuntimeError(f"no data for {candidate} without a not-found error")
+        return candidate, round(float(closes.iloc[-1]), 2)
+    return None, None
+
+class SymbolResolver:
+    """
+    User input ('reliance', 'TCS.NS', 'aapl') -> canonical Yahoo ticker.
+
+    - Pehle local symbol master (koi upstream call nahi), phir saare candidates
+      (RELIANCE, RELIANCE.NS, RELIANCE.BO) ek batched download mein.
+    - Positive entries `ttl` tak, negative (symbol exist nahi karta) `negative_ttl`
+      tak yaad rehte hain, toh unknown symbols baar-baar upstream nahi jaate.
+      Negative sirf jab Yahoo positively "not found" bole; khaali / failed download
+      (network, rate limit) kabhi cache nahi hota.
+    - Ek input ke concurrent resolves ek hi probe share karte hain (singleflight).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # input -> (canonical ya None, expires_at)
+        self._inflight = {}            # input -> asyncio.Task
+        self.hits = 0
+        self.negative_hits = 0
+        self.probes = 0
+
+    @staticmethod
+    def normalize(symbol: str) -> str:
+        return symbol.upper().strip()
+
+    def _store(self, key: str, canonical):
+        ttl = self.ttl if canonical else self.negative_ttl
+        self._entries[key] = (canonical, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def cached(self, symbol: str):
+        """Resolved canonical (bina probe ke), warna None."""
+        entry = self._entries.get(self.normalize(symbol))
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    async def _probe(self, key: str):
+        candidates = [key] if any(c in key for c in _HAS_EXCHANGE) else [key, f"{key}.NS", f"{key}.BO"]
+
+        # 1. Local listings (US ticker pehle, jaisa purana direct-then-.NS logic tha)
+        for candidate in candidates:
+            if symbol_master.is_listed(candidate):
+                self._store(key, candidate)
+                return candidate
+
+        # 2. Upstream: saare candidates ek hi call mein
+        self.probes += 1
+        try:
+            prices = await finance_pool.run(_download_closes, candidates, label="symbol_resolve")
+        except Exception as e:
+            # Network error "symbol nahi hai" nahi hota: cache mat karo, input as-is chalne do
+            logger.warning(f"Symbol resolve failed for {key}: {e}")
+            return key
+
+        canonical = next((c for c in candidates if c in prices), None)
+        price = prices.get(canonical)
+        if canonical is None:
+            # Khaali download = transient failure bhi ho sakta hai: confirm karo
+            try:
+                canonical, price = await finance_pool.run(_confirm_symbols_sync, candidates, label="symbol_confirm")
+            except Exception as e:
+                logger.warning(f"Symbol resolve inconclusive for {key}: {e}")
+                return key
+
+        if canonical:
+            quote_cache.put(canonical, _quote_from_price(canonical, price))
+        self._store(key, canonical)
+        return canonical
+
+    async def _probe_once(self, key: str):
+        try:
+            return await self._probe(key)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def resolve(self, symbol: str):
+        key = self.normalize(symbol)
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            if entry[0] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[0]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe_once(key))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        negative = sum(1 for canonical, expires in self._entries.values() if canonical is None and expires > now)
+        return {
+            "size": len(self._entries),
+            "negative_entries": negative,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "upstream_probes": self.probes,
+            "inflight": len(self._inflight),
+        }
+
+symbol_resolver = SymbolResolver(
+    maxsize=settings.SYMBOL_RESOLVER_SIZE,
+    ttl=settings.SYMBOL_RESOLVE_TTL,
+    negative_ttl=settings.SYMBOL_NEGATIVE_TTL,
+)
+
+async def resolve_symbol(symbol: str):
+    """Canonical Yahoo ticker (e.g. 'reliance' -> 'RELIANCE.NS'), ya None agar exist nahi karta."""
+    return await symbol_resolver.resolve(symbol)
+
+# --- BATCH QUOTES (Tracker ke liye) ---
+# Ek hi yf.download call mein saikdon tickers ka price aata hai,
+# isliye tick time symbols ke count se nahi, batches ke count se badhta hai.
+QUOTE_BATCH_SIZE = 200
+
+def _download_closes(symbols: list):
+    """
+    Blocking helper: ek batch ke liye last close price nikalta hai.
+    Returns {symbol: price} sirf un symbols ke liye jinka data mila.
+    """
+    data = yf.download(symbols, period="1d", progress=False, auto_adjust=True, threads=True)
+    if data is None or data.empty:
+        return {}
+
+    closes = data["Close"]
+    prices = {}
+
+    # Single ticker par yfinance Series/1-column frame return karta hai
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(name=symbols[0])
+
+    for sym in symbols:
+        if sym not in closes.columns:
+            continue
+        series = closes[sym].dropna()
+        if series.empty:
+            continue
+        prices[sym] = round(float(series.iloc[-1]), 2)
+    return prices
+
+async def get_bulk_prices(symbols, batch_size: int = QUOTE_BATCH_SIZE, concurrency: int = None):
+    """
+    Batched quote API: symbols ki list lo, {symbol: price} map return karo.
+    Results shared quote cache ko bhi prime karte hain.
+    Batches `concurrency` (default PRICE_FETCH_CONCURRENCY) tak parallel chalte hain.
+    Jo symbols batch download mein nahi mile (e.g. bare 'RELIANCE' bina .NS ke),
+    unke liye purana single-symbol path (Yahoo -> Google) fallback hai.
+    """
+    limiter = asyncio.Semaphore(concurrency or settings.PRICE_FETCH_CONCURRENCY)
+    prices = {}
+
+    # Shared cache mein jo abhi fresh hai, uske liye upstream call nahi
+    unique_symbols = []
+    for sym in dict.fromkeys(symbols):
+        cached = quote_cache.peek(sym, max_age=quote_cache.ttl)
+        if cached:
+            prices[sym] = cached["price"]
+        else:
+            unique_symbols.append(sym)
+
+    # Purane bare symbols (e.g. 'RELIANCE') resolved ticker se download hote hain
+    requested = {}  # canonical -> [input symbols]
+    for sym in unique_symbols:
+        requested.setdefault(symbol_resolver.cached(sym) or sym, []).append(sym)
+    to_download = list(requested)
+
+    async def fetch_batch(batch):
+        async with limiter:
+            try:
+                fetched = await finance_pool.run(_download_closes, batch, label="bulk_download")
+            except Exception as e:
+                logger.warning(f"Batch quote fetch failed ({len(batch)} symbols): {e}")
+                return
+            for canonical, price in fetched.items():
+                quote_cache.put(canonical, _quote_from_price(canonical, price))
+                for sym in requested.get(canonical, ()):
+                    prices[sym] = price
+
+    async def fetch_single(sym):
+        async with limiter:
+            price = await get_live_price(sym)
+            if price is not None:
+                prices[sym] = price
+
+    await asyncio.gather(*(
+        fetch_batch(to_download[start:start + batch_size])
+        for start in range(0, len(to_download), batch_size)
+    ))
+
+    missing = [sym for sym in unique_symbols if sym not in prices]
+    # Fallback singles bhi cache se jaate hain (singleflight + Google backup)
+    await asyncio.gather(*(fetch_single(sym) for sym in missing))
+
+    return prices
+
+# --- BACKGROUND WARM-UP (search autocomplete ke liye) ---
+_warming = set()       # Symbols jinka warm-up fetch abhi chal raha hai
+_warm_tasks = set()    # Fire-and-forget tasks ke strong refs (GC se bachane ke liye)
+
+def warm_quotes(symbols):
+    """
+    Cache mein na hon toh symbols ke prices background mein ek batch se le aata hai.
+    Caller wait nahi karta; har keystroke par same symbols dobara fetch nahi hote.
+    """
+    pending = [sym for sym in symbols if sym not in _warming and quote_cache.peek(sym) is None]
+    if not pending:
+        return
+    _warming.update(pending)
+
+    async def run():
+        try:
+            await get_bulk_prices(pending)
+        except Exception as e:
+            logger.warning(f"Quote warm-up failed: {e}")
+        finally:
+            _warming.difference_update(pending)
+
+    task = asyncio.create_task(run())
+    _warm_tasks.add(task)
+    task.add_done_callback(_warm_tasks.discard)
@@ -0,0 +1,76 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from app.core.config import settings
+from app.services.finance import _download_closes
+from app.services.threadpool import finance_pool
+
+logger = logging.getLogger("StockWatcher")
+
+
+def _parse_registry(raw: str) -> dict:
+    """"nifty=^NSEI,sensex=^BSESN" -> {"nifty": "^NSEI", "sensex": "^BSESN"}"""
+    registry = {}
+    for item in raw.split(","):
+        key, _, symbol = item.partition("=")
+        if key.strip() and symbol.strip():
+            registry[key.strip().lower()] = symbol.strip()
+    return registry
+
+
+class IndicesRegistry:
+    """
+    Market indices ka in-memory snapshot.
+
+    Background job saare indices ek hi batched `yf.download` se refresh karta hai
+    aur response JSON + ETag usi waqt bana deta hai. Endpoint ka kaam sirf
+    pre-built bytes return karna hai, visitors kitne bhi hon upstream call nahi.
+    """
+
+    def __init__(self, registry: dict):
+        self.registry = registry
+        self.values = {key: 0.0 for key in registry}
+        self.payload = b""
+        self.etag = ""
+        self.refreshed_at = None
+        self.attempted_at = None  # Last refresh try (fail hua ho tab bhi)
+        self._lock = None
+        self._build()
+
+    def _build(self):
+        self.payload = json.dumps(self.values).encode()
+        self.etag = '"' + hashlib.blake2b(self.payload, digest_size=8).hexdigest() + '"'
+
+    async def refresh(self):
+        self.attempted_at = time.monotonic()
+        try:
+            closes = await finance_pool.run(_download_closes, list(self.registry.values()), label="indices")
+        except Exception as e:
+            logger.warning(f"Indices refresh failed: {e}")
+            return
+        # Jo index is baar nahi mila (e.g. market holiday), uski last value bani rehti hai
+        for key, symbol in self.registry.items():
+            if symbol in closes:
+                self.values[key] = closes[symbol]
+        self._build()
+        self.refreshed_at = time.monotonic()
+
+    async def ensure_loaded(self):
+        """
+        Scheduler ke pehle refresh se pehle request aaye toh ek hi fetch (lock ke saath).
+        Woh fetch fail ho toh bhi dobara request path par nahi: zero snapshot (apne ETag
+        ke saath) serve hota hai aur retry sirf scheduler karta hai.
+        """
+        if self.attempted_at is not None:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.attempted_at is None:
+                await self.refresh()
+
+
+# Singleton Instance
+market_indices = IndicesRegistry(_parse_registry(settings.MARKET_INDICES))
@@ -0,0 +1,61 @@
+from datetime import datetime
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES
+from app.core.config import settings
+from app.services.background import track_stock_prices
+from app.services.outbox import dispatch_outbox
+from app.services.broadcast import process_broadcast_jobs
+from app.services.sharding import shard
+from app.services.live_quotes import relay_live_quotes
+from app.services.tick_metrics import tick_metrics
+from app.services.indices import market_indices
+from app.services.symbol_master import symbol_master
+from app.services.news import news_store
+
+TRACKER_JOB_ID = "track_stock_prices"
+
+
+def _on_tracker_event(event):
+    if event.job_id != TRACKER_JOB_ID:
+        return
+    if event.code == EVENT_JOB_SUBMITTED:
+        tick_metrics.note_submitted(event.scheduled_run_times[-1])
+    else:
+        tick_metrics.note_skipped()
+
+
+def register_worker_jobs(scheduler):
+    """
+    Tracker / dispatcher / broadcast jobs. Ye API process mein (RUN_WORKER_IN_API)
+    ya `python -m app.worker` processes mein chalte hain. Multiple workers safe hain:
+    tracker symbols shard karta hai, outbox aur broadcasts lease se claim hote hain.
+    """
+    # Shard membership heartbeat (tracker se pehle turant ek baar)
+    scheduler.add_job(shard.heartbeat, 'interval', seconds=settings.TRACKER_HEARTBEAT_SECONDS,
+                      max_instances=1, next_run_time=datetime.now())
+    # Fast tick; har symbol ka actual poll rate market hours + target proximity se (market_hours.py).
+    # Overlap nahi: ek time par ek hi tick, chhoote runs coalesce hokar ek run banate hain.
+    scheduler.add_job(track_stock_prices, 'interval', seconds=settings.TRACKER_TICK_SECONDS,
+                      id=TRACKER_JOB_ID, max_instances=1, coalesce=True,
+                      misfire_grace_time=settings.TRACKER_TICK_SECONDS)
+    scheduler.add_listener(_on_tracker_event, EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+    # Notification outbox drain (delivery tracker se alag chalta hai)
+    scheduler.add_job(dispatch_outbox, 'interval', seconds=settings.OUTBOX_POLL_SECONDS, max_instances=1)
+    # Admin broadcast jobs
+    scheduler.add_job(process_broadcast_jobs, 'interval', seconds=settings.BROADCAST_POLL_SECONDS, max_instances=1)
+
+
+def register_api_jobs(scheduler):
+    """
+    API process ke apne jobs: market indices, symbol master, news refresh, aur tracker alag process
+    mein ho tab live prices ka relay (SSE ke liye).
+    """
+    scheduler.add_job(market_indices.refresh, 'interval', seconds=settings.INDICES_REFRESH_SECONDS,
+                      max_instances=1, next_run_time=datetime.now())
+    # Search listings: ghante mein ek check, download sirf jab saved file purani ho
+    scheduler.add_job(symbol_master.refresh_if_stale, 'interval', hours=1,
+                      max_instances=1, next_run_time=datetime.now())
+    # News: market feed + most-watched symbols
+    scheduler.add_job(news_store.refresh_watched, 'interval', seconds=settings.NEWS_REFRESH_SECONDS,
+                      max_instances=1, next_run_time=datetime.now())
+    if not settings.RUN_WORKER_IN_API:
+        scheduler.add_job(relay_live_quotes, 'interval', seconds=settings.LIVE_QUOTE_RELAY_SECONDS, max_instances=1)
@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.db import database
+from app.services.finance import quote_cache, get_bulk_prices, _quote_from_price
+from app.services.price_stream import price_stream
+from app.services.market_hours import poll_planner
+
+logger = logging.getLogger("StockWatcher")
+
+# ============================================================
+# 🔁 Cross-process price relay
+# ============================================================
+# Jab tracker alag worker process(es) mein chalta hai, API process ke SSE clients
+# tak prices `live_quotes` collection ke through pahunchte hain:
+#   worker -> save_live_quotes() -> Mongo -> relay_live_quotes() -> price_stream
+
+async def save_live_quotes(prices: dict):
+    """
+    Tracker tick ke prices ek bulk upsert mein save karta hai (_id = symbol).
+    `due_at` = worker ka agla scheduled poll (planner interval), toh API relay
+    jaanta hai ki quote kab tak fresh hai (band market mein 30 min, paas target par 15s).
+    """
+    if not prices or database.db is None:
+        return
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne(
+            {"_id": sym},
+            {"$set": {
+                "price": price,
+                "updated_at": now,
+                "due_at": now + timedelta(seconds=poll_planner.seconds_until_due(sym)),
+            }},
+            upsert=True,
+        )
+        for sym, price in prices.items()
+    ]
+    try:
+        await database.db.live_quotes.bulk_write(ops, ordered=False)
+    except Exception as e:
+        logger.error(f"Live quotes save failed: {e}")
+
+
+_last_relayed = {}  # symbol -> last published price (sirf badle hue prices publish hote hain)
+
+
+async def relay_live_quotes():
+    """
+    API-side scheduled job: subscribed symbols ke latest prices `live_quotes` se
+    padh kar stream par publish karta hai (sirf jo price pichli baar se badla).
+    Quote tab tak fresh hai jab tak worker ka agla scheduled poll (+ grace) nahi
+    nikla. Jo symbols koi worker track nahi karta (ya jinka worker poll overdue
+    hai), woh yahin se ek bulk fetch mein aate hain.
+    """
+    symbols = price_stream.subscribed_symbols()
+    if not symbols or database.db is None:
+        _last_relayed.clear()
+        return
+
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.LIVE_QUOTE_GRACE_SECONDS)
+        docs = await database.db.live_quotes.find(
+            {"_id": {"$in": symbols}, "due_at": {"$gte": cutoff}}
+        ).to_list(length=None)
+
+        prices = {doc["_id"]: doc["price"] for doc in docs}
+        for sym, price in prices.items():
+            quote_cache.put(sym, _quote_from_price(sym, price))
+
+        missing = [sym for sym in symbols if sym not in prices]
+        if missing:
+            prices.update(await get_bulk_prices(missing, concurrency=settings.PRICE_FETCH_CONCURRENCY))
+
+        changed = {sym: price for sym, price in prices.items() if _last_relayed.get(sym) != price}
+        wanted = set(symbols)
+        for sym in [s for s in _last_relayed if s not in wanted]:
+            del _last_relayed[sym]
+        _last_relayed.update(changed)
+        price_stream.publish(changed)
+    except Exception as e:
+        logger.error(f"Live quote relay failed: {e}")
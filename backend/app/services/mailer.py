@@ -0,0 +1,157 @@
+import time
+import asyncio
+import logging
+from email.header import Header
+from email.message import Message
+from email.mime.text import MIMEText
+import aiosmtplib
+from app.core.config import settings
+from app.services.telemetry import observe_notification
+
+logger = logging.getLogger("Notifier")
+
+
+_FROM_HEADER = f"Stock Watcher <{settings.EMAIL_SENDER}>"
+
+def build_message(to_email: str, subject: str, html_content: str) -> Message:
+    # MIMEText (compat32) EmailMessage.set_content se ~10x sasta hai build karne mein,
+    # jo alert batches mein per-message cost ka bada hissa tha.
+    msg = MIMEText(html_content, "html", "utf-8")
+    msg["From"] = _FROM_HEADER
+    msg["To"] = to_email
+    msg["Subject"] = Header(subject, "utf-8")
+    return msg
+
+
+class SMTPPool:
+    """
+    Async SMTP connection pool (aiosmtplib).
+
+    Har connection ek baar connect + TLS + login hota hai aur phir
+    reuse hota hai. `size` connections tak parallel sends chalte hain.
+    Connect fail hone par exponential backoff ke saath retry hota hai, aur
+    send ke beech connection drop ho toh naya connection lekar ek retry.
+    """
+
+    def __init__(self, host: str, port: int, username: str, password: str, size: int,
+                 timeout: float = 30, max_retries: int = 3, backoff_base: float = 1.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._idle = asyncio.LifoQueue()  # Sabse recently used connection pehle (warm rehta hai)
+        self._slots = None
+        self._open = 0
+        self.sent = 0
+        self.failed = 0
+        self.reconnects = 0
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # Semaphore event loop ke andar banna chahiye (import time par loop nahi hota)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        return self._slots
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        use_tls = self.port == 465  # SSL (465) vs STARTTLS (587)
+        delay = self.backoff_base
+        for attempt in range(1, self.max_retries + 1):
+            client = aiosmtplib.SMTP(
+                hostname=self.host,
+                port=self.port,
+                use_tls=use_tls,
+                start_tls=not use_tls,
+                timeout=self.timeout,
+            )
+            try:
+                await client.connect()
+                if self.username and self.password:
+                    await client.login(self.username, self.password)
+                self._open += 1
+                return client
+            except Exception as e:
+                logger.warning(f"SMTP connect failed (attempt {attempt}/{self.max_retries}): {e}")
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _discard(self, client: aiosmtplib.SMTP):
+        self._open -= 1
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            if client.is_connected:
+                return client
+            await self._discard(client)
+        return await self._connect()
+
+    async def send(self, message: Message) -> bool:
+        started = time.perf_counter()
+        ok = await self._send(message)
+        observe_notification("email", time.perf_counter() - started, ok)
+        return ok
+
+    async def _send(self, message: Message) -> bool:
+        async with self._limiter():
+            client = None
+            for attempt in range(2):
+                try:
+                    client = await self._checkout()
+                    await client.send_message(message)
+                    self._idle.put_nowait(client)
+                    self.sent += 1
+                    return True
+                except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError) as e:
+                    # Server ne idle connection band kar diya: naya connection lekar ek retry
+                    if client is not None:
+                        await self._discard(client)
+                        client = None
+                    self.reconnects += 1
+                    if attempt == 1:
+                        logger.error(f"❌ Failed to send email to {message['To']}: {e}")
+                except Exception as e:
+                    if client is not None:
+                        await self._discard(client)
+                    logger.error(f"❌ Failed to send email to {message['To']}: {e}")
+                    break
+            self.failed += 1
+            return False
+
+    async def send_many(self, messages: list) -> list:
+        """Ek batch ke saare messages pool ke saare connections par saath-saath bhejta hai."""
+        return await asyncio.gather(*(self.send(m) for m in messages))
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "open": self._open,
+            "idle": self._idle.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "reconnects": self.reconnects,
+        }
+
+    async def close(self):
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+
+# Singleton Instance
+mailer = SMTPPool(
+    host=settings.SMTP_SERVER,
+    port=settings.SMTP_PORT,
+    username=settings.SMTP_LOGIN,
+    password=settings.EMAIL_PASSWORD,
+    size=settings.SMTP_POOL_SIZE,
+)
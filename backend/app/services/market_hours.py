@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime, date, timedelta, time as dtime
+from zoneinfo import ZoneInfo
+from app.core.config import settings
+
+logger = logging.getLogger("StockWatcher")
+
+# ============================================================
+# 🕘 EXCHANGE SESSIONS
+# ============================================================
+
+SESSIONS = {
+    # NSE / BSE (.NS / .BO)
+    "IN": {"tz": ZoneInfo("Asia/Kolkata"), "open": dtime(9, 15), "close": dtime(15, 30)},
+    # NYSE / NASDAQ (bina suffix wale symbols + US indices)
+    "US": {"tz": ZoneInfo("America/New_York"), "open": dtime(9, 30), "close": dtime(16, 0)},
+}
+
+DEFAULT_HOLIDAYS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "market_holidays.json")
+
+
+# Yahoo ke Indian index tickers (suffix nahi hota, toh explicitly map)
+INDIAN_INDICES = {"^NSEI", "^BSESN", "^NSEBANK", "^INDIAVIX", "^NSMIDCP", "^CRSLDX"}
+
+
+def market_for(symbol: str):
+    """
+    Suffix se exchange. Dusre exchange suffixes (.L, .T, ...) aur FX (=X) ke sessions
+    hamare paas nahi hain: None, yaani calendar gate nahi, hamesha proximity se poll.
+    """
+    if symbol.endswith((".NS", ".BO")) or symbol in INDIAN_INDICES or symbol.startswith("^CNX"):
+        return "IN"
+    if "." in symbol or "=" in symbol:
+        return None
+    return "US"
+
+
+def _load_holidays(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Market holidays not loaded from {path}: {e}")
+        return {market: set() for market in SESSIONS}
+    return {market: {date.fromisoformat(d) for d in raw.get(market, [])} for market in SESSIONS}
+
+
+class MarketCalendar:
+    """Weekends + bundled holiday list + regular session hours (exchange ke local time mein)."""
+
+    def __init__(self, holidays_file: str):
+        self.holidays = _load_holidays(holidays_file)
+
+    def is_open(self, market: str, now: datetime = None) -> bool:
+        session = SESSIONS[market]
+        local = (now or datetime.now(tz=session["tz"])).astimezone(session["tz"])
+        if local.weekday() >= 5 or local.date() in self.holidays[market]:
+            return False
+        return session["open"] <= local.time() < session["close"]
+
+    def open_markets(self, now: datetime = None) -> set:
+        return {market for market in SESSIONS if self.is_open(market, now)}
+
+    def seconds_until_open(self, market: str, now: datetime = None) -> float:
+        """Agle session open tak ke seconds (market khula hai toh 0)."""
+        session = SESSIONS[market]
+        local = (now or datetime.now(tz=session["tz"])).astimezone(session["tz"])
+        if self.is_open(market, local):
+            return 0.0
+        day = local.date()
+        for _ in range(15):  # Lambi chhuttiyon ke liye bhi kaafi
+            if day.weekday() < 5 and day not in self.holidays[market]:
+                opens = datetime.combine(day, session["open"], tzinfo=session["tz"])
+                if opens > local:
+                    return (opens - local).total_seconds()
+            day += timedelta(days=1)
+        return float("inf")
+
+
+# ============================================================
+# 🎯 ADAPTIVE POLLING
+# ============================================================
+
+# (nearest target se max fractional doori, poll interval seconds)
+PROXIMITY_TIERS = (
+    (0.005, 15),
+    (0.02, 30),
+    (0.05, 60),
+)
+FAR_INTERVAL = 180
+
+
+class PollPlanner:
+    """
+    Har symbol ka agla due time rakhta hai.
+
+    - Market band: `closed_interval` (default 30 min) par ek check, lekin agle
+      session open se aage kabhi nahi (open ke baad pehla poll late na ho).
+    - Market khula: price jitna target ke paas, utna jaldi agla poll
+      (PROXIMITY_TIERS). Jin symbols ka price abhi pata nahi, woh turant due hain.
+    """
+
+    def __init__(self, calendar: MarketCalendar, closed_interval: float, default_interval: float = 60):
+        self.calendar = calendar
+        self.closed_interval = closed_interval
+        self.default_interval = default_interval
+        self._due = {}  # symbol -> monotonic deadline
+
+    def due(self, symbols, now: float = None) -> list:
+        now = time.monotonic() if now is None else now
+        return [sym for sym in symbols if self._due.get(sym, 0.0) <= now]
+
+    def interval_for(self, symbol: str, gap, open_markets: set) -> float:
+        market = market_for(symbol)
+        if market is not None and market not in open_markets:
+            return min(self.closed_interval, self.calendar.seconds_until_open(market))
+        if gap is None:
+            return self.default_interval
+        for max_gap, interval in PROXIMITY_TIERS:
+            if gap <= max_gap:
+                return interval
+        return FAR_INTERVAL
+
+    def schedule(self, symbol: str, gap, open_markets: set, now: float = None):
+        """`gap` = nearest active target se fractional doori (None = koi target nahi)."""
+        now = time.monotonic() if now is None else now
+        self._due[symbol] = now + self.interval_for(symbol, gap, open_markets)
+
+    def seconds_until_due(self, symbol: str, now: float = None) -> float:
+        """Symbol ka agla scheduled poll kitne seconds mein (unknown = 0, abhi due)."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._due.get(symbol, now) - now)
+
+    def retain(self, symbols):
+        """Jin symbols ke alerts khatam ho gaye unki entries hata deta hai."""
+        keep = set(symbols)
+        for sym in [s for s in self._due if s not in keep]:
+            del self._due[sym]
+
+    def __len__(self):
+        return len(self._due)
+
+
+# Singleton Instances
+market_calendar = MarketCalendar(settings.MARKET_HOLIDAYS_FILE or DEFAULT_HOLIDAYS_FILE)
+poll_planner = PollPlanner(market_calendar, closed_interval=settings.TRACKER_CLOSED_INTERVAL)
@@ -0,0 +1,211 @@
+import re
+import time
+import asyncio
+import logging
+import urllib.parse
+from collections import OrderedDict, Counter
+from datetime import datetime
+import httpx
+import feedparser
+from app.core.config import settings
+from app.db import database
+from app.services.threadpool import finance_pool
+
+logger = logging.getLogger("StockWatcher")
+
+MARKET_QUERY = "Stock Market"
+_SUFFIX = re.compile(r"\.(NS|BO)$")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _feed_key(query: str) -> str:
+    # 'reliance', 'RELIANCE.NS', 'RELIANCE.BO' sab ek hi feed share karte hain
+    return _SUFFIX.sub("", query.upper().strip())
+
+
+def _headline_key(title: str) -> str:
+    # Google News titles ke end mein " - Publisher" hota hai; dedup sirf headline par
+    headline = title.rsplit(" - ", 1)[0]
+    return _NON_WORD.sub(" ", headline.lower()).strip()
+
+
+def _parse_feed_sync(content: bytes, limit: int) -> list:
+    feed = feedparser.parse(content)
+    items = []
+    for entry in feed.entries:
+        if len(items) >= limit:
+            break
+        if not entry.get("title"):
+            continue
+        items.append({
+            "title": entry.title,
+            "link": entry.get("link"),
+            "publisher": entry.source.title if 'source' in entry else "Google News",
+            "time": datetime.fromtimestamp(time.mktime(entry.published_parsed)).strftime('%d %b, %H:%M') if entry.get('published_parsed') else "Recent",
+            "img": None
+        })
+    return items
+
+
+class NewsStore:
+    """
+    Bounded LRU + TTL store of RSS news per query (market feed + symbols).
+
+    - Endpoints hamesha store se padhte hain, kabhi fetch ka wait nahi karte.
+      Stale entry turant milti hai, bilkul naya symbol [] paata hai; dono ka
+      refresh background mein schedule hota hai aur agla request store se.
+    - Background job market feed aur sabse zyada watched symbols (active alerts +
+      portfolios) ko pehle se fresh rakhta hai.
+    - Ek feed ke andar aur feeds ke beech same headline ek hi item object hai
+      (headline registry), toh duplicate stories nahi dikhti aur memory bhi nahi lagti.
+      `duplicates` sirf drop hue items gine; doosri feed se reuse hua item `shared` mein.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, items_per_feed: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.items_per_feed = items_per_feed
+        self._feeds = OrderedDict()     # feed key -> (items, fetched_at)
+        self._headlines = OrderedDict() # headline key -> item (cross-feed dedup)
+        self._inflight = {}             # feed key -> asyncio.Task
+        self._client = None
+        self.fetches = 0
+        self.failures = 0
+        self.duplicates = 0
+        self.shared = 0
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(10.0), follow_redirects=True,
+                                             headers={"User-Agent": "Mozilla/5.0"})
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------------- Fetch ----------------
+
+    def _dedup(self, items: list) -> list:
+        unique, seen = [], set()
+        for item in items:
+            key = _headline_key(item["title"])
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            shared = self._headlines.get(key)
+            if shared is None:
+                self._headlines[key] = shared = item
+            else:
+                self.shared += 1  # Doosri feed wala object reuse, item drop nahi hua
+            self._headlines.move_to_end(key)
+            unique.append(shared)
+        # Registry bhi bounded: har feed ke items jitni jagah
+        while len(self._headlines) > self.maxsize * self.items_per_feed:
+            self._headlines.popitem(last=False)
+        return unique
+
+    async def _fetch(self, key: str):
+        # Search query ko generic banaya taaki US news bhi aaye
+        text = MARKET_QUERY if key == MARKET_QUERY.upper() else key
+        encoded_query = urllib.parse.quote(f"{text} stock news")
+        rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-IN&gl=IN&ceid=IN:en"
+        try:
+            self.fetches += 1
+            response = await self._http().get(rss_url)
+            response.raise_for_status()
+            # Parse thoda CPU leta hai; event loop par nahi
+            items = await finance_pool.run(_parse_feed_sync, response.content, self.items_per_feed * 2, label="news_parse")
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"News fetch failed for '{key}': {e}")
+            return self._feeds.get(key, ([], 0))[0]
+
+        items = self._dedup(items)[:self.items_per_feed]
+        self._feeds[key] = (items, time.monotonic())
+        self._feeds.move_to_end(key)
+        while len(self._feeds) > self.maxsize:
+            self._feeds.popitem(last=False)
+        return items
+
+    def _refresh(self, key: str) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    # ---------------- Public API ----------------
+
+    async def get(self, query: str) -> list:
+        key = _feed_key(query)
+        entry = self._feeds.get(key)
+        if entry is not None:
+            items, fetched_at = entry
+            self._feeds.move_to_end(key)
+            if time.monotonic() - fetched_at >= self.ttl:
+                self._refresh(key)  # Stale-while-revalidate
+            return items
+
+        self._refresh(key)  # Cold miss: fetch background mein, agla request store se
+        return []
+
+    async def refresh_watched(self):
+        """Scheduled job: market feed + top watched symbols pehle se fresh."""
+        keys = [MARKET_QUERY.upper()] + [_feed_key(sym) for sym in await _watched_symbols(settings.NEWS_WATCHED_TOP)]
+        keys = [key for key in dict.fromkeys(keys)
+                if time.monotonic() - self._feeds.get(key, ([], 0.0))[1] >= settings.NEWS_REFRESH_SECONDS]
+        if not keys:
+            return
+
+        limiter = asyncio.Semaphore(settings.NEWS_FETCH_CONCURRENCY)
+
+        async def refresh(key):
+            async with limiter:
+                await self._refresh(key)
+
+        await asyncio.gather(*(refresh(key) for key in keys))
+        logger.info(f"📰 News refreshed for {len(keys)} feeds")
+
+    def stats(self) -> dict:
+        return {
+            "feeds": len(self._feeds),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "headlines": len(self._headlines),
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "duplicates_dropped": self.duplicates,
+            "shared_headlines": self.shared,
+            "inflight": len(self._inflight),
+        }
+
+
+async def _watched_symbols(limit: int) -> list:
+    """Active alerts aur portfolios mein sabse zyada aane wale symbols."""
+    if database.db is None:
+        return []
+    counts = Counter()
+    pipelines = (
+        (database.db.alerts, [{"$match": {"status": "active"}}, {"$group": {"_id": "$stock_symbol", "n": {"$sum": 1}}}]),
+        (database.db.portfolio, [{"$group": {"_id": "$symbol", "n": {"$sum": 1}}}]),
+    )
+    for collection, pipeline in pipelines:
+        try:
+            async for row in collection.aggregate(pipeline):
+                if row["_id"]:
+                    counts[row["_id"]] += row["n"]
+        except Exception as e:
+            logger.warning(f"Watched symbols query failed: {e}")
+    return [sym for sym, _ in counts.most_common(limit)]
+
+
+# Singleton Instance
+news_store = NewsStore(
+    maxsize=settings.NEWS_CACHE_SIZE,
+    ttl=settings.NEWS_TTL,
+    items_per_feed=settings.NEWS_ITEMS_PER_FEED,
+)
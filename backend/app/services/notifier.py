@@ -1,9 +1,11 @@
 import os
-import smtplib
+import time
+import asyncio
 import httpx
 import logging
-from email.message import EmailMessage
 from dotenv import load_dotenv
+from app.utils.templates import CompiledTemplate
+from app.services.telemetry import observe_notification
 
 load_dotenv()
 
@@ -11,12 +13,7 @@ load_dotenv()
 logger = logging.getLogger("Notifier")
 
 # --- CONFIGURATION ---
-# Email Config
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp-relay.brevo.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-SENDER_EMAIL = os.getenv("EMAIL_SENDER") 
-SMTP_LOGIN = os.getenv("SMTP_LOGIN", SENDER_EMAIL) 
-SENDER_PASSWORD = os.getenv("EMAIL_PASSWORD")
+# Email: app/utils/email.py (templates) + app/services/mailer.py (pooled async SMTP)
 
 # Frontend URL (Used in links)
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
@@ -25,176 +22,215 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 
 # ============================================================
-# 📧 EMAIL SECTION
+# 📱 TELEGRAM SECTION (✅ Updated & Fixed)
 # ============================================================
 
-def send_email_sync(to_email: str, subject: str, html_content: str):
-    """
-    Synchronous function to send email via SMTP.
-    Used by async wrappers below.
+class TelegramSender:
     """
-    msg = EmailMessage()
-    msg["From"] = f"Stock Watcher <{SENDER_EMAIL}>"
-    msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.set_content(html_content, subtype="html")
-
-    try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=30) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(SMTP_LOGIN, SENDER_PASSWORD)
-            server.send_message(msg)
-            
-        print(f"✅ Email sent successfully to {to_email}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Failed to send email: {e}")
-        return False
+    Long-lived, connection-pooled Telegram client with a rate-aware send queue.
 
-# 1. Price Alert Email (With Currency Logic)
-async def send_email_notification(to_email: str, symbol: str, current_price: float, target_price: float):
-    
-    # ✅ Logic: Determine Currency Symbol
-    currency_symbol = "₹" if symbol.endswith((".NS", ".BO")) else "$"
-
-    subject = f"🚀 Alert Triggered: {symbol} is now {currency_symbol}{current_price}"
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; background-color: #f3f4f6; margin: 0; padding: 0; }}
-            .email-container {{ max-width: 600px; margin: 20px auto; background-color: #ffffff; border-radius: 8px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.05); }}
-            .header {{ background-color: #1e293b; padding: 20px; text-align: center; }}
-            .header h1 {{ color: #ffffff; margin: 0; font-size: 20px; letter-spacing: 1px; }}
-            .content {{ padding: 30px; text-align: center; color: #334155; }}
-            .stock-badge {{ background-color: #eff6ff; color: #1d4ed8; padding: 8px 16px; border-radius: 20px; font-weight: bold; font-size: 14px; display: inline-block; margin-bottom: 20px; }}
-            .price-table {{ width: 100%; margin-top: 20px; border-collapse: collapse; }}
-            .price-cell {{ padding: 15px; border: 1px solid #e2e8f0; width: 50%; }}
-            .price-label {{ font-size: 12px; text-transform: uppercase; color: #64748b; font-weight: bold; letter-spacing: 0.5px; }}
-            .price-value {{ font-size: 24px; font-weight: 800; margin-top: 5px; color: #0f172a; }}
-            .price-green {{ color: #16a34a; }}
-            .btn {{ background-color: #2563eb; color: #ffffff; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-weight: bold; font-size: 16px; display: inline-block; margin-top: 30px; }}
-            .footer {{ background-color: #f8fafc; padding: 20px; text-align: center; font-size: 12px; color: #94a3b8; }}
-        </style>
-    </head>
-    <body>
-        <div class="email-container">
-            <div class="header">
-                <h1>STOCK WATCHER</h1>
-            </div>
-            <div class="content">
-                <div class="stock-badge">{symbol}</div>
-                <h2 style="margin: 0 0 10px 0; color: #0f172a;">Target Price Hit! 🎯</h2>
-                <p style="margin: 0; line-height: 1.5;">The stock you are tracking has reached your specified limit.</p>
-                
-                <table class="price-table">
-                    <tr>
-                        <td class="price-cell">
-                            <div class="price-label">Your Target</div>
-                            <div class="price-value">{currency_symbol}{target_price}</div>
-                        </td>
-                        <td class="price-cell" style="background-color: #f0fdf4;">
-                            <div class="price-label">Current Price</div>
-                            <div class="price-value price-green">{currency_symbol}{current_price}</div>
-                        </td>
-                    </tr>
-                </table>
-
-                <a href="{FRONTEND_URL}" class="btn">View Dashboard</a>
-            </div>
-            <div class="footer">
-                <p>&copy; 2025 Stock Watcher Inc. • Automated Alert System</p>
-            </div>
-        </div>
-    </body>
-    </html>
+    - Global limit: `global_rate` messages/sec (Telegram ~30/s allow karta hai).
+    - Per-chat limit: ek chat ko `per_chat_interval` seconds mein ek message.
+    - 429 par Telegram ka `retry_after` maana jaata hai (poora sender pause hota hai),
+      network / 5xx errors par exponential backoff ke saath retry.
     """
-    return send_email_sync(to_email, subject, html_content)
 
-# 2. Verification Email
-async def send_verification_email(to_email: str, token: str):
-    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
-    verify_link = f"{backend_url}/verify-email?token={token}"
-    
-    subject = "Action Required: Verify your Account 🔐"
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; background-color: #f3f4f6; margin: 0; padding: 0; }}
-            .email-container {{ max-width: 500px; margin: 30px auto; background-color: #ffffff; border-radius: 8px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.05); }}
-            .header {{ background-color: #1e293b; padding: 20px; text-align: center; }}
-            .header h1 {{ color: #ffffff; margin: 0; font-size: 20px; letter-spacing: 1px; }}
-            .content {{ padding: 40px; text-align: center; color: #334155; }}
-            .btn {{ background-color: #0f172a; color: #ffffff; padding: 14px 30px; text-decoration: none; border-radius: 6px; font-weight: bold; font-size: 16px; display: inline-block; margin-top: 25px; }}
-        </style>
-    </head>
-    <body>
-        <div class="email-container">
-            <div class="header">
-                <h1>STOCK WATCHER</h1>
-            </div>
-            <div class="content">
-                <h2 style="margin-top: 0; color: #0f172a;">Verify your email</h2>
-                <p>Please click the button below to verify your email address.</p>
-                <a href="{verify_link}" class="btn">Verify Account</a>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    return send_email_sync(to_email, subject, html_content)
+    def __init__(self, token: str, global_rate: float = 30, per_chat_interval: float = 1.0,
+                 workers: int = 8, max_retries: int = 5):
+        self.token = token
+        self.global_rate = global_rate
+        self.per_chat_interval = per_chat_interval
+        self.workers = workers
+        self.max_retries = max_retries
+        self._client = None
+        self._queue = None
+        self._tasks = []
+        self._next_global = 0.0
+        self._next_chat = {}   # chat_id -> earliest next send time
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"https://api.telegram.org/bot{self.token}/sendMessage"
+
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers),
+        )
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send(self, chat_id: str, payload: dict) -> bool:
+        """Message queue mein daal kar uske deliver (ya fail) hone tak wait karta hai."""
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((str(chat_id), payload, future, time.monotonic()))
+        return await future
+
+    async def _wait_for_slot(self, chat_id: str):
+        loop_time = time.monotonic()
+        # Slot reserve pehle karo, sleep baad mein, taaki workers ek hi slot na lein
+        slot = max(loop_time, self._next_global, self._next_chat.get(chat_id, 0.0))
+        self._next_global = max(self._next_global, slot) + 1.0 / self.global_rate
+        self._next_chat[chat_id] = slot + self.per_chat_interval
+        if slot > loop_time:
+            await asyncio.sleep(slot - loop_time)
+
+    async def _deliver(self, chat_id: str, payload: dict) -> bool:
+        delay = 1.0
+        for attempt in range(1, self.max_retries + 1):
+            await self._wait_for_slot(chat_id)
+            try:
+                response = await self._client.post(self.url, json=payload)
+            except httpx.HTTPError as e:
+                logger.warning(f"Telegram network error (attempt {attempt}): {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+                continue
 
-# 3. Broadcast / Admin Email
-def send_generic_email(to_email: str, subject: str, body: str):
-    """
-    Admin Announcements function (Sync for BackgroundTasks)
-    """
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; background-color: #f3f4f6; margin: 0; padding: 0; }}
-            .email-container {{ max-width: 600px; margin: 20px auto; background-color: #ffffff; border-radius: 8px; overflow: hidden; }}
-            .header {{ background-color: #4F46E5; padding: 20px; text-align: center; }}
-            .header h1 {{ color: #ffffff; margin: 0; font-size: 20px; letter-spacing: 1px; }}
-            .content {{ padding: 30px; color: #334155; line-height: 1.6; }}
-        </style>
-    </head>
-    <body>
-        <div class="email-container">
-            <div class="header">
-                <h1>📢 ANNOUNCEMENT</h1>
-            </div>
-            <div class="content">
-                <p style="font-size: 16px; margin-top: 0;">Hello,</p>
-                <p style="font-size: 16px;">{body}</p>
-                <hr style="border: 0; border-top: 1px solid #eee; margin: 30px 0;">
-                <p style="font-size: 14px; color: #64748b;">Best regards,<br>The Stock Watcher Team</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    return send_email_sync(to_email, subject, html_content)
+            if response.status_code == 200:
+                return True
 
+            if response.status_code == 429:
+                self.rate_limited += 1
+                try:
+                    retry_after = float(response.json().get("parameters", {}).get("retry_after", delay))
+                except ValueError:
+                    retry_after = delay
+                # Flood control: saare workers ko pause karo
+                self._next_global = max(self._next_global, time.monotonic() + retry_after)
+                logger.warning(f"Telegram 429: retrying after {retry_after}s")
+                continue
+
+            if response.status_code >= 500:
+                await asyncio.sleep(delay)
+                delay *= 2
+                continue
+
+            # 4xx (e.g. bot blocked / wrong chat id): retry ka fayda nahi
+            logger.error(f"Telegram API Error: {response.text}")
+            return False
+        return False
 
-# ============================================================
-# 📱 TELEGRAM SECTION (✅ Updated & Fixed)
-# ============================================================
+    async def _worker(self):
+        while True:
+            chat_id, payload, future, enqueued_at = await self._queue.get()
+            try:
+                ok = await self._deliver(chat_id, payload)
+            except Exception as e:
+                logger.error(f"Exception while sending Telegram notification: {e}")
+                ok = False
+            finally:
+                self._queue.task_done()
+
+            latency = time.monotonic() - enqueued_at
+            observe_notification("telegram", latency, ok)
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+            if not future.done():
+                future.set_result(ok)
+
+            # Purane per-chat slots saaf karein taaki dict unbounded na bade
+            if len(self._next_chat) > 10000:
+                now = time.monotonic()
+                self._next_chat = {c: t for c, t in self._next_chat.items() if t > now}
+
+    def stats(self) -> dict:
+        done = self.sent + self.failed
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "workers": len(self._tasks),
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "avg_latency_ms": round(self._latency_total / done * 1000, 2) if done else 0.0,
+            "max_latency_ms": round(self._latency_max * 1000, 2),
+        }
+
+# Singleton Instance (app lifespan start/stop karta hai)
+telegram_sender = TelegramSender(
+    TELEGRAM_TOKEN,
+    global_rate=float(os.getenv("TELEGRAM_GLOBAL_RATE", 30)),
+    per_chat_interval=float(os.getenv("TELEGRAM_PER_CHAT_INTERVAL", 1.0)),
+    workers=int(os.getenv("TELEGRAM_WORKERS", 8)),
+)
+
+# --- Telegram Payload (startup par ek baar compile) ---
+# ✅ Logic: Check if Frontend is Localhost or Live
+# Telegram API rejects buttons with 'localhost' URLs, isliye ye branch sirf ek baar chalti hai.
+_TELEGRAM_IS_LOCAL = "localhost" in FRONTEND_URL or "127.0.0.1" in FRONTEND_URL
+
+_TELEGRAM_MESSAGE = CompiledTemplate(
+    "🔔 <b>TARGET HIT: ${symbol}</b>\n\n"
+    "🚀 <b>Price Alert Triggered</b>\n"
+    "The stock has reached your target price.\n\n"
+    "💵 <b>Current Price:</b> <code>${currency_symbol}${current}</code>\n"
+    "🎯 <b>Target Price:</b>  <code>${currency_symbol}${target}</code>\n\n"
+    "📊 <i>Market: ${market_name}</i>"
+    # Localhost: Link text mein (button kaam nahi karega)
+    + ("\n\n🔗 <a href='${frontend_url}'>Open Dashboard</a>" if _TELEGRAM_IS_LOCAL else "")
+).bind(frontend_url=FRONTEND_URL)
+
+# Live URL: Pro Button (shared dict, har message ke liye dobara nahi banta)
+_TELEGRAM_REPLY_MARKUP = None if _TELEGRAM_IS_LOCAL else {
+    "inline_keyboard": [
+        [
+            {
+                "text": "📈 View Chart & Dashboard",
+                "url": FRONTEND_URL
+            }
+        ]
+    ]
+}
+
+# Currency & Market Logic: is_indian -> (currency_symbol, market_name)
+_MARKETS = {
+    True: ("₹", "Indian Market 🇮🇳"),
+    False: ("$", "US Market 🇺🇸"),
+}
+
+def build_telegram_payload(chat_id: str, symbol: str, target: float, current: float) -> dict:
+    currency_symbol, market_name = _MARKETS[symbol.endswith((".NS", ".BO"))]
+    payload = {
+        "chat_id": chat_id,
+        "parse_mode": "HTML",
+        "disable_web_page_preview": True,
+        "text": _TELEGRAM_MESSAGE.render(
+            symbol=symbol,
+            currency_symbol=currency_symbol,
+            current=current,
+            target=target,
+            market_name=market_name
+        ),
+    }
+    if _TELEGRAM_REPLY_MARKUP is not None:
+        payload["reply_markup"] = _TELEGRAM_REPLY_MARKUP
+    return payload
 
 async def send_telegram_notification(chat_id: str, symbol: str, target: float, current: float):
     """
     Sends a formatted Telegram message.
-    Handles 'Localhost' link issues automatically.
+    Handles 'Localhost' link issues automatically (startup par decide hota hai).
     """
     if not TELEGRAM_TOKEN:
         logger.error("❌ Telegram Token is missing! Check .env file.")
@@ -204,64 +240,8 @@ async def send_telegram_notification(chat_id: str, symbol: str, target: float, c
         logger.error("❌ Chat ID is missing.")
         return False
 
-    # 1. Currency & Market Logic
-    if symbol.endswith((".NS", ".BO")):
-        currency_symbol = "₹"
-        market_name = "Indian Market 🇮🇳"
-    else:
-        currency_symbol = "$"
-        market_name = "US Market 🇺🇸"
-
-    # 2. Base Message
-    message = (
-        f"🔔 <b>TARGET HIT: {symbol}</b>\n\n"
-        f"🚀 <b>Price Alert Triggered</b>\n"
-        f"The stock has reached your target price.\n\n"
-        f"💵 <b>Current Price:</b> <code>{currency_symbol}{current}</code>\n"
-        f"🎯 <b>Target Price:</b>  <code>{currency_symbol}{target}</code>\n\n"
-        f"📊 <i>Market: {market_name}</i>"
-    )
-
-    # 3. Smart URL Handling (Localhost Fix)
-    payload = {
-        "chat_id": chat_id,
-        "parse_mode": "HTML",
-        "disable_web_page_preview": True
-    }
-
-    # ✅ Logic: Check if Frontend is Localhost or Live
-    # Telegram API rejects buttons with 'localhost' URLs.
-    if "localhost" in FRONTEND_URL or "127.0.0.1" in FRONTEND_URL:
-        # Append Link to Text (Works on Localhost)
-        message += f"\n\n🔗 <a href='{FRONTEND_URL}'>Open Dashboard</a>"
-        payload["text"] = message
-    else:
-        # Use Pro Button (Works on Live URL)
-        payload["text"] = message
-        payload["reply_markup"] = {
-            "inline_keyboard": [
-                [
-                    {
-                        "text": "📈 View Chart & Dashboard",
-                        "url": FRONTEND_URL
-                    }
-                ]
-            ]
-        }
-
-    try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            
-            if response.status_code == 200:
-                logger.info(f"Telegram notification sent to {chat_id} for {symbol}")
-                return True
-            else:
-                logger.error(f"Telegram API Error: {response.text}")
-                return False
-                
-    except Exception as e:
-        logger.error(f"Exception while sending Telegram notification: {e}")
-        return False
+    # Rate-aware queue ke through bhejein (pooled client, 429 retry)
+    sent = await telegram_sender.send(chat_id, build_telegram_payload(chat_id, symbol, target, current))
+    if sent:
+        logger.info(f"Telegram notification sent to {chat_id} for {symbol}")
+    return sent
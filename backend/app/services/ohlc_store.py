@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from app.core.config import settings
+from app.services.threadpool import finance_pool
+
+logger = logging.getLogger("StockWatcher")
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _empty_bars() -> dict:
+    bars = {"date": np.array([], dtype="datetime64[D]")}
+    for col in COLUMNS:
+        bars[col] = np.array([], dtype=float)
+    return bars
+
+
+class OHLCStore:
+    """
+    Local daily OHLC store: har symbol ki ek `.npz` file (column arrays).
+
+    - Pehli baar `initial_period` ka data download hota hai, uske baad sirf
+      last stored bar se aage ke naye bars (incremental fetch).
+    - Response JSON refresh ke time ek baar column arrays se banta hai aur
+      memory mein bytes ki tarah rakha jaata hai (har `days` window alag),
+      toh hot symbols bina upstream call ke serve hote hain.
+    - Per-symbol refresh locks weak map mein hain: koi refresh chal nahi raha
+      toh lock khud hat jaata hai, dict symbols ke saath nahi badhta.
+    """
+
+    def __init__(self, directory: str, refresh_seconds: float, maxsize: int, initial_period: str = "1mo"):
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.maxsize = maxsize
+        self.initial_period = initial_period
+        self._memory = OrderedDict()  # symbol -> {"bars", "checked_at", "payloads": {days: bytes}}
+        self._locks = weakref.WeakValueDictionary()  # symbol -> asyncio.Lock (sirf jab tak koi use kare)
+
+    # ---------------- Disk ----------------
+
+    def _path(self, symbol: str) -> str:
+        safe = symbol.replace("/", "_").replace("^", "_")
+        return os.path.join(self.directory, f"{safe}.npz")
+
+    def _read_sync(self, symbol: str) -> dict:
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return _empty_bars()
+        with np.load(path) as data:
+            return {key: data[key] for key in ("date",) + COLUMNS}
+
+    def _write_sync(self, symbol: str, bars: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(symbol)
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, **bars)
+        os.replace(tmp, path)  # Atomic swap, half-written file kabhi read nahi hogi
+
+    # ---------------- Upstream ----------------
+
+    def _download_sync(self, symbol: str, start=None) -> dict:
+        if start is None:
+            data = yf.download(symbol, period=self.initial_period, interval="1d", auto_adjust=True, progress=False)
+        else:
+            data = yf.download(symbol, start=str(start), interval="1d", auto_adjust=True, progress=False)
+
+        if data is None or data.empty:
+            return _empty_bars()
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+
+        data = data.dropna(subset=["Close"])
+        bars = {"date": data.index.values.astype("datetime64[D]")}
+        for col in COLUMNS:
+            name = col.capitalize()
+            bars[col] = data[name].to_numpy(dtype=float) if name in data.columns else np.full(len(data), np.nan)
+        return bars
+
+    @staticmethod
+    def _merge(old: dict, new: dict) -> dict:
+        """Naye bars purane bars ko unki pehli date se replace karte hain (aaj ka bar intraday badalta hai)."""
+        if not len(new["date"]):
+            return old
+        keep = old["date"] < new["date"][0]
+        return {key: np.concatenate([old[key][keep], new[key]]) for key in old}
+
+    # ---------------- Serialization ----------------
+
+    @staticmethod
+    def _build_payload(bars: dict, days: int) -> bytes:
+        cutoff = np.datetime64(datetime.utcnow().date() - timedelta(days=days), "D")
+        mask = (bars["date"] >= cutoff) & (bars["close"] > 0)
+
+        labels = pd.DatetimeIndex(bars["date"][mask]).strftime("%d %b").tolist()
+        prices = np.round(bars["close"][mask], 2).tolist()
+        return json.dumps([{"date": d, "price": p} for d, p in zip(labels, prices)]).encode()
+
+    # ---------------- Public API ----------------
+
+    def _remember(self, symbol: str, entry: dict):
+        self._memory[symbol] = entry
+        self._memory.move_to_end(symbol)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _payload(self, entry: dict, days: int) -> bytes:
+        # Bars sab windows ke liye same hain; har `days` ka JSON pehli baar banta hai
+        payload = entry["payloads"].get(days)
+        if payload is None:
+            payload = entry["payloads"][days] = self._build_payload(entry["bars"], days)
+        return payload
+
+    def _lock(self, symbol: str) -> asyncio.Lock:
+        lock = self._locks.get(symbol)
+        if lock is None:
+            lock = self._locks[symbol] = asyncio.Lock()
+        return lock
+
+    async def refresh(self, symbol: str, days: int = 30) -> dict:
+        """Disk se load + sirf missing bars fetch + payload rebuild."""
+        entry = self._memory.get(symbol)
+        bars = entry["bars"] if entry else await finance_pool.run(self._read_sync, symbol, label="ohlc_read")
+
+        start = bars["date"][-1] if len(bars["date"]) else None
+        fresh = await finance_pool.run(self._download_sync, symbol, start, label="ohlc_download")
+        merged = self._merge(bars, fresh)
+
+        if len(fresh["date"]):
+            await finance_pool.run(self._write_sync, symbol, merged, label="ohlc_write")
+
+        entry = {
+            "bars": merged,
+            "checked_at": time.monotonic(),
+            "payloads": {},
+        }
+        self._payload(entry, days)
+        self._remember(symbol, entry)
+        return entry
+
+    async def get_payload(self, symbol: str, days: int = 30) -> bytes:
+        """
+        Serialized history (JSON bytes). Fresh memory entry hai toh koi I/O nahi.
+        Ek symbol ke concurrent refreshes lock se ek hi upstream call banate hain.
+        """
+        entry = self._memory.get(symbol)
+        if entry and (time.monotonic() - entry["checked_at"]) < self.refresh_seconds:
+            self._memory.move_to_end(symbol)
+            return self._payload(entry, days)
+
+        async with self._lock(symbol):
+            entry = self._memory.get(symbol)
+            if entry and (time.monotonic() - entry["checked_at"]) < self.refresh_seconds:
+                return self._payload(entry, days)
+            try:
+                entry = await self.refresh(symbol, days)
+            except Exception as e:
+                logger.warning(f"OHLC refresh failed for {symbol}: {e}")
+                if entry:
+                    return self._payload(entry, days)  # Purana data better than kuch nahi
+                raise
+            return self._payload(entry, days)
+
+
+# Singleton Instance
+ohlc_store = OHLCStore(
+    directory=settings.OHLC_STORE_DIR,
+    refresh_seconds=settings.OHLC_REFRESH_SECONDS,
+    maxsize=settings.OHLC_MEMORY_SIZE,
+)
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from bson import ObjectId
+from app.core.config import settings
+from app.models.outbox import OutboxMessage
+from app.models.alert import Alert
+from app.services.mailer import mailer
+from app.utils.email import build_alert_email
+from app.services.notifier import send_telegram_notification
+
+logger = logging.getLogger("StockWatcher")
+
+# ============================================================
+# 📥 ENQUEUE (Tracker side)
+# ============================================================
+
+DUPLICATE_KEY = 11000
+
+async def enqueue_notifications(triggered: list, held: bool = False) -> int:
+    """
+    Triggered alerts ke liye outbox messages likhta hai (ek per channel).
+    `triggered` = [(alert_record, current_price), ...]
+
+    `held=True` (tracker): rows `held` state mein likhi jaati hain aur alert flip ke
+    baad `release_held()` unhe `pending` karta hai. Beech mein crash ho toh
+    dispatcher ka sweep alert ki state se resolve karta hai, notification kho nahi sakta.
+
+    Idempotency key par upsert: same alert dobara trigger ho (crash ke baad retry,
+    ya do tracker nodes) toh bhi message ek hi baar banta hai. Held / cancelled row
+    phir se held ho jaati hai; jo row pehle se dispatch pipeline mein hai
+    (pending / sent / ...) usse duplicate key error aata hai, jo ignore hota hai.
+    """
+    now = datetime.utcnow()
+    status = "held" if held else "pending"
+    ops = []
+    for alert, current_price in triggered:
+        channels = []
+        if alert["email"]:
+            channels.append(("email", alert["email"]))
+        if alert["telegram_id"]:
+            channels.append(("telegram", str(alert["telegram_id"])))
+
+        for channel, recipient in channels:
+            key = f"{alert['id']}:{channel}"
+            ops.append(UpdateOne(
+                {"idempotency_key": key, "status": {"$in": ["held", "cancelled"]}},
+                {
+                    "$set": {
+                        "status": status,
+                        "current_price": current_price,
+                        "next_attempt_at": now,
+                        "finished_at": None,
+                    },
+                    "$setOnInsert": {
+                        "idempotency_key": key,
+                        "alert_id": alert["id"],
+                        "channel": channel,
+                        "recipient": recipient,
+                        "symbol": alert["stock_symbol"],
+                        "target_price": alert["target_price"],
+                        "attempts": 0,
+                        "created_at": now,
+                    },
+                },
+                upsert=True
+            ))
+
+    if not ops:
+        return 0
+    try:
+        result = await OutboxMessage.get_motor_collection().bulk_write(ops, ordered=False)
+        return result.upserted_count + result.modified_count
+    except BulkWriteError as e:
+        # Sirf "already queued" duplicates theek hain; koi aur error upar jaaye
+        if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+            raise
+        return e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+
+async def release_held(alert_ids: list) -> int:
+    """Flip ho chuke alerts ke held messages dispatch ke liye `pending` karta hai."""
+    if not alert_ids:
+        return 0
+    result = await OutboxMessage.get_motor_collection().update_many(
+        {"alert_id": {"$in": list(alert_ids)}, "status": "held"},
+        {"$set": {"status": "pending", "next_attempt_at": datetime.utcnow()}}
+    )
+    return result.modified_count
+
+async def _resolve_held():
+    """
+    Sweep: OUTBOX_HOLD_GRACE_SECONDS se purani held rows (tracker flip / release se
+    pehle crash hua, ya flip isi tick ka nahi tha). Alert `triggered` hai (trigger_token
+    ke saath flip ho chuka) toh message release, warna (active / delete) cancel.
+    Alert baad mein trigger hua toh enqueue cancelled row ko phir se held kar deta hai.
+    """
+    collection = OutboxMessage.get_motor_collection()
+    now = datetime.utcnow()
+    stale = {"status": "held", "next_attempt_at": {"$lte": now - timedelta(seconds=settings.OUTBOX_HOLD_GRACE_SECONDS)}}
+    rows = await collection.find(stale, {"_id": 1, "alert_id": 1}).limit(settings.OUTBOX_BATCH_SIZE).to_list(length=None)
+    if not rows:
+        return
+
+    alert_ids = {row["alert_id"] for row in rows}
+    triggered = set()
+    async for doc in Alert.get_motor_collection().find(
+        {"_id": {"$in": [ObjectId(a) for a in alert_ids]}, "status": "triggered", "trigger_token": {"$ne": None}},
+        {"_id": 1}
+    ):
+        triggered.add(str(doc["_id"]))
+
+    released = await collection.update_many(
+        {**stale, "alert_id": {"$in": list(triggered)}},
+        {"$set": {"status": "pending", "next_attempt_at": now}}
+    )
+    cancelled = await collection.update_many(
+        {**stale, "_id": {"$in": [row["_id"] for row in rows]}, "alert_id": {"$nin": list(triggered)}},
+        {"$set": {"status": "cancelled", "finished_at": now}}
+    )
+    logger.info(f"📤 Outbox sweep: {released.modified_count} held released, {cancelled.modified_count} cancelled")
+
+# ============================================================
+# 📤 DISPATCH (Worker side)
+# ============================================================
+
+async def _claim_batch(limit: int) -> list:
+    """
+    Due messages ko lease ke saath claim karta hai. `sending` status ki lease
+    expire ho jaaye (dispatcher crash) toh message phir se claimable hai.
+    """
+    collection = OutboxMessage.get_motor_collection()
+    now = datetime.utcnow()
+    due = {"status": {"$in": ["pending", "sending"]}, "next_attempt_at": {"$lte": now}}
+
+    candidates = await collection.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(limit).to_list(length=limit)
+    if not candidates:
+        return []
+
+    token = uuid.uuid4().hex
+    await collection.update_many(
+        {"_id": {"$in": [c["_id"] for c in candidates]}, **due},
+        {"$set": {
+            "status": "sending",
+            "claim_token": token,
+            "next_attempt_at": now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+        }}
+    )
+    return await OutboxMessage.find(OutboxMessage.claim_token == token).to_list()
+
+async def _send_telegram(msg: OutboxMessage, limiter: asyncio.Semaphore) -> bool:
+    async with limiter:
+        return await send_telegram_notification(
+            chat_id=msg.recipient,
+            symbol=msg.symbol,
+            target=msg.target_price,
+            current=msg.current_price
+        )
+
+async def _deliver(batch: list) -> list:
+    """Batch deliver karta hai; har message ke liye True/False (same order)."""
+    limiter = asyncio.Semaphore(settings.NOTIFY_CONCURRENCY)
+    results = {}
+
+    emails = [m for m in batch if m.channel == "email"]
+    telegrams = [m for m in batch if m.channel == "telegram"]
+
+    async def send_emails():
+        messages = []
+        for m in emails:
+            mail = build_alert_email(m.recipient, m.symbol, m.current_price, m.target_price)
+            mail["X-Idempotency-Key"] = m.idempotency_key
+            messages.append(mail)
+        for m, ok in zip(emails, await mailer.send_many(messages)):
+            results[m.id] = ok
+
+    async def send_telegrams():
+        outcomes = await asyncio.gather(*(_send_telegram(m, limiter) for m in telegrams), return_exceptions=True)
+        for m, ok in zip(telegrams, outcomes):
+            results[m.id] = ok is True
+
+    await asyncio.gather(send_emails(), send_telegrams())
+    return [results.get(m.id, False) for m in batch]
+
+async def _settle(batch: list, outcomes: list) -> dict:
+    """Results ek bulk_write mein: sent, retry (exponential backoff) ya dead-letter."""
+    now = datetime.utcnow()
+    counts = {"sent": 0, "retry": 0, "dead": 0}
+    ops = []
+
+    for msg, ok in zip(batch, outcomes):
+        guard = {"_id": msg.id, "claim_token": msg.claim_token}
+        if ok:
+            counts["sent"] += 1
+            ops.append(UpdateOne(guard, {
+                "$set": {"status": "sent", "sent_at": now, "finished_at": now, "claim_token": None},
+                "$inc": {"attempts": 1}
+            }))
+            continue
+
+        attempts = msg.attempts + 1
+        if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            counts["dead"] += 1
+            update = {"status": "dead", "finished_at": now, "claim_token": None, "last_error": "delivery failed"}
+        else:
+            counts["retry"] += 1
+            backoff = settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+            update = {
+                "status": "pending",
+                "claim_token": None,
+                "next_attempt_at": now + timedelta(seconds=backoff),
+                "last_error": "delivery failed",
+            }
+        ops.append(UpdateOne(guard, {"$set": update, "$inc": {"attempts": 1}}))
+
+    if ops:
+        await OutboxMessage.get_motor_collection().bulk_write(ops, ordered=False)
+    return counts
+
+async def dispatch_outbox():
+    """
+    Scheduled job: outbox ko batches mein drain karta hai jab tak due messages hain
+    (ya ek run ki batch limit tak). Price evaluation path isse kabhi wait nahi karta.
+    """
+    try:
+        await _resolve_held()
+        for _ in range(settings.OUTBOX_MAX_BATCHES_PER_RUN):
+            batch = await _claim_batch(settings.OUTBOX_BATCH_SIZE)
+            if not batch:
+                return
+
+            outcomes = await _deliver(batch)
+            counts = await _settle(batch, outcomes)
+            logger.info(
+                f"📤 Outbox: {counts['sent']} sent, {counts['retry']} retrying, {counts['dead']} dead-lettered"
+            )
+    except Exception as e:
+        logger.error(f"Outbox Dispatcher Error: {e}")
+
+OUTBOX_STATUSES = ("held", "pending", "sending", "sent", "dead", "cancelled")
+
+async def outbox_stats() -> dict:
+    # Har status ka count status_next_attempt index se (poori collection scan nahi)
+    collection = OutboxMessage.get_motor_collection()
+    counts = await asyncio.gather(*(collection.count_documents({"status": s}) for s in OUTBOX_STATUSES))
+    return dict(zip(OUTBOX_STATUSES, counts))
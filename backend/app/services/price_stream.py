@@ -0,0 +1,81 @@
+import asyncio
+import itertools
+import logging
+from collections import Counter
+
+logger = logging.getLogger("StockWatcher")
+
+
+class _Subscriber:
+    __slots__ = ("symbols", "pending", "event")
+
+    def __init__(self, symbols: set):
+        self.symbols = symbols
+        self.pending = {}            # symbol -> latest price (coalesced)
+        self.event = asyncio.Event()
+
+
+class PriceStream:
+    """
+    In-process pub/sub for live prices.
+
+    Tracker har tick mein jo prices fetch karta hai, wahi `publish()` se saare
+    subscribed clients ko jaate hain. Client jitne bhi hon, upstream fetch
+    har symbol ke liye tick mein ek hi baar hota hai.
+    Slow client ke liye updates queue nahi hote, sirf latest price rakha jaata hai.
+    """
+
+    def __init__(self):
+        self._subscribers = {}       # sub_id -> _Subscriber
+        self._refcount = Counter()   # symbol -> kitne clients ne subscribe kiya
+        self._ids = itertools.count(1)
+
+    def subscribe(self, symbols) -> int:
+        sub_id = next(self._ids)
+        sub = _Subscriber(set(symbols))
+        self._subscribers[sub_id] = sub
+        self._refcount.update(sub.symbols)
+        return sub_id
+
+    def unsubscribe(self, sub_id: int):
+        sub = self._subscribers.pop(sub_id, None)
+        if sub is None:
+            return
+        self._refcount.subtract(sub.symbols)
+        for sym in sub.symbols:
+            if self._refcount[sym] <= 0:
+                del self._refcount[sym]
+
+    def subscribed_symbols(self) -> list:
+        return list(self._refcount.keys())
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, prices: dict):
+        if not self._subscribers or not prices:
+            return
+        for sub in self._subscribers.values():
+            updates = {sym: prices[sym] for sym in sub.symbols if sym in prices}
+            if updates:
+                sub.pending.update(updates)
+                sub.event.set()
+
+    async def next_update(self, sub_id: int, timeout: float):
+        """
+        Agla coalesced update ({symbol: price}) return karta hai,
+        ya `timeout` tak kuch na aaye toh None (heartbeat ke liye).
+        """
+        sub = self._subscribers[sub_id]
+        try:
+            await asyncio.wait_for(sub.event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        sub.event.clear()
+        updates, sub.pending = sub.pending, {}
+        return updates
+
+
+# Singleton Instance
+price_stream = PriceStream()
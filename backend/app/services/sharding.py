@@ -0,0 +1,91 @@
+import os
+import uuid
+import socket
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.models.tracker_node import TrackerNode
+
+logger = logging.getLogger("StockWatcher")
+
+
+def _weight(node_id: str, symbol: str) -> int:
+    digest = hashlib.blake2b(f"{node_id}|{symbol}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ShardCoordinator:
+    """
+    Mongo-coordinated symbol sharding for tracker nodes.
+
+    Har node `tracker_nodes` mein heartbeat likhta hai. Live nodes ki list se
+    rendezvous (highest-random-weight) hashing har symbol ka ek owner chunti hai:
+    sab nodes bina baat kiye same answer nikalte hain, aur node add/remove hone
+    par sirf ~1/K symbols hi move hote hain.
+    """
+
+    def __init__(self):
+        self.hostname = socket.gethostname()
+        self.node_id = f"{self.hostname}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._nodes = (self.node_id,)
+        self._owned = {}  # symbol -> bool (current membership ke liye cache)
+
+    @property
+    def nodes(self) -> tuple:
+        return self._nodes
+
+    async def heartbeat(self):
+        """Apna heartbeat update karke live membership refresh karta hai."""
+        now = datetime.utcnow()
+        try:
+            await TrackerNode.get_motor_collection().update_one(
+                {"node_id": self.node_id},
+                {
+                    "$set": {"heartbeat_at": now},
+                    "$setOnInsert": {
+                        "node_id": self.node_id,
+                        "hostname": self.hostname,
+                        "pid": os.getpid(),
+                        "started_at": now,
+                    },
+                },
+                upsert=True
+            )
+            cutoff = now - timedelta(seconds=settings.TRACKER_NODE_TTL_SECONDS)
+            live = await TrackerNode.get_motor_collection().find(
+                {"heartbeat_at": {"$gte": cutoff}}, {"node_id": 1}
+            ).to_list(length=None)
+        except Exception as e:
+            logger.error(f"Tracker heartbeat failed: {e}")
+            return
+
+        nodes = tuple(sorted({doc["node_id"] for doc in live} | {self.node_id}))
+        if nodes != self._nodes:
+            logger.info(f"🧩 Tracker membership changed: {len(nodes)} node(s), this node = {self.node_id}")
+            self._nodes = nodes
+            self._owned = {}
+
+    async def leave(self):
+        """Graceful shutdown: turant membership se hat jao taaki symbols jaldi move hon."""
+        try:
+            await TrackerNode.get_motor_collection().delete_one({"node_id": self.node_id})
+        except Exception as e:
+            logger.warning(f"Tracker leave failed: {e}")
+
+    def owns(self, symbol: str) -> bool:
+        owned = self._owned.get(symbol)
+        if owned is None:
+            if len(self._nodes) == 1:
+                owned = True
+            else:
+                owned = max(self._nodes, key=lambda node: _weight(node, symbol)) == self.node_id
+            self._owned[symbol] = owned
+        return owned
+
+    def filter(self, symbols) -> list:
+        return [sym for sym in symbols if self.owns(sym)]
+
+
+# Singleton Instance (har process ka ek node)
+shard = ShardCoordinator()
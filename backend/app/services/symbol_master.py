@@ -0,0 +1,255 @@
+import io
+import os
+import re
+import csv
+import time
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+import httpx
+from app.core.config import settings
+from app.services.threadpool import finance_pool
+
+logger = logging.getLogger("StockWatcher")
+
+SEED_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "symbols.csv")
+
+_WORD = re.compile(r"[a-z0-9&]+")
+# Same score par NSE pehle, phir US, phir BSE (zyadatar users .NS chahte hain)
+_EXCHANGE_RANK = {"NSE": 0, "US": 1, "BSE": 2}
+_MAX_PREFIX_SCAN = 200  # "a" jaise 1-letter prefixes ko bhi sub-millisecond rakhta hai
+_MAX_POSTING = 400      # Itne zyada entries wale trigrams ("ltd", " in") fuzzy mein kuch nahi batate
+
+
+def _trigrams(text: str) -> set:
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _currency(exchange: str) -> str:
+    return "USD" if exchange == "US" else "INR"
+
+
+# ============================================================
+# 📥 SOURCE PARSERS (refresh ke liye)
+# ============================================================
+
+def _parse_nse(text: str) -> list:
+    # EQUITY_L.csv: SYMBOL,NAME OF COMPANY, SERIES, ...
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        row = {k.strip(): (v or "").strip() for k, v in row.items() if k}
+        if row.get("SYMBOL") and row.get("NAME OF COMPANY"):
+            rows.append((f"{row['SYMBOL']}.NS", row["NAME OF COMPANY"], "NSE"))
+    return rows
+
+
+def _parse_us(text: str, symbol_field: str) -> list:
+    # nasdaqtrader pipe-delimited files; last line "File Creation Time: ..."
+    rows = []
+    for row in csv.DictReader(io.StringIO(text), delimiter="|"):
+        symbol = (row.get(symbol_field) or "").strip()
+        if not symbol or row.get("Test Issue") == "Y" or "$" in symbol or symbol.startswith("File Creation"):
+            continue
+        # Yahoo class shares ko dash se likhta hai: BRK.B -> BRK-B
+        rows.append((symbol.replace(".", "-"), (row.get("Security Name") or symbol).strip(), "US"))
+    return rows
+
+
+def _read_csv(path: str) -> list:
+    with open(path, encoding="utf-8", newline="") as f:
+        return [(r["symbol"], r["name"], r["exchange"]) for r in csv.DictReader(f)]
+
+
+def _write_csv(path: str, rows: list):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["symbol", "name", "exchange"])
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+# ============================================================
+# 🔎 SEARCH INDEX
+# ============================================================
+
+class _Index:
+    """
+    Immutable search index (refresh par naya banta hai aur ek assignment se swap hota hai).
+
+    - `keys`: sorted (token, kind, entry_id); token = ticker (kind 0) ya naam ka
+      ek shabd (kind 1). Prefix lookup = ek bisect + chhota scan.
+    - `trigrams`: typo / beech-ke-substring wale queries ke liye fuzzy fallback.
+    """
+
+    def __init__(self, rows: list):
+        self.entries = []
+        self.words = []
+        keys = []
+        trigrams = defaultdict(list)
+        for i, (symbol, name, exchange) in enumerate(rows):
+            ticker = symbol.split(".")[0].lower()
+            name_words = _WORD.findall(name.lower())
+            self.entries.append((symbol, name, exchange))
+            self.words.append((ticker, *name_words))
+            keys.append((ticker, 0, i))
+            keys.extend((word, 1, i) for word in set(name_words))
+            for gram in _trigrams(f"{ticker} {' '.join(name_words)}"):
+                trigrams[gram].append(i)
+        keys.sort()
+        self.symbols = {entry[0] for entry in self.entries}
+        self.keys = keys
+        self.tokens = [k[0] for k in keys]
+        self.trigrams = dict(trigrams)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _prefix(self, token: str) -> dict:
+        """entry_id -> best (kind, extra chars) for entries having a token starting with `token`."""
+        found = {}
+        start = bisect_left(self.tokens, token)
+        for key, kind, i in self.keys[start:start + _MAX_PREFIX_SCAN]:
+            if not key.startswith(token):
+                break
+            score = (kind, len(key) - len(token))
+            if i not in found or score < found[i]:
+                found[i] = score
+        return found
+
+    def search(self, query: str, limit: int) -> list:
+        tokens = _WORD.findall(query.lower())
+        if not tokens:
+            return []
+
+        # 1. Prefix: pehla token index se, baaki tokens entry ke words par prefix check
+        first, rest = tokens[0], tokens[1:]
+        scored = []
+        for i, (kind, extra) in self._prefix(first).items():
+            words = self.words[i]
+            if rest and not all(any(w.startswith(t) for w in words) for t in rest):
+                continue
+            exact = 0 if (kind == 0 and extra == 0) else 1
+            scored.append(((exact, kind, extra, _EXCHANGE_RANK.get(self.entries[i][2], 3)), i))
+
+        # 2. Fuzzy fallback (typos, e.g. "relaince"): sirf jab prefix se kuch na mile
+        compact = " ".join(tokens)
+        if not scored and len(compact) >= 3:
+            postings = [self.trigrams.get(gram, ()) for gram in _trigrams(compact)]
+            postings = [p for p in postings if len(p) <= _MAX_POSTING]
+            counts = defaultdict(int)
+            for posting in postings:
+                for i in posting:
+                    counts[i] += 1
+            need = max(2, len(postings) // 2)
+            for i, shared in counts.items():
+                if shared >= need:
+                    scored.append(((2, 2, len(postings) - shared, _EXCHANGE_RANK.get(self.entries[i][2], 3)), i))
+
+        scored.sort()
+        return [self.entries[i] for _, i in scored[:limit]]
+
+
+class SymbolMaster:
+    """
+    Local listings (NSE / BSE / US) ka in-memory search index.
+
+    Bundled seed (app/data/symbols.csv) se start hota hai; background job
+    NSE aur nasdaqtrader listings download karke `SYMBOL_MASTER_DIR` mein
+    save karta hai, toh restart ke baad bhi poori list local rehti hai.
+    """
+
+    def __init__(self, store_dir: str, sources: dict, refresh_hours: float):
+        self.store_path = os.path.join(store_dir, "master.csv")
+        self.refresh_hours = refresh_hours
+        self.sources = sources
+        self._index = None
+        self.refreshed_at = None
+
+    def _load_local_sync(self) -> "_Index":
+        path = self.store_path if os.path.exists(self.store_path) else SEED_FILE
+        return _Index(_read_csv(path))
+
+    async def load(self):
+        index = await finance_pool.run(self._load_local_sync, label="symbol_master_load")
+        self._index = index
+        logger.info(f"🔎 Symbol master loaded: {len(index)} listings")
+
+    def _ensure_index(self) -> "_Index":
+        if self._index is None:
+            self._index = self._load_local_sync()
+        return self._index
+
+    def is_listed(self, symbol: str) -> bool:
+        """Exact Yahoo ticker local listings mein hai? (symbol resolution ke liye)"""
+        return symbol in self._ensure_index().symbols
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """[{"symbol", "name", "exchange", "currency"}] best match pehle."""
+        self._ensure_index()
+        return [
+            {"symbol": symbol, "name": name, "exchange": exchange, "currency": _currency(exchange)}
+            for symbol, name, exchange in self._index.search(query, limit)
+        ]
+
+    async def refresh_if_stale(self):
+        """Scheduled job: saved listings SYMBOL_MASTER_REFRESH_HOURS se purani hon tabhi download."""
+        try:
+            age = time.time() - os.path.getmtime(self.store_path)
+        except OSError:
+            age = None
+        if age is None or age >= self.refresh_hours * 3600:
+            await self.refresh()
+
+    async def refresh(self):
+        """Listings download -> seed ke saath merge -> disk + naya index."""
+        fetched = {}
+        headers = {"User-Agent": "Mozilla/5.0"}
+        async with httpx.AsyncClient(timeout=30, headers=headers, follow_redirects=True) as client:
+            for name, url in self.sources.items():
+                if not url:
+                    continue
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    fetched[name] = response.text
+                except httpx.HTTPError as e:
+                    logger.warning(f"Symbol master source '{name}' failed: {e}")
+
+        if not fetched:
+            return
+
+        def rebuild():
+            rows = {symbol: (symbol, name, exchange) for symbol, name, exchange in _read_csv(SEED_FILE)}
+            if "nse" in fetched:
+                rows.update({r[0]: r for r in _parse_nse(fetched["nse"])})
+            if "nasdaq" in fetched:
+                rows.update({r[0]: r for r in _parse_us(fetched["nasdaq"], "Symbol")})
+            if "other" in fetched:
+                rows.update({r[0]: r for r in _parse_us(fetched["other"], "ACT Symbol")})
+            merged = sorted(rows.values())
+            _write_csv(self.store_path, merged)
+            return _Index(merged)
+
+        try:
+            index = await finance_pool.run(rebuild, label="symbol_master_build")
+        except Exception as e:
+            logger.error(f"Symbol master rebuild failed: {e}")
+            return
+        self._index = index
+        self.refreshed_at = time.time()
+        logger.info(f"🔎 Symbol master refreshed: {len(index)} listings")
+
+
+# Singleton Instance
+symbol_master = SymbolMaster(
+    store_dir=settings.SYMBOL_MASTER_DIR,
+    sources={
+        "nse": settings.NSE_SYMBOLS_URL,
+        "nasdaq": settings.NASDAQ_SYMBOLS_URL,
+        "other": settings.OTHER_SYMBOLS_URL,
+    },
+    refresh_hours=settings.SYMBOL_MASTER_REFRESH_HOURS,
+)
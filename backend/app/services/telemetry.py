@@ -0,0 +1,132 @@
+from pymongo import monitoring
+from prometheus_client import Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# ============================================================
+# 📊 PROMETHEUS METRICS (GET /metrics)
+# ============================================================
+# Hot paths par sirf histogram observe / counter inc hota hai (lock-free, sasta).
+# Cache aur pool jaise counters jo pehle se kahin maintained hain, woh
+# scrape ke time `_StatsCollector` se padhe jaate hain, unka hot-path cost zero.
+
+_FAST = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_SLOW = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency per route",
+    ["method", "route", "status"], buckets=_FAST,
+)
+BLOCKING_CALL_LATENCY = Histogram(
+    "blocking_call_duration_seconds", "Thread-pool call latency incl. queue wait (yfinance, Google Finance, OHLC)",
+    ["pool", "label"], buckets=_SLOW,
+)
+BLOCKING_CALLS = Counter(
+    "blocking_calls_total", "Thread-pool calls by outcome (ok / empty / error)",
+    ["pool", "label", "outcome"],
+)
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency",
+    ["command"], buckets=_FAST,
+)
+MONGO_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands", ["command"])
+NOTIFY_LATENCY = Histogram(
+    "notification_send_duration_seconds", "Notification send latency per channel",
+    ["channel"], buckets=_SLOW,
+)
+NOTIFICATIONS = Counter("notifications_total", "Notification sends by channel and outcome", ["channel", "outcome"])
+TICK_DURATION = Histogram(
+    "tracker_tick_duration_seconds", "Price tracker tick duration", buckets=_SLOW,
+)
+
+
+_alru_caches = {}  # name -> alru_cache wrapped function
+
+
+def track_cache(name: str):
+    """Decorator (alru_cache ke upar): cache ke hits / misses /metrics par dikhte hain."""
+    def register(fn):
+        _alru_caches[name] = fn
+        return fn
+    return register
+
+
+def observe_notification(channel: str, seconds: float, ok: bool):
+    NOTIFY_LATENCY.labels(channel).observe(seconds)
+    NOTIFICATIONS.labels(channel, "sent" if ok else "failed").inc()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Motor client par lagta hai: har command ka latency aur failures."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_LATENCY.labels(event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_LATENCY.labels(event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_FAILURES.labels(event.command_name).inc()
+
+
+class _StatsCollector:
+    """Scrape ke time alru caches, quote cache aur queues ke existing counters expose karta hai."""
+
+    def describe(self):
+        # Khaali describe: register() collect() nahi chalata, warna import ke beech
+        # (finance -> threadpool -> telemetry) half-initialised finance import hota
+        return []
+
+    def collect(self):
+        # Lazy imports: telemetry ko low-level modules (threadpool, mailer) bhi import karte hain
+        from app.services.finance import quote_cache
+        from app.services.threadpool import finance_pool
+        from app.services.notifier import telegram_sender
+        from app.services.tick_metrics import tick_metrics
+
+        hits = CounterMetricFamily("alru_cache_hits", "async_lru cache hits", labels=["cache"])
+        misses = CounterMetricFamily("alru_cache_misses", "async_lru cache misses", labels=["cache"])
+        for name, fn in _alru_caches.items():
+            info = fn.cache_info()
+            hits.add_metric([name], info.hits)
+            misses.add_metric([name], info.misses)
+        yield hits
+        yield misses
+
+        qc = quote_cache.stats()
+        lookups = CounterMetricFamily("quote_cache_lookups", "Shared quote cache lookups", labels=["result"])
+        for result in ("hits", "stale_hits", "misses"):
+            lookups.add_metric([result], qc[result])
+        yield lookups
+        yield CounterMetricFamily("quote_cache_evictions", "Shared quote cache evictions", value=qc["evictions"])
+
+        pool = finance_pool.stats()
+        yield GaugeMetricFamily("finance_pool_active", "Busy finance pool threads", value=pool["active"])
+        yield GaugeMetricFamily("finance_pool_queue_depth", "Queued finance pool calls", value=pool["queue_depth"])
+
+        tg = telegram_sender.stats()
+        yield GaugeMetricFamily("telegram_queue_depth", "Pending Telegram sends", value=tg["queue_depth"])
+
+        ticks = tick_metrics.stats()
+        yield CounterMetricFamily("tracker_skipped_runs", "Tracker runs skipped due to overlap", value=ticks["skipped_runs"])
+        yield GaugeMetricFamily("tracker_pending_carry_over", "Symbols carried into the next tick", value=ticks["pending_carry_over"])
+
+
+REGISTRY.register(_StatsCollector())
+
+
+def render_metrics() -> tuple:
+    """(body, content_type) for the /metrics response."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def serve_metrics(port: int):
+    """Standalone worker (bina FastAPI) ke liye alag /metrics HTTP server."""
+    start_http_server(port)
+
+
+def route_template(request) -> str:
+    # Raw path nahi (high cardinality), route pattern jaise /api/stock/{symbol}
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
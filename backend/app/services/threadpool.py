@@ -0,0 +1,97 @@
+import asyncio
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from app.core.config import settings
+from app.services.telemetry import BLOCKING_CALL_LATENCY, BLOCKING_CALLS
+
+logger = logging.getLogger("StockWatcher")
+
+
+class BlockingPool:
+    """
+    Dedicated, sized thread pool for blocking library calls (yfinance, requests).
+
+    `async def` routes mein sync calls seedhe chalane se poora event loop ruk jaata hai.
+    Yahan sab calls is pool mein jaati hain, aur har `label` ke liye
+    calls / errors / latency track hoti hai taaki pool ko size kiya ja sake.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._calls = {}  # label -> {"count", "errors", "total_ms", "max_ms", "wait_ms"}
+
+    def _record(self, label: str, wait_ms: float, run_ms: float, failed: bool):
+        with self._lock:
+            stat = self._calls.setdefault(label, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "wait_ms": 0.0})
+            total = wait_ms + run_ms
+            stat["count"] += 1
+            stat["errors"] += int(failed)
+            stat["total_ms"] += total
+            stat["wait_ms"] += wait_ms
+            stat["max_ms"] = max(stat["max_ms"], total)
+
+    def _wrap(self, fn, label: str, submitted_at: float):
+        def runner():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            outcome = "error"
+            try:
+                result = fn()
+                outcome = "empty" if result is None else "ok"
+                return result
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._active -= 1
+                self._record(label, (started_at - submitted_at) * 1000, (finished_at - started_at) * 1000, outcome == "error")
+                BLOCKING_CALL_LATENCY.labels(self.name, label).observe(finished_at - submitted_at)
+                BLOCKING_CALLS.labels(self.name, label, outcome).inc()
+        return runner
+
+    async def run(self, fn, *args, label: str = None, **kwargs):
+        """`fn(*args, **kwargs)` ko pool mein chala kar result await karta hai."""
+        label = label or getattr(fn, "__name__", "call")
+        with self._lock:
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self._wrap(partial(fn, *args, **kwargs), label, time.perf_counter())
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = {
+                label: {
+                    "count": s["count"],
+                    "errors": s["errors"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 2) if s["count"] else 0.0,
+                    "avg_wait_ms": round(s["wait_ms"] / s["count"], 2) if s["count"] else 0.0,
+                    "max_ms": round(s["max_ms"], 2),
+                }
+                for label, s in self._calls.items()
+            }
+            return {
+                "pool": self.name,
+                "size": self.max_workers,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "calls": calls,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton Instance (yfinance / Google Finance lookups)
+finance_pool = BlockingPool("finance", settings.FINANCE_POOL_SIZE)
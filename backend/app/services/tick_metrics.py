@@ -0,0 +1,108 @@
+import time
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.services.telemetry import TICK_DURATION
+
+logger = logging.getLogger("StockWatcher")
+
+
+class TickMetrics:
+    """
+    Tracker ke har tick ka hisaab: duration, symbols, fetch failures, triggered
+    alerts, schedule se lag, aur deadline par adhoore reh gaye symbols.
+
+    Skipped runs (pichla tick abhi chal raha tha) APScheduler listener se
+    gine jaate hain (services/jobs.py), kyunki job ko pata hi nahi chalta
+    ki uska run chhoot gaya.
+    """
+
+    def __init__(self, interval: float, history: int = 120):
+        self.interval = interval
+        self._history = deque(maxlen=history)
+        self._carry = []             # Pichle tick ke bache hue symbols (agle tick mein pehle)
+        self._lag_ms = 0.0           # Latest submission ka scheduled time se lag
+        self.ticks = 0
+        self.overruns = 0            # Tick interval se lamba chala
+        self.deadline_hits = 0       # Deadline par symbols carry over hue
+        self.skipped_runs = 0        # Scheduler ne run skip / miss kiya
+        self.totals = {"symbols": 0, "fetch_failures": 0, "alerts_triggered": 0, "carried_over": 0}
+
+    # ---------------- Scheduler side ----------------
+
+    def note_submitted(self, scheduled_run_time: datetime):
+        self._lag_ms = max(0.0, (datetime.now(timezone.utc) - scheduled_run_time).total_seconds() * 1000)
+
+    def note_skipped(self):
+        self.skipped_runs += 1
+        logger.warning(f"⏭️ Tracker tick skipped (previous tick still running), total skipped = {self.skipped_runs}")
+
+    # ---------------- Carry-over ----------------
+
+    def prioritize(self, due: list) -> list:
+        """Pichle tick se bache symbols sabse pehle, taaki woh dobara peeche na reh jaayein."""
+        if not self._carry:
+            return due
+        pending = set(due)
+        first = [sym for sym in self._carry if sym in pending]
+        seen = set(first)
+        self._carry = []
+        return first + [sym for sym in due if sym not in seen]
+
+    def carry_over(self, symbols: list):
+        self._carry = list(symbols)
+
+    # ---------------- Recording ----------------
+
+    def begin(self) -> dict:
+        return {
+            "started_at": time.time(),
+            "_t0": time.monotonic(),
+            "lag_ms": round(self._lag_ms, 1),
+            "symbols": 0,
+            "fetch_failures": 0,
+            "alerts_triggered": 0,
+            "carried_over": 0,
+        }
+
+    def finish(self, tick: dict):
+        tick["duration_ms"] = round((time.monotonic() - tick.pop("_t0")) * 1000, 1)
+        self.ticks += 1
+        TICK_DURATION.observe(tick["duration_ms"] / 1000)
+        for key in self.totals:
+            self.totals[key] += tick[key]
+        if tick["duration_ms"] > self.interval * 1000:
+            self.overruns += 1
+            logger.warning(f"🐢 Tracker tick took {tick['duration_ms']:.0f} ms (interval {self.interval}s)")
+        if tick["carried_over"]:
+            self.deadline_hits += 1
+        self._history.append(tick)
+
+    def stats(self) -> dict:
+        durations = sorted(t["duration_ms"] for t in self._history)
+        recent = {}
+        if durations:
+            recent = {
+                "ticks": len(durations),
+                "avg_duration_ms": round(sum(durations) / len(durations), 1),
+                "p95_duration_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                "max_duration_ms": durations[-1],
+                "avg_lag_ms": round(sum(t["lag_ms"] for t in self._history) / len(durations), 1),
+            }
+        return {
+            "interval_seconds": self.interval,
+            "deadline_seconds": settings.TRACKER_TICK_DEADLINE,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "deadline_hits": self.deadline_hits,
+            "skipped_runs": self.skipped_runs,
+            "pending_carry_over": len(self._carry),
+            "totals": dict(self.totals),
+            "recent": recent,
+            "last_tick": self._history[-1] if self._history else None,
+        }
+
+
+# Singleton Instance
+tick_metrics = TickMetrics(interval=settings.TRACKER_TICK_SECONDS)
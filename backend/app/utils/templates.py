@@ -0,0 +1,70 @@
+import string
+from pathlib import Path
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+class CompiledTemplate:
+    """
+    `$name` placeholders wala template, jo load time par ek hi baar
+    literal chunks aur field names mein split hota hai.
+
+    Render sirf values ko chunks ke beech join karta hai (koi regex / parsing nahi).
+    `bind()` constant values (e.g. FRONTEND_URL) ko pehle se bake kar deta hai.
+    """
+
+    def __init__(self, text: str):
+        self._literals = []  # len(fields) + 1 chunks
+        self._fields = []
+        chunk = []
+        pos = 0
+        for match in string.Template.pattern.finditer(text):
+            chunk.append(text[pos:match.start()])
+            pos = match.end()
+            if match.group("escaped") is not None:
+                chunk.append("$")
+                continue
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                raise ValueError(f"Invalid placeholder at position {match.start()}")
+            self._literals.append("".join(chunk))
+            self._fields.append(name)
+            chunk = []
+        chunk.append(text[pos:])
+        self._literals.append("".join(chunk))
+
+    @property
+    def fields(self) -> set:
+        return set(self._fields)
+
+    def bind(self, **constants) -> "CompiledTemplate":
+        """Naya template jisme `constants` wale fields literal text ban chuke hain."""
+        bound = CompiledTemplate.__new__(CompiledTemplate)
+        bound._literals = [self._literals[0]]
+        bound._fields = []
+        for name, literal in zip(self._fields, self._literals[1:]):
+            if name in constants:
+                bound._literals[-1] += str(constants[name]) + literal
+            else:
+                bound._fields.append(name)
+                bound._literals.append(literal)
+        return bound
+
+    def render(self, **values) -> str:
+        literals = self._literals
+        out = [literals[0]]
+        for i, name in enumerate(self._fields, 1):
+            out.append(str(values[name]))
+            out.append(literals[i])
+        return "".join(out)
+
+
+_cache = {}
+
+def load_template(name: str) -> CompiledTemplate:
+    """`templates/<name>` ko ek baar padh kar compile karta hai (process-wide cache)."""
+    template = _cache.get(name)
+    if template is None:
+        template = CompiledTemplate((TEMPLATE_DIR / name).read_text(encoding="utf-8"))
+        _cache[name] = template
+    return template
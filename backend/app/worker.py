@@ -0,0 +1,62 @@
+import asyncio
+import signal
+import logging
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+# Local Imports
+from app.core.config import settings
+from app.db.database import init_db
+from app.services.jobs import register_worker_jobs
+from app.services.alert_index import alert_index
+from app.services.sharding import shard
+from app.services.threadpool import finance_pool
+from app.services.mailer import mailer
+from app.services.notifier import telegram_sender
+from app.services.telemetry import serve_metrics
+
+# Logging Setup
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("StockWatcher")
+
+# ==========================
+# 🛠️ STANDALONE TRACKER WORKER
+# ==========================
+# Run: python -m app.worker   (API ke saath RUN_WORKER_IN_API=false set karein)
+# Jitne chahein utne workers chalayein; symbols live nodes mein apne aap bant jaate hain.
+
+async def main():
+    logger.info("🛠️ Tracker Worker Starting...")
+    await init_db()
+    await telegram_sender.start()
+    if settings.WORKER_METRICS_PORT:
+        serve_metrics(settings.WORKER_METRICS_PORT)
+
+    # Pehle membership join karo, taaki pehla tick galti se saare symbols na le
+    await shard.heartbeat()
+    follower = asyncio.create_task(alert_index.follow_changes())
+
+    scheduler = AsyncIOScheduler()
+    register_worker_jobs(scheduler)
+    scheduler.start()
+    logger.info(f"✅ Worker {shard.node_id} running ({len(shard.nodes)} node(s) live)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+    await stop.wait()
+
+    logger.info("🛑 Worker Shutting Down...")
+    scheduler.shutdown(wait=False)
+    follower.cancel()
+    await shard.leave()
+    await telegram_sender.stop()
+    await mailer.close()
+    finance_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
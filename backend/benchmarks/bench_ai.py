@@ -0,0 +1,62 @@
+"""
+AI analysis page views vs LLM calls (offline stub model).
+
+Run from backend/:
+    python -m benchmarks.bench_ai [--views 1000] [--symbols 20]
+
+Simulates bursts of concurrent page views of /api/analyze-stock across a
+handful of popular symbols, with prices drifting inside one price bucket.
+Reports wall time, model calls made and how views were served (cache hit,
+coalesced in-flight call, or rate limited).
+"""
+import argparse
+import asyncio
+import random
+
+from benchmarks import harness, fakes
+
+
+async def run(views: int = 1000, symbols: int = 20) -> dict:
+    harness.setup()
+
+    from app.services.ai_service import ai_engine
+
+    rng = random.Random(7)
+    tickers = [f"SYM{i}.NS" for i in range(symbols)]
+    base = {t: fakes.price_for(t) for t in tickers}
+
+    def view():
+        t = rng.choice(tickers)
+        # +-0.5% drift: same bucket, har view ka exact price alag
+        price = round(base[t] * (1 + rng.uniform(-0.005, 0.005)), 2)
+        return ai_engine.analyze(symbol=t, price=price, change="N/A", source="bench", currency="INR")
+
+    calls_before = ai_engine.model.calls
+    with harness.Timer() as t:
+        await asyncio.gather(*(view() for _ in range(views)))
+
+    stats = ai_engine.stats()
+    result = {
+        "views": views,
+        "symbols": symbols,
+        "wall_ms": t.ms,
+        "llm_calls": ai_engine.model.calls - calls_before,
+        "hits": stats["hits"],
+        "coalesced": stats["coalesced"],
+        "rate_limited": stats["rate_limited"],
+    }
+    print(f"ai       views={views:>5}  symbols={symbols:>3}  llm_calls={result['llm_calls']:>4}  "
+          f"hits={result['hits']:>5}  coalesced={result['coalesced']:>5}  wall={t.ms:.0f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--views", type=int, default=1000)
+    parser.add_argument("--symbols", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.views, args.symbols))
+
+
+if __name__ == "__main__":
+    main()
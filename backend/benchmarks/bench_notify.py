@@ -0,0 +1,75 @@
+"""
+Notification throughput: outbox enqueue + dispatcher drain over fake SMTP / Telegram.
+
+Run from backend/:
+    python -m benchmarks.bench_notify [--alerts 2000]
+
+Every alert has an email, every third one a Telegram chat as well.
+"""
+import argparse
+import asyncio
+
+from benchmarks import harness, fakes
+
+
+async def run(n_alerts: int = 2000) -> dict:
+    latency = harness.setup()
+    await harness.boot()
+
+    from app.models.outbox import OutboxMessage
+    from app.services.outbox import enqueue_notifications, dispatch_outbox
+    from app.services.notifier import telegram_sender
+    from app.services.mailer import mailer
+
+    await telegram_sender.start()
+    fakes.install_fake_telegram(telegram_sender, latency)
+    await harness.reset_collections("outbox")
+    fakes.calls.clear()
+
+    triggered = [
+        ({
+            "id": f"{i:024x}",
+            "stock_symbol": f"SYM{i % 300}.NS",
+            "target_price": 100.0,
+            "email": f"user{i}@example.com",
+            "telegram_id": str(500000 + i) if i % 3 == 0 else None,
+        }, 101.5)
+        for i in range(n_alerts)
+    ]
+
+    with harness.Timer() as enqueue:
+        queued = await enqueue_notifications(triggered)
+
+    with harness.Timer() as drain:
+        while await OutboxMessage.find(OutboxMessage.status == "pending").count():
+            await dispatch_outbox()
+
+    sent = await OutboxMessage.find(OutboxMessage.status == "sent").count()
+    await telegram_sender.stop()
+    await mailer.close()
+
+    result = {
+        "alerts": n_alerts,
+        "messages": queued,
+        "sent": sent,
+        "enqueue_ms": enqueue.ms,
+        "drain_ms": drain.ms,
+        "messages_per_sec": round(sent / (drain.ms / 1000), 1) if drain.ms else None,
+        "emails": fakes.calls["smtp.send"],
+        "telegrams": fakes.calls["telegram.post"],
+        "smtp_connects": fakes.calls["smtp.connect"],
+    }
+    print(f"notify   messages={queued:>6}  enqueue={enqueue.ms:>8.1f} ms  drain={drain.ms:>9.1f} ms  "
+          f"throughput={result['messages_per_sec']} msg/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.alerts))
+
+
+if __name__ == "__main__":
+    main()
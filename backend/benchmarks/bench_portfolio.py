@@ -0,0 +1,63 @@
+"""
+GET /api/portfolio latency at 10 / 100 / 1000 holdings (offline fakes).
+
+Run from backend/:
+    python -m benchmarks.bench_portfolio [--holdings 10,100,1000] [--runs 5]
+
+Cold = empty quote cache and USD rate cache (every quote fetched upstream),
+warm = everything served from the shared quote cache.
+"""
+import argparse
+import asyncio
+
+from benchmarks import harness
+
+EMAIL = "investor@example.com"
+
+
+async def run(sizes=(10, 100, 1000), runs: int = 5) -> list:
+    harness.setup()
+    await harness.boot()
+
+    from fastapi import Response
+    from app.db import database
+    from app.routers.portfolio import get_portfolio
+
+    user = {"email": EMAIL}
+    results = []
+    for n in sizes:
+        await harness.reset_collections("portfolio")
+        await database.db.portfolio.insert_many([
+            {"email": EMAIL, "symbol": f"HOLD{i}.NS" if i % 2 else f"HOLD{i}",
+             "quantity": 1 + i % 50, "avg_price": 100.0 + i}
+            for i in range(n)
+        ])
+
+        cold, warm = [], []
+        for _ in range(runs):
+            harness.reset_caches()
+            with harness.Timer() as t:
+                rows = await get_portfolio(response=Response(), user=user)
+            cold.append(t.ms)
+            with harness.Timer() as t:
+                await get_portfolio(response=Response(), user=user)
+            warm.append(t.ms)
+        assert len(rows) == n
+
+        row = {"holdings": n, "cold": harness.summarize(cold), "warm": harness.summarize(warm)}
+        results.append(row)
+        print(f"portfolio holdings={n:>5}  cold median={row['cold']['median_ms']:>9.1f} ms  "
+              f"warm median={row['warm']['median_ms']:>8.1f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--holdings", default="10,100,1000")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(tuple(int(x) for x in args.holdings.split(",")), args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Stock search (autocomplete) latency (offline fakes).
+
+Run from backend/:
+    python -m benchmarks.bench_search [--rounds 20]
+
+Every prefix (1..6 letters) of the bundled listings' tickers and first name
+words is searched, the way keystrokes arrive. Reports the local index alone
+and the full /api/search-stock handler (index + cached prices), plus the
+Yahoo fallback for a query the local master cannot answer.
+"""
+import argparse
+import asyncio
+
+from benchmarks import harness
+
+
+def _keystroke_queries() -> list:
+    from app.services.symbol_master import SEED_FILE, _read_csv
+
+    queries = set()
+    for symbol, name, _ in _read_csv(SEED_FILE):
+        for word in (symbol.split(".")[0], name.split()[0]):
+            for n in range(1, min(len(word), 6) + 1):
+                queries.add(word[:n].lower())
+    return sorted(queries)
+
+
+async def run(rounds: int = 20) -> dict:
+    harness.setup()
+    await harness.boot()
+
+    from app.services.symbol_master import symbol_master
+    from app.routers.stocks import search_stock, fetch_yahoo_search
+
+    await symbol_master.load()
+    queries = _keystroke_queries()
+
+    index_ms, handler_ms = [], []
+    for _ in range(rounds):
+        with harness.Timer() as t:
+            for q in queries:
+                symbol_master.search(q, limit=5)
+        index_ms.append(t.ms / len(queries))
+        with harness.Timer() as t:
+            for q in queries:
+                await search_stock(q)
+        handler_ms.append(t.ms / len(queries))
+
+    fetch_yahoo_search.cache_clear()
+    with harness.Timer() as fallback:
+        await search_stock("zzqxnotlisted")
+
+    result = {
+        "queries": len(queries),
+        "index_per_query": harness.summarize(index_ms),
+        "handler_per_query": harness.summarize(handler_ms),
+        "fallback_cold_ms": fallback.ms,
+    }
+    print(f"search   queries={len(queries):>4}  index={result['index_per_query']['median_ms'] * 1000:>7.1f} us/query  "
+          f"handler={result['handler_per_query']['median_ms'] * 1000:>7.1f} us/query  fallback={fallback.ms:.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
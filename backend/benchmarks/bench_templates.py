@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: notification template render throughput.
+
+Run from backend/:
+    python -m benchmarks.bench_templates [--alerts 10000]
+
+Prints renders/sec for the precompiled alert email template, the same template
+through string.Template (parsed on every call), the full MIME message build,
+and the Telegram payload builder.
+"""
+import argparse
+import random
+import string
+import time
+
+from app.utils.templates import TEMPLATE_DIR, load_template
+
+FRONTEND_URL = "https://example.com"
+
+
+def _alerts(n):
+    rng = random.Random(42)
+    symbols = ["AAPL", "MSFT", "TCS.NS", "RELIANCE.NS", "INFY.BO", "NVDA"]
+    return [
+        (rng.choice(symbols), round(rng.uniform(10, 4000), 2), round(rng.uniform(10, 4000), 2))
+        for _ in range(n)
+    ]
+
+
+def _currency(symbol):
+    return "₹" if symbol.endswith((".NS", ".BO")) else "$"
+
+
+def _measure(label, fn, alerts):
+    started = time.perf_counter()
+    for symbol, target, current in alerts:
+        fn(symbol, target, current)
+    elapsed = time.perf_counter() - started
+    rate = len(alerts) / elapsed
+    print(f"{label:<30} {len(alerts):>7} renders  {elapsed * 1000:>9.1f} ms  {rate:>12,.0f} renders/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=10000)
+    args = parser.parse_args()
+    alerts = _alerts(args.alerts)
+
+    compiled = load_template("emails/alert.html").bind(frontend_url=FRONTEND_URL)
+    raw_text = (TEMPLATE_DIR / "emails/alert.html").read_text(encoding="utf-8")
+
+    _measure("email html (precompiled)", lambda s, t, c: compiled.render(
+        symbol=s, currency_symbol=_currency(s), target_price=t, current_price=c
+    ), alerts)
+
+    _measure("email html (string.Template)", lambda s, t, c: string.Template(raw_text).substitute(
+        symbol=s, currency_symbol=_currency(s), target_price=t, current_price=c, frontend_url=FRONTEND_URL
+    ), alerts)
+
+    # Ye dono app modules ke runtime dependencies (aiosmtplib / httpx) maangte hain
+    try:
+        from app.utils.email import build_alert_email
+        _measure("email message (html + MIME)", lambda s, t, c: build_alert_email("user@example.com", s, c, t), alerts)
+    except ImportError as e:
+        print(f"email message: skipped ({e})")
+
+    try:
+        from app.services.notifier import build_telegram_payload
+        _measure("telegram payload", lambda s, t, c: build_telegram_payload("123", s, t, c), alerts)
+    except ImportError as e:
+        print(f"telegram payload: skipped ({e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Tracker tick time at 1k / 10k / 100k active alerts (offline fakes).
+
+Run from backend/:
+    python -m benchmarks.bench_tracker [--alerts 1000,10000,100000]
+
+Per size: index load time, a cold tick (empty quote cache, every symbol due)
+and a warm tick (fresh quotes, evaluation + write-back only).
+"""
+import argparse
+import asyncio
+import random
+
+from benchmarks import harness, fakes
+
+# ~20 alerts per symbol, jaisa real usage mein popular stocks par hota hai
+ALERTS_PER_SYMBOL = 20
+MAX_SYMBOLS = 5000
+TRIGGER_RATIO = 0.02
+
+
+def _alert_docs(n: int, rng: random.Random) -> list:
+    n_symbols = max(1, min(MAX_SYMBOLS, n // ALERTS_PER_SYMBOL))
+    symbols = [f"SYM{i}.NS" if i % 2 else f"SYM{i}" for i in range(n_symbols)]
+    docs = []
+    for i in range(n):
+        sym = symbols[i % n_symbols]
+        price = fakes.price_for(sym)
+        direction = "UP" if rng.random() < 0.5 else "DOWN"
+        crossed = rng.random() < TRIGGER_RATIO
+        offset = rng.uniform(0.001, 0.1) * price
+        if direction == "UP":
+            target = price - offset if crossed else price + offset
+        else:
+            target = price + offset if crossed else price - offset
+        docs.append({
+            "stock_symbol": sym,
+            "target_price": round(target, 2),
+            "email": f"user{i % 5000}@example.com",
+            "direction": direction,
+            "telegram_id": str(100000 + i) if i % 3 == 0 else None,
+            "status": "active",
+        })
+    return docs
+
+
+async def run(sizes=(1000, 10000, 100000)) -> list:
+    harness.setup()
+    await harness.boot()
+
+    from app.db import database
+    from app.services.alert_index import alert_index
+    from app.services.background import track_stock_prices
+    from app.services.market_hours import poll_planner
+    from app.services.tick_metrics import tick_metrics
+
+    rng = random.Random(7)
+    results = []
+    for n in sizes:
+        await harness.reset_collections("alerts", "outbox")
+        docs = _alert_docs(n, rng)
+        for start in range(0, len(docs), 10000):
+            await database.db.alerts.insert_many(docs[start:start + 10000])
+
+        harness.reset_caches()
+        with harness.Timer() as load:
+            await alert_index.load()
+        n_symbols = len(alert_index.symbols())
+
+        with harness.Timer() as cold:
+            await track_stock_prices()
+        cold_tick = tick_metrics.stats()["last_tick"]
+        cold_calls = dict(fakes.calls)
+
+        # Warm: quotes cache mein fresh, sirf due schedule reset
+        poll_planner._due.clear()
+        fakes.calls.clear()
+        with harness.Timer() as warm:
+            await track_stock_prices()
+
+        row = {
+            "alerts": n,
+            "symbols": n_symbols,
+            "index_load_ms": load.ms,
+            "cold_tick_ms": cold.ms,
+            "warm_tick_ms": warm.ms,
+            "triggered": cold_tick["alerts_triggered"],
+            "fetch_failures": cold_tick["fetch_failures"],
+            "upstream_calls_cold": cold_calls,
+            "upstream_calls_warm": dict(fakes.calls),
+        }
+        results.append(row)
+        print(f"tracker  alerts={n:>7}  symbols={n_symbols:>5}  load={load.ms:>9.1f} ms  "
+              f"cold tick={cold.ms:>9.1f} ms  warm tick={warm.ms:>9.1f} ms  triggered={row['triggered']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", default="1000,10000,100000")
+    args = parser.parse_args()
+    asyncio.run(run(tuple(int(x) for x in args.alerts.split(","))))
+
+
+if __name__ == "__main__":
+    main()
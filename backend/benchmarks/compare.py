@@ -0,0 +1,56 @@
+"""
+Compare two benchmark JSON reports (from `python -m benchmarks.run`).
+
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+Prints every *_ms metric with its % change; exits 1 if any got slower than
+`threshold` percent, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def _flatten(node, prefix=""):
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, list):
+        for item in node:
+            if not isinstance(item, dict):
+                continue
+            # Rows ko unke size key se pehchano (alerts / holdings), index se nahi
+            label = next((f"{k}={item[k]}" for k in ("alerts", "holdings", "queries") if k in item), "")
+            yield from _flatten(item, f"{prefix}[{label}]")
+    elif isinstance(node, (int, float)):
+        yield prefix, node
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = dict(_flatten(json.load(f)["results"]))
+    with open(args.new, encoding="utf-8") as f:
+        new = dict(_flatten(json.load(f)["results"]))
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        if not key.endswith("_ms") or not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key] * 100
+        flag = ""
+        if change > args.threshold:
+            flag = "  <-- slower"
+            regressions += 1
+        print(f"{key:<60} {old[key]:>10.1f} -> {new[key]:>10.1f} ms  {change:>+7.1f}%{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Offline stand-ins for every upstream the backend talks to.
+
+Each fake sleeps for a configurable latency so benchmarks measure the
+shape of our pipeline (batching, concurrency, caching) rather than the
+speed of a dict lookup. Prices are deterministic per symbol.
+
+Install order matters: `install_fake_yfinance()` must run before any
+`app.*` module is imported, because those modules bind `yfinance` at import.
+The market calendar is pinned to "all exchanges open" so results do not
+depend on when the suite runs.
+"""
+import sys
+import time
+import types
+import zlib
+import asyncio
+from collections import Counter
+
+import pandas as pd
+
+
+# ============================================================
+# Latency profile (seconds)
+# ============================================================
+DEFAULT_LATENCY = {
+    "yf_download_base": 0.050,      # per yf.download call
+    "yf_download_per_symbol": 0.0002,
+    "yf_ticker": 0.030,             # per Ticker.fast_info lookup
+    "google_page": 0.080,
+    "yahoo_search": 0.060,
+    "smtp_send": 0.005,
+    "smtp_connect": 0.050,
+    "telegram_post": 0.020,
+    "llm_call": 1.500,              # AI stub model per generation
+}
+
+calls = Counter()
+
+
+def price_for(symbol: str) -> float:
+    """Deterministic fake price in [50, 4050)."""
+    return round(50 + (zlib.crc32(symbol.encode()) % 400000) / 100, 2)
+
+
+# ============================================================
+# yfinance
+# ============================================================
+def install_fake_yfinance(latency: dict):
+    def download(tickers, period=None, start=None, interval="1d", **kwargs):
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        calls["yf.download"] += 1
+        time.sleep(latency["yf_download_base"] + latency["yf_download_per_symbol"] * len(symbols))
+
+        days = 1 if period == "1d" else 22
+        index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+        frames = {}
+        for sym in symbols:
+            base = price_for(sym)
+            closes = [round(base * (1 + 0.001 * (i - days + 1)), 2) for i in range(days)]
+            for field in ("Open", "High", "Low", "Close"):
+                frames[(field, sym)] = closes
+            frames[("Volume", sym)] = [1_000_000] * days
+        data = pd.DataFrame(frames, index=index)
+        data.columns = pd.MultiIndex.from_tuples(data.columns, names=["Price", "Ticker"])
+        return data
+
+    class _FastInfo:
+        def __init__(self, symbol):
+            time.sleep(latency["yf_ticker"])
+            calls["yf.Ticker"] += 1
+            self.last_price = 84.0 if symbol == "USDINR=X" else price_for(symbol)
+            self.currency = "INR" if symbol.endswith((".NS", ".BO")) else "USD"
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        @property
+        def fast_info(self):
+            return _FastInfo(self.symbol)
+
+    exceptions = types.ModuleType("yfinance.exceptions")
+
+    class YFTickerMissingError(Exception):
+        pass
+
+    class YFTzMissingError(YFTickerMissingError):
+        pass
+
+    class YFPricesMissingError(YFTickerMissingError):
+        pass
+
+    exceptions.YFTickerMissingError = YFTickerMissingError
+    exceptions.YFTzMissingError = YFTzMissingError
+    exceptions.YFPricesMissingError = YFPricesMissingError
+
+    module = types.ModuleType("yfinance")
+    module.download = download
+    module.Ticker = Ticker
+    module.exceptions = exceptions
+    sys.modules["yfinance"] = module
+    sys.modules["yfinance.exceptions"] = exceptions
+
+
+# ============================================================
+# HTTP (Google Finance page, Yahoo search)
+# ============================================================
+class FakeResponse:
+    def __init__(self, status_code=200, text="", payload=None):
+        self.status_code = status_code
+        self.text = text
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeGoogleSession:
+    def __init__(self, latency: dict):
+        self.latency = latency
+        self.headers = {}
+
+    def get(self, url, timeout=None):
+        calls["google.get"] += 1
+        time.sleep(self.latency["google_page"])
+        symbol = url.rsplit("/", 1)[-1].split(":")[0]
+        return FakeResponse(text=f'<div class="YMlKec fxKbKc">₹{price_for(symbol + ".NS"):,.2f}</div>')
+
+
+def install_fake_http(latency: dict):
+    import requests
+
+    def fake_get(url, params=None, headers=None, timeout=None, **kwargs):
+        calls["requests.get"] += 1
+        time.sleep(latency["yahoo_search"])
+        query = str((params or {}).get("q", "")).upper()
+        quotes = [{"symbol": f"{query}{i}{suffix}", "shortname": f"{query} {i} Ltd", "exchange": "NSI"}
+                  for i, suffix in enumerate(("", ".NS", ".BO", "", ".NS", ".L"))]
+        return FakeResponse(payload={"quotes": quotes})
+
+    requests.get = fake_get
+
+    from app.services import finance
+    finance._google_session = FakeGoogleSession(latency)
+
+
+# ============================================================
+# Market clock
+# ============================================================
+def install_fake_market_clock():
+    """
+    Saare exchanges hamesha "open": tracker ke poll intervals wall-clock
+    market hours par depend na karein, har run same schedule de.
+    """
+    from app.services.market_hours import market_calendar
+
+    market_calendar.is_open = lambda market, now=None: True
+
+
+# ============================================================
+# SMTP
+# ============================================================
+def install_fake_smtp(latency: dict):
+    import aiosmtplib
+
+    class FakeSMTP:
+        def __init__(self, **kwargs):
+            self.is_connected = False
+
+        async def connect(self):
+            await asyncio.sleep(latency["smtp_connect"])
+            calls["smtp.connect"] += 1
+            self.is_connected = True
+
+        async def login(self, username, password):
+            pass
+
+        async def send_message(self, message):
+            await asyncio.sleep(latency["smtp_send"])
+            calls["smtp.send"] += 1
+
+        async def quit(self):
+            self.is_connected = False
+
+        def close(self):
+            self.is_connected = False
+
+    aiosmtplib.SMTP = FakeSMTP
+
+
+# ============================================================
+# Telegram
+# ============================================================
+def install_fake_telegram(sender, latency: dict):
+    """`sender.start()` ke baad call karein: pooled client ko mock transport se badalta hai."""
+    import httpx
+
+    async def handler(request):
+        calls["telegram.post"] += 1
+        await asyncio.sleep(latency["telegram_post"])
+        return httpx.Response(200, json={"ok": True})
+
+    sender._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+# ============================================================
+# MongoDB (mongomock-motor)
+# ============================================================
+def install_fake_mongo():
+    from mongomock_motor import AsyncMongoMockClient
+    from app.db import database
+
+    client = AsyncMongoMockClient()
+    database.AsyncIOMotorClient = lambda uri, **kwargs: client
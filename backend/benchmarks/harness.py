@@ -0,0 +1,91 @@
+"""
+Shared setup for the offline benchmarks: environment, fakes, DB boot and timing.
+
+`setup()` must be called before importing anything from `app`.
+"""
+import os
+import time
+import logging
+import statistics
+
+from benchmarks import fakes
+
+_ready = False
+
+
+def setup(latency: dict = None) -> dict:
+    global _ready
+    latency = {**fakes.DEFAULT_LATENCY, **(latency or {})}
+    if _ready:
+        return latency
+
+    # Env pehle: app modules import time par settings padhte hain
+    os.environ.update({
+        "MONGO_URI": "mongodb://offline-benchmark",
+        "DB_NAME": "stockwatcher_bench",
+        "TELEGRAM_TOKEN": "000:bench",
+        "EMAIL_SENDER": "bench@example.com",
+        "EMAIL_PASSWORD": "bench",
+        "FRONTEND_URL": "https://bench.example.com",
+        # Telegram ki flood limit hamari pipeline nahi hai; benchmark mein hata dete hain
+        "TELEGRAM_GLOBAL_RATE": "100000",
+        "TELEGRAM_PER_CHAT_INTERVAL": "0",
+        "OHLC_STORE_DIR": os.path.join("benchmarks", ".ohlc"),
+        # Gemini ki jagah offline stub (latency ke saath)
+        "AI_STUB": "true",
+        "AI_STUB_LATENCY": str(latency["llm_call"]),
+    })
+
+    fakes.install_fake_yfinance(latency)
+    fakes.install_fake_http(latency)
+    fakes.install_fake_smtp(latency)
+    fakes.install_fake_mongo()
+    fakes.install_fake_market_clock()
+
+    for name in ("StockWatcher", "Notifier"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    _ready = True
+    return latency
+
+
+async def boot():
+    from app.db.database import init_db
+    await init_db()
+
+
+async def reset_collections(*names):
+    from app.db import database
+    for name in names:
+        await database.db[name].delete_many({})
+
+
+def reset_caches():
+    """Cold run: quote cache, alru caches aur tracker planner sab khaali."""
+    from app.services.finance import quote_cache, get_usd_to_inr_rate
+    from app.services.market_hours import poll_planner
+    from app.services.tick_metrics import tick_metrics
+
+    quote_cache._entries.clear()
+    get_usd_to_inr_rate.cache_clear()
+    poll_planner._due.clear()
+    tick_metrics._carry = []
+    fakes.calls.clear()
+
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = round((time.perf_counter() - self.started) * 1000, 2)
+
+
+def summarize(samples_ms: list) -> dict:
+    ordered = sorted(samples_ms)
+    return {
+        "runs": len(ordered),
+        "median_ms": round(statistics.median(ordered), 2),
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+    }
@@ -0,0 +1,73 @@
+"""
+Full offline benchmark suite -> JSON.
+
+Run from backend/:
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run [--quick] [--out benchmarks/results]
+
+Writes `<out>/<UTC timestamp>_<git sha>.json`. Compare two runs with:
+    python -m benchmarks.compare OLD.json NEW.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from benchmarks import harness
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def _run_all(quick: bool) -> dict:
+    from benchmarks import bench_tracker, bench_portfolio, bench_notify, bench_search, bench_ai
+
+    return {
+        "tracker": await bench_tracker.run((1000, 10000) if quick else (1000, 10000, 100000)),
+        "portfolio": await bench_portfolio.run((10, 100) if quick else (10, 100, 1000), runs=3 if quick else 5),
+        "notify": await bench_notify.run(500 if quick else 2000),
+        "search": await bench_search.run(5 if quick else 20),
+        "ai": await bench_ai.run(200 if quick else 1000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--out", default=os.path.join("benchmarks", "results"))
+    args = parser.parse_args()
+
+    latency = harness.setup()
+    results = asyncio.run(_run_all(args.quick))
+
+    sha = _git_sha()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    report = {
+        "meta": {
+            "git_sha": sha,
+            "timestamp": stamp,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+            "fake_latency_s": latency,
+        },
+        "results": results,
+    }
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{stamp}_{sha}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    main()
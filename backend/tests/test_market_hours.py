@@ -0,0 +1,23 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.services.market_hours import MarketCalendar, DEFAULT_HOLIDAYS_FILE
+
+IST = ZoneInfo("Asia/Kolkata")
+
+
+def test_bundled_calendar_covers_nse_festivals():
+    calendar = MarketCalendar(DEFAULT_HOLIDAYS_FILE)
+    # Diwali Balipratipada 2026 (Tuesday): NSE band
+    assert not calendar.is_open("IN", datetime(2026, 11, 10, 11, 0, tzinfo=IST))
+    # Holi 2026
+    assert not calendar.is_open("IN", datetime(2026, 3, 3, 11, 0, tzinfo=IST))
+    # Agla din normal session
+    assert calendar.is_open("IN", datetime(2026, 11, 11, 11, 0, tzinfo=IST))
+
+
+def test_seconds_until_open_skips_holiday():
+    calendar = MarketCalendar(DEFAULT_HOLIDAYS_FILE)
+    diwali_eve_close = datetime(2026, 11, 9, 16, 0, tzinfo=IST)
+    # Diwali chhod kar 11 Nov 09:15 IST
+    assert calendar.seconds_until_open("IN", diwali_eve_close) == (41 * 60 + 15) * 60
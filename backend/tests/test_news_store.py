@@ -0,0 +1,41 @@
+import asyncio
+
+from app.services.news import NewsStore
+
+
+def _item(title):
+    return {"title": title, "link": None, "publisher": "Test", "time": "Recent", "img": None}
+
+
+def test_cold_miss_returns_immediately():
+    store = NewsStore(maxsize=10, ttl=60, items_per_feed=5)
+    fetched = asyncio.Event()
+
+    async def slow_fetch(key):
+        await asyncio.sleep(0.2)
+        store._feeds[key] = ([_item("Reliance hits record")], 0.0)
+        fetched.set()
+        return store._feeds[key][0]
+
+    store._fetch = slow_fetch
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await store.get("RELIANCE.NS") == []
+        assert loop.time() - started < 0.05  # Fetch ka wait nahi
+        await asyncio.wait_for(fetched.wait(), timeout=1)
+        assert [i["title"] for i in await store.get("RELIANCE")] == ["Reliance hits record"]
+
+    asyncio.run(scenario())
+
+
+def test_dedup_counts_drops_and_shared_separately():
+    store = NewsStore(maxsize=10, ttl=60, items_per_feed=5)
+    first = store._dedup([_item("Sensex rallies - ET"), _item("Sensex rallies - Mint")])
+    second = store._dedup([_item("Sensex rallies - BS"), _item("Nifty slips")])
+
+    assert len(first) == 1 and len(second) == 2
+    assert second[0] is first[0]
+    assert store.duplicates == 1  # Sirf ek feed ke andar drop hua
+    assert store.shared == 1
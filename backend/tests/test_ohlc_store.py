@@ -0,0 +1,49 @@
+import asyncio
+import gc
+import json
+from datetime import datetime
+
+import numpy as np
+
+from app.services.ohlc_store import OHLCStore, COLUMNS
+
+
+def _bars(days: int) -> dict:
+    today = np.datetime64(datetime.utcnow().date(), "D")
+    dates = np.arange(today - np.timedelta64(days - 1, "D"), today + np.timedelta64(1, "D"))
+    bars = {"date": dates}
+    for col in COLUMNS:
+        bars[col] = np.linspace(100, 200, len(dates))
+    return bars
+
+
+def _store(tmp_path, maxsize=10) -> OHLCStore:
+    store = OHLCStore(directory=str(tmp_path), refresh_seconds=600, maxsize=maxsize)
+    store._download_sync = lambda symbol, start=None: _bars(90)
+    return store
+
+
+def test_payload_window_follows_days(tmp_path):
+    store = _store(tmp_path)
+
+    async def scenario():
+        month = json.loads(await store.get_payload("TCS.NS", days=30))
+        quarter = json.loads(await store.get_payload("TCS.NS", days=60))
+        return month, quarter
+
+    month, quarter = asyncio.run(scenario())
+    assert len(month) == 31
+    assert len(quarter) == 61
+
+
+def test_locks_do_not_outlive_refresh(tmp_path):
+    store = _store(tmp_path, maxsize=2)
+
+    async def scenario():
+        for i in range(20):
+            await store.get_payload(f"SYM{i}.NS")
+
+    asyncio.run(scenario())
+    gc.collect()
+    assert len(store._memory) == 2
+    assert len(store._locks) == 0
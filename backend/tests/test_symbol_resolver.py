@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import pytest
+import requests
+import yfinance as yf
+
+from app.services import finance
+from app.services.finance import SymbolResolver, _confirm_symbols_sync
+
+
+class _YahooResponse:
+    """Yahoo chart endpoint ka jawab, yfinance ke HTTP layer (YfData.get) ki jagah."""
+
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    def respond(payload, status_code=200):
+        fake = lambda self, *args, **kwargs: _YahooResponse(payload, status_code)
+        monkeypatch.setattr(yf.data.YfData, "get", fake)
+        monkeypatch.setattr(yf.data.YfData, "cache_get", fake)
+    return respond
+
+
+@pytest.fixture
+def offline_probe(monkeypatch):
+    # Batched yf.download khaali (jaisa network error par hota hai); symbol master mein kuch nahi
+    monkeypatch.setattr(finance, "_download_closes", lambda symbols: {})
+    monkeypatch.setattr(finance.symbol_master, "is_listed", lambda symbol: False)
+
+    async def run_inline(fn, *args, label=None):
+        return fn(*args)
+    monkeypatch.setattr(finance.finance_pool, "run", run_inline)
+
+
+def test_yahoo_5xx_is_inconclusive(yahoo):
+    yahoo({"status_code": 503}, status_code=503)
+    with pytest.raises(Exception):
+        _confirm_symbols_sync(["RELIANCE.NS"])
+
+
+def test_yahoo_not_found_is_confirmed(yahoo):
+    yahoo({"chart": {"result": None, "error": {"code": "Not Found", "description": "No data found, symbol may be delisted"}}})
+    assert _confirm_symbols_sync(["ZZQXNOTREAL"]) == (None, None)
+
+
+def test_resolver_does_not_negative_cache_5xx(yahoo, offline_probe):
+    yahoo({"status_code": 503}, status_code=503)
+    resolver = SymbolResolver(maxsize=10, ttl=60, negative_ttl=3600)
+
+    assert asyncio.run(resolver.resolve("RELIANCE.NS")) == "RELIANCE.NS"
+    assert resolver.stats()["negative_entries"] == 0
+    assert resolver.cached("RELIANCE.NS") is None
+
+
+def test_resolver_negative_caches_not_found(yahoo, offline_probe):
+    yahoo({"chart": {"result": None, "error": {"code": "Not Found", "description": "No data found, symbol may be delisted"}}})
+    resolver = SymbolResolver(maxsize=10, ttl=60, negative_ttl=3600)
+
+    assert asyncio.run(resolver.resolve("ZZQXNOTREAL.NS")) is None
+    assert resolver.stats()["negative_entries"] == 1